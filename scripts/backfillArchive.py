@@ -0,0 +1,46 @@
+import argparse
+from pathlib import Path
+
+from src.config.Config import Config
+from src.models.Record import PageRecord
+from src.utils.ArxivArchive import ArxivArchive
+from src.utils.JsonUtils import JsonUtils
+from src.workflows.ArxivDailyWorkflow import ArxivDailyWorkflow
+
+
+def backfill(archive: ArxivArchive, root: Path) -> int:
+    """
+    导入 ANALYZE_REPORT_PATH 下已有的 日期/分类/分类.json 以及同目录下的分析报告, 返回导入的文件数
+    """
+    imported = 0
+    for file in sorted(root.glob('*/*/*.json')):
+        date, category = file.parent.parent.name, file.parent.name
+        if file.stem != category or not date.isdigit():
+            continue
+        try:
+            page = PageRecord.from_dict(JsonUtils.loads(file.read_bytes()))
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"跳过 {file}: {e}")
+            continue
+        reports = {}
+        for article in page.articles or []:
+            path = file.parent / ArxivDailyWorkflow.report_filename(article.title)
+            if path.exists():
+                reports[article.arxiv_id] = path
+        archive.store_page(date, page, reports)
+        imported += 1
+        print(f"{date} {category}: {len(page.articles or [])} 篇文章, {len(reports)} 篇分析报告")
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把已有的每日 JSON 导入历史归档')
+    parser.add_argument('--root', default=Config.ANALYZE_REPORT_PATH)
+    parser.add_argument('--db', default=Config.ARCHIVE_PATH)
+    args = parser.parse_args()
+    archive = ArxivArchive(path=args.db, root=args.root)
+    print(f"共导入 {backfill(archive, Path(args.root))} 个文件到 {args.db}")
+
+
+if __name__ == '__main__':
+    main()
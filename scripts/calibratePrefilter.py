@@ -0,0 +1,48 @@
+import argparse
+import json
+from pathlib import Path
+
+from src.config.Config import Config
+from src.models.Arxiv import ArxivPageResult
+from src.utils.RelevancePrefilter import RelevancePrefilter
+
+
+def load_pages(root: Path) -> list[ArxivPageResult]:
+    # 历史结果按 日期/分类/分类.json 存放
+    pages = []
+    for file in sorted(root.glob('*/*/*.json')):
+        try:
+            pages.append(ArxivPageResult.model_validate_json(file.read_text(encoding='utf-8')))
+        except ValueError:
+            continue
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='用历史判断结果校准本地预筛选阈值')
+    parser.add_argument('--target-recall', type=float, default=0.98)
+    parser.add_argument('--root', default=Config.ANALYZE_REPORT_PATH)
+    parser.add_argument('--output', default=RelevancePrefilter.CALIBRATION_PATH)
+    args = parser.parse_args()
+
+    prefilter = RelevancePrefilter()
+    if not prefilter.enabled:
+        raise SystemExit('PREFILTER_KEYWORDS 中没有可用的英文关键词')
+    report = prefilter.calibrate(load_pages(Path(args.root)), args.target_recall)
+    if not report['samples']:
+        raise SystemExit(f'{args.root} 下没有历史判断结果')
+
+    step = max(1, len(report['table']) // 20)
+    print(f"{'threshold':>10} {'skip_rate':>10} {'recall':>8}")
+    for row in report['table'][::step]:
+        print(f"{row['threshold']:>10.4f} {row['skip_rate']:>10.2%} {row['recall']:>8.2%}")
+    print(f"样本 {report['samples']} 篇，其中值得阅读 {report['positives']} 篇")
+    print(f"推荐阈值 {report['threshold']:.4f}：跳过 {report['skip_rate']:.2%}，召回 {report['recall']:.2%}")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+    print(f"校准报告已写入 {args.output}，未设置 PREFILTER_THRESHOLD 时自动使用该阈值")
+
+
+if __name__ == '__main__':
+    main()
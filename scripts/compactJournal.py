@@ -0,0 +1,14 @@
+import asyncio
+
+from src.config.Config import Config
+from src.workflows.ArxivDailyWorkflow import ArxivDailyWorkflow
+
+
+async def main():
+    # 工作流中途崩溃时, 由今天的日志补写各分类的 JSON
+    for category in Config.PREFER_CATEGORY:
+        await ArxivDailyWorkflow(category).save_json(from_journal=True)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
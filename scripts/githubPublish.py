@@ -6,7 +6,8 @@ from src.workflows.ArxivDailyWorkflow import ArxivDailyWorkflow
 
 
 async def task(x):
-    return await ArxivDailyWorkflow(x).run(without_analyze=True)
+    workflow = ArxivDailyWorkflow(x, batchsize=Config.JUDGE_BATCH_SIZE)
+    return await workflow.run(without_analyze=True, mode=Config.WORKFLOW_MODE, resume=Config.WORKFLOW_RESUME)
 
 
 async def main():
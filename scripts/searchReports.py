@@ -0,0 +1,37 @@
+import argparse
+import time
+
+from src.config.Config import Config
+from src.utils.SearchIndex import SearchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description='在历史的判断结果和分析报告中全文检索')
+    parser.add_argument('query', help='关键词, 多个关键词之间为 AND, 例如 "多智能体 kubernetes"')
+    parser.add_argument('-n', '--limit', type=int, default=20)
+    parser.add_argument('-c', '--category')
+    parser.add_argument('-k', '--kind', choices=['article', 'report'])
+    parser.add_argument('--since', help='起始日期 YYYYMMDD')
+    parser.add_argument('--no-reindex', action='store_true', help='跳过检索前的增量索引')
+    parser.add_argument('--root', default=Config.ANALYZE_REPORT_PATH)
+    parser.add_argument('--db', default=Config.SEARCH_INDEX_PATH)
+    args = parser.parse_args()
+
+    index = SearchIndex(path=args.db, root=args.root)
+    if not args.no_reindex:
+        start = time.perf_counter()
+        stats = index.reindex()
+        print(f"索引更新 {stats}，耗时 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    hits = index.search(args.query, limit=args.limit, category=args.category, kind=args.kind, since=args.since)
+    elapsed = (time.perf_counter() - start) * 1000
+    for i, hit in enumerate(hits, 1):
+        print(f"{i:2d}. [{hit.kind}] {hit.date} {hit.category} {hit.arxiv_id or '-'}  {hit.title}")
+        print(f"    {hit.snippet}")
+        print(f"    {args.root}/{hit.path}")
+    print(f"共 {len(hits)} 条结果，检索耗时 {elapsed:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,23 +1,94 @@
-from langchain_core.messages import SystemMessage, HumanMessage
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import aiofiles
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, BaseMessage, message_chunk_to_message
 
 from src.ai.BaseAI import BaseAI
+from src.ai.ContextPacker import ContextPacker
 from src.ai.prompts.ArxivAnalyzerPrompt import AnalyzerPrompt
 from src.config.Config import Config
-from src.models.Arxiv import ArxivMetaData
+from src.models.Arxiv import ArxivMetaData, Tex
 
 
 class ArxivAnalyzer(BaseAI):
     systemMessage = SystemMessage(AnalyzerPrompt)
 
     def __init__(self):
-        self.model.model_name = Config.ANALYZER_MODEL
+        self._use_model(Config.ANALYZER_MODEL)
+        self.packer = ContextPacker(Config.ANALYZER_MODEL)
+        # 流式输出时在最后一个片段中返回 usage
+        self.streamModel = self.model.model_copy(update={'stream_usage': True})
+        self.cache.purge_stale('analyze', self.fingerprint)
+
+    def _cache_payload(self, metadata: ArxivMetaData) -> str:
+        # 图片以内容哈希代替图片本身, 避免键过大; 预算不同时裁剪结果不同
+        return json.dumps({
+            'budget': self.packer.budget,
+            'texts': [[t.name, t.text] for t in metadata.texts],
+            'figures': [[f.name, f.mime, f.digest or hashlib.sha256(f.read_bytes()).hexdigest()]
+                        for f in metadata.figures],
+        }, ensure_ascii=False)
+
+    async def _stream_to_file(self, messages: List[BaseMessage], path: Path, header: str) -> AIMessage:
+        """
+        流式生成报告: 收到的片段先追加写入 {path}.part, 完成后原子重命名为 path
+        中途失败时改名为 {path}.partial 保留已生成的内容, 便于排查
+        """
+        part = path.with_name(path.name + '.part')
+        start = time.perf_counter()
+        merged = None
+        try:
+            async with aiofiles.open(part, 'w', encoding='utf-8') as f:
+                await f.write(header)
+                async for chunk in self.streamModel.astream(messages):
+                    if merged is None:
+                        # 首个 token 的延迟 (TTFT)
+                        self.metrics.record_latency('analyze_ttft', time.perf_counter() - start)
+                    merged = chunk if merged is None else merged + chunk
+                    if chunk.text:
+                        await f.write(chunk.text)
+                        await f.flush()
+        except BaseException:
+            if part.exists():
+                os.replace(part, path.with_name(path.name + '.partial'))
+            raise
+        os.replace(part, path)
+        res = message_chunk_to_message(merged) if merged is not None else AIMessage(content='')
+        res.response_metadata['stream_path'] = str(path)
+        return res
 
-    async def analyze(self, metadata: ArxivMetaData):
-        images, texts = self._buildContentBlocks(metadata)
+    async def analyze(self, metadata: ArxivMetaData, stream_to: Optional[Path] = None, header: str = ''):
+        """
+        stream_to 不为空时流式写入该文件 (开头写入 header), 返回结果的 response_metadata['stream_path'] 为该路径;
+        命中缓存时不写文件, 由调用方写入
+        """
+        key = self.cache.make_key(self.fingerprint, self._cache_payload(metadata))
+        cached = self.cache.get('analyze', key)
+        if cached is not None:
+            return AIMessage(content=cached)
+        pack = self.packer.pack(metadata, self.systemMessage.content)
+        metadata.dropped = pack.dropped
+        images, texts = self._buildContentBlocks(ArxivMetaData(figures=pack.figures, texts=pack.texts))
         texts.extend(images)
+        if pack.dropped:
+            # 告诉模型哪些内容被省略, 避免把缺失当成论文本身的问题
+            texts.append(self.buildTextContentBlock(
+                Tex(name='omitted', text='以下内容因上下文长度限制未提供:\n' + '\n'.join(pack.dropped))))
         humanMessage = HumanMessage(content_blocks=texts)
         messages = [self.systemMessage, humanMessage]
-        res = await self.model.ainvoke(messages)
+        estimated = pack.tokens + Config.LLM_OUTPUT_RESERVE
+        if stream_to is not None:
+            call = lambda: self._stream_to_file(messages, Path(stream_to), header)
+        else:
+            call = lambda: self.model.ainvoke(messages)
+        res = await self._invoke_limited(call, estimated, lambda r: [r], stage='analyze')
+        if res.text:
+            self.cache.set('analyze', key, self.fingerprint, res.text)
         return res
 
     def _buildContentBlocks(self, metadata: ArxivMetaData):
@@ -1,19 +1,97 @@
+import asyncio
+import json
+from typing import List, Union
+
 from langchain.agents import create_agent
 from langchain_core.messages import SystemMessage, HumanMessage
 from src.ai.BaseAI import BaseAI
-from src.ai.prompts.JudgerPrompt import JudgerPrompt
+from src.ai.prompts.JudgerPrompt import JudgerBatchPrompt, JudgerPrompt
 from src.config.Config import Config
-from src.models.Arxiv import ArxivArticle, JudgeResult
+from src.models.Arxiv import ArxivArticle, BatchJudgeResult, JudgeResult
 
 
 class ArxivJudger(BaseAI):
     systemMessage = SystemMessage(content=JudgerPrompt)
+    batchSystemMessage = SystemMessage(content=JudgerBatchPrompt)
 
     def __init__(self):
-        self.model.model_name = Config.JUDGER_MODEL
+        self._use_model(Config.JUDGER_MODEL)
         self.judgeAgent = create_agent(self.model, response_format=JudgeResult)
+        self.batchAgent = create_agent(self.model, response_format=BatchJudgeResult)
+        self.cache.purge_stale('judge', self.fingerprint)
+
+    @staticmethod
+    def _cache_payload(article: ArxivArticle) -> str:
+        # 只保留与判断相关的字段, index/category/scraped_at 每次爬取都会变化
+        return json.dumps(article.model_dump(mode='json', include={
+            'arxiv_id', 'title', 'authors', 'comments', 'subjects_primary', 'subjects_other', 'abstract'
+        }), ensure_ascii=False, sort_keys=True)
+
+    def _cache_key(self, article: ArxivArticle) -> str:
+        # 批量判断的结果与单篇判断共用缓存, 批量提示词由单篇提示词派生, 指纹相同
+        return self.cache.make_key(self.fingerprint, self._cache_payload(article))
 
     async def judge(self, article: ArxivArticle) -> JudgeResult:
+        key = self._cache_key(article)
+        cached = self.cache.get('judge', key)
+        if cached is not None:
+            return JudgeResult.model_validate_json(cached)
         humanMessage = HumanMessage(content=f"""文章元信息:\n{article.model_dump_json(ensure_ascii=False)}""")
-        res = await self.judgeAgent.ainvoke({"messages": [self.systemMessage, humanMessage]})  # type: ignore
-        return res['structured_response']
+        # 粗略估算: 约 3 个字符一个 token, 另加结构化输出
+        estimated = (len(self.systemMessage.content) + len(humanMessage.content)) // 3 + 800
+        res = await self._invoke_limited(
+            lambda: self.judgeAgent.ainvoke({"messages": [self.systemMessage, humanMessage]}),  # type: ignore
+            estimated,
+            lambda r: r['messages'],
+            stage='judge',
+        )
+        result: JudgeResult = res['structured_response']
+        self.cache.set('judge', key, self.fingerprint, result.model_dump_json())
+        return result
+
+    async def judge_batch(self, articles: List[ArxivArticle]) -> List[Union[JudgeResult, BaseException]]:
+        """
+        一次请求判断多篇文章, 返回与输入顺序一致的结果
+        缺失, 重复或格式不对的条目退回单篇判断; 单篇判断失败时该位置为异常
+        """
+        results: List[Union[JudgeResult, BaseException, None]] = [None] * len(articles)
+        pending = []
+        for i, article in enumerate(articles):
+            cached = self.cache.get('judge', self._cache_key(article))
+            if cached is not None:
+                results[i] = JudgeResult.model_validate_json(cached)
+            else:
+                pending.append(i)
+
+        if len(pending) > 1:
+            payloads = [json.loads(self._cache_payload(articles[i])) for i in pending]
+            humanMessage = HumanMessage(content=f"""文章元信息列表:\n{json.dumps(payloads, ensure_ascii=False)}""")
+            estimated = (len(self.batchSystemMessage.content) + len(humanMessage.content)) // 3 + 800 * len(pending)
+            try:
+                res = await self._invoke_limited(
+                    lambda: self.batchAgent.ainvoke({"messages": [self.batchSystemMessage, humanMessage]}),  # type: ignore
+                    estimated,
+                    lambda r: r['messages'],
+                    stage='judge_batch',
+                )
+                items = res['structured_response'].results
+            except Exception:
+                # 整体解析失败时全部退回单篇判断
+                items = []
+            by_id = {}
+            for item in items:
+                by_id.setdefault(item.arxiv_id.strip(), []).append(item)
+            for i in pending:
+                article = articles[i]
+                matched = by_id.get(article.arxiv_id, [])
+                if len(matched) != 1:
+                    continue
+                result = JudgeResult.model_validate(matched[0].model_dump(exclude={'arxiv_id'}))
+                self.cache.set('judge', self._cache_key(article), self.fingerprint, result.model_dump_json())
+                results[i] = result
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        fallback = await asyncio.gather(*(self.judge(articles[i]) for i in missing), return_exceptions=True)
+        for i, r in zip(missing, fallback):
+            results[i] = r
+        return results
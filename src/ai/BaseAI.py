@@ -1,21 +1,86 @@
+import asyncio
 import base64
+import time
+from typing import Awaitable, Callable, List, Optional, TypeVar
 
-from langchain_core.messages import ImageContentBlock
+import openai
+from langchain_core.messages import ImageContentBlock, SystemMessage, AIMessage
 from langchain_core.messages.content import create_image_block, create_text_block
 from langchain_openai import ChatOpenAI
 
+from src.ai.LLMCache import LLMCache
+from src.ai.RateLimiter import RateLimiter
 from src.config.Config import Config
 from src.models.Content import FigureB64, Text
+from src.utils.Metrics import metrics
+
+T = TypeVar('T')
 
 
 class BaseAI:
+    # 重试交给 _invoke_limited 处理, 这样限流器才能感知到 429
     model = ChatOpenAI(api_key=Config.OPENAI_API_KEY, base_url=Config.OPENAI_BASE_URL,
-                       use_responses_api=True)
+                       use_responses_api=True, max_retries=0)
+    cache = LLMCache()
+    metrics = metrics
+    systemMessage: SystemMessage
+
+    def _use_model(self, model_name: str):
+        # 每个子类持有独立的模型副本, 共享底层 http 连接池
+        self.model = self.model.model_copy(update={'model_name': model_name})
+        self.limiter = RateLimiter.for_model(model_name)
+
+    @property
+    def fingerprint(self) -> str:
+        return LLMCache.fingerprint(self.model.model_name, self.systemMessage.content)
+
+    @staticmethod
+    def _usage_tokens(messages) -> Optional[int]:
+        totals = [m.usage_metadata['total_tokens'] for m in messages
+                  if isinstance(m, AIMessage) and m.usage_metadata]
+        return sum(totals) if totals else None
+
+    async def _invoke_limited(self, call: Callable[[], Awaitable[T]], estimated_tokens: int,
+                              usage: Callable[[T], List], stage: str = 'llm') -> T:
+        """
+        在模型限流器下执行一次调用: 429 时按 Retry-After 暂停并收缩并发, 连接/超时/5xx 指数退避重试
+        usage 从结果中取出带 usage_metadata 的消息, 用于限流器记账和指标统计
+        """
+        model = self.model.model_name
+        for attempt in range(Config.LLM_MAX_RETRIES + 1):
+            await self.limiter.acquire(estimated_tokens)
+            start = time.perf_counter()
+            try:
+                res = await call()
+            except openai.RateLimitError as e:
+                await self.limiter.release(estimated_tokens, None, ok=False)
+                self.limiter.on_rate_limited(RateLimiter.parse_retry_after(e.response.headers))
+                self.metrics.record_latency(stage, time.perf_counter() - start, ok=False)
+                if attempt == Config.LLM_MAX_RETRIES:
+                    raise
+                self.metrics.record_retry(stage, 'rate_limit')
+                continue
+            except (openai.APIConnectionError, openai.InternalServerError) as e:
+                await self.limiter.release(estimated_tokens, None, ok=False)
+                self.metrics.record_latency(stage, time.perf_counter() - start, ok=False)
+                if attempt == Config.LLM_MAX_RETRIES:
+                    raise
+                self.metrics.record_retry(stage, type(e).__name__)
+                await asyncio.sleep(min(30.0, 2.0 ** attempt))
+                continue
+            except BaseException:
+                await self.limiter.release(estimated_tokens, None, ok=False)
+                self.metrics.record_latency(stage, time.perf_counter() - start, ok=False)
+                raise
+            self.metrics.record_latency(stage, time.perf_counter() - start)
+            messages = usage(res)
+            self.metrics.record_usage(model, messages)
+            await self.limiter.release(estimated_tokens, self._usage_tokens(messages), ok=True)
+            return res
 
     def buildB64ImageContent(self, image: FigureB64):
-        return create_image_block(mime_type=image.mime, base64=image.b64)
+        # 引用形式的图片在这里才读取并编码, 请求发出后随消息一起释放
+        return create_image_block(mime_type=image.mime, base64=image.load_b64())
 
     def buildTextContentBlock(self, text: Text):
         return create_text_block(text=f"""------- TITLE: {text.name} --------\n{text.text}\n""")
-
-
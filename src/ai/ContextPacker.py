@@ -0,0 +1,105 @@
+import math
+from typing import List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.config.Config import Config
+from src.models.Arxiv import ArxivMetaData, Tex
+from src.models.Content import FigureB64
+from src.utils.TokenUtils import TokenUtils
+
+
+class PackResult(BaseModel):
+    texts: List[Tex]
+    figures: List[FigureB64]
+    tokens: int
+    budget: int
+    dropped: List[str] = []
+
+
+class ContextPacker:
+    """
+    按模型的上下文窗口裁剪分析请求, 优先级:
+      1. 系统提示词 (固定开销)
+      2. 主文档 (第一个 Tex), 放不下时截断
+      3. 图片, 按 FigureSelector 给出的顺序, 放不下的丢弃
+      4. 其余 Tex, 放不下时截断或丢弃
+    上下文窗口由 LLM_CONTEXT_WINDOWS 配置 (形如 gpt-5-mini=272000;gpt-4o=128000),
+    未配置的模型使用 LLM_DEFAULT_CONTEXT_WINDOW, 并预留 LLM_OUTPUT_RESERVE 给输出
+    """
+    # 每个 content block 的额外开销 (标题, 分隔符等)
+    BLOCK_OVERHEAD = 16
+    # 截断后剩余不足该值的文本直接丢弃
+    MIN_TEXT_TOKENS = 512
+    # 尺寸未知的图片按 2048x2048 高清图估算
+    UNKNOWN_IMAGE_TOKENS = 765
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.budget = self.context_window(model_name) - Config.LLM_OUTPUT_RESERVE
+
+    @staticmethod
+    def context_window(model_name: str) -> int:
+        for entry in Config.LLM_CONTEXT_WINDOWS.split(';'):
+            name, _, value = entry.partition('=')
+            if name.strip() == model_name and value.strip():
+                return int(value)
+        return Config.LLM_DEFAULT_CONTEXT_WINDOW
+
+    @classmethod
+    def image_tokens(cls, width: Optional[int], height: Optional[int]) -> int:
+        """
+        OpenAI 高清图计费: 缩放到 2048x2048 以内, 再把短边缩放到 768, 按 512x512 分块
+        每块 170 token, 另加 85
+        """
+        if not width or not height:
+            return cls.UNKNOWN_IMAGE_TOKENS
+        scale = min(1.0, 2048 / max(width, height))
+        w, h = width * scale, height * scale
+        scale = min(1.0, 768 / min(w, h))
+        w, h = w * scale, h * scale
+        return 85 + 170 * math.ceil(w / 512) * math.ceil(h / 512)
+
+    @classmethod
+    def text_tokens(cls, text: Tex) -> int:
+        return TokenUtils.count_tokens(text.text) + cls.BLOCK_OVERHEAD
+
+    def _fit_text(self, text: Tex, remaining: int, dropped: List[str]) -> Tuple[Optional[Tex], int]:
+        tokens = self.text_tokens(text)
+        if tokens <= remaining:
+            return text, tokens
+        keep = remaining - self.BLOCK_OVERHEAD
+        if keep < self.MIN_TEXT_TOKENS:
+            dropped.append(f'text:{text.name} ({tokens} tokens)')
+            return None, 0
+        dropped.append(f'text:{text.name} truncated ({tokens} -> {keep} tokens)')
+        return Tex(name=text.name, text=TokenUtils.truncate(text.text, keep)), keep + self.BLOCK_OVERHEAD
+
+    def pack(self, metadata: ArxivMetaData, system_prompt: str) -> PackResult:
+        used = TokenUtils.count_tokens(system_prompt)
+        dropped: List[str] = []
+        main, others = metadata.texts[:1], metadata.texts[1:]
+
+        texts: List[Tex] = []
+        for text in main:
+            fitted, tokens = self._fit_text(text, self.budget - used, dropped)
+            if fitted is not None:
+                texts.append(fitted)
+                used += tokens
+
+        figures: List[FigureB64] = []
+        for figure in metadata.figures:
+            tokens = self.image_tokens(figure.width, figure.height)
+            if used + tokens > self.budget:
+                dropped.append(f'figure:{figure.name} ({tokens} tokens)')
+                continue
+            figures.append(figure)
+            used += tokens
+
+        for text in others:
+            fitted, tokens = self._fit_text(text, self.budget - used, dropped)
+            if fitted is not None:
+                texts.append(fitted)
+                used += tokens
+
+        return PackResult(texts=texts, figures=figures, tokens=used, budget=self.budget, dropped=dropped)
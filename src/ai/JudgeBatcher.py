@@ -0,0 +1,62 @@
+import asyncio
+from typing import List, Optional, Set, Tuple
+
+from src.ai.ArxivJudger import ArxivJudger
+from src.models.Arxiv import ArxivArticle, JudgeResult
+
+
+class JudgeBatcher:
+    """
+    把并发的单篇判断请求合并成批量请求:
+      - 攒够 batchsize 篇立即发送
+      - 不足 batchsize 时最多等待 max_wait 秒后发送
+    调用方仍然按单篇 await, 批处理和流水线模式都可以直接使用
+    """
+
+    def __init__(self, judger: ArxivJudger, batchsize: int, max_wait: float = 0.05):
+        self.judger = judger
+        self.batchsize = batchsize
+        self.max_wait = max_wait
+        self._pending: List[Tuple[ArxivArticle, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.batches = 0
+
+    async def judge(self, article: ArxivArticle) -> JudgeResult:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((article, fut))
+        if len(self._pending) >= self.batchsize:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await fut
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[ArxivArticle, asyncio.Future]]):
+        self.batches += 1
+        try:
+            results = await self.judger.judge_batch([article for article, _ in batch])
+        except asyncio.CancelledError:
+            for _, fut in batch:
+                fut.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+        for (_, fut), result in zip(batch, results):
+            if fut.done():
+                continue
+            if isinstance(result, BaseException):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
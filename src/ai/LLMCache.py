@@ -0,0 +1,121 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from src.config.Config import Config
+
+
+class LLMCache:
+    """
+    基于 SQLite 的持久化 LLM 响应缓存, 键为 (模型名, 系统提示词, 规范化请求内容) 的哈希
+      - 模型或提示词变化时指纹改变, 旧记录不会再命中, 并在 purge_stale 时被清理
+      - 支持 TTL 过期和按总字节数的 LRU 淘汰
+      - bypass=True 时跳过读取但仍写入新结果, 用于强制刷新
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: int = Config.LLM_CACHE_TTL,
+                 max_bytes: int = Config.LLM_CACHE_MAX_BYTES, bypass: bool = Config.LLM_CACHE_BYPASS):
+        self.path = path or os.path.join(Config.CACHE_PATH, 'llm_cache.sqlite3')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bypass = bypass
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    stage TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)")
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def fingerprint(model_name: str, system_prompt: str) -> str:
+        h = hashlib.sha256()
+        h.update(model_name.encode('utf-8'))
+        h.update(b'\0')
+        h.update(system_prompt.encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def make_key(fingerprint: str, payload: str) -> str:
+        return hashlib.sha256(f"{fingerprint}\0{payload}".encode('utf-8')).hexdigest()
+
+    def get(self, stage: str, key: str) -> Optional[str]:
+        if self.bypass:
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+            return None
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+                row = None
+            if row is None:
+                self.misses[stage] = self.misses.get(stage, 0) + 1
+                return None
+            self.conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+        self.hits[stage] = self.hits.get(stage, 0) + 1
+        return row[0]
+
+    def set(self, stage: str, key: str, fingerprint: str, value: str):
+        now = time.time()
+        size = len(value.encode('utf-8'))
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses(key, stage, fingerprint, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, stage, fingerprint, value, size, now, now),
+            )
+            self._evict(now)
+            self.conn.commit()
+
+    def purge_stale(self, stage: str, fingerprint: str):
+        """
+        删除该阶段中模型/提示词已变化的记录
+        """
+        with self._lock:
+            self.conn.execute("DELETE FROM responses WHERE stage = ? AND fingerprint != ?", (stage, fingerprint))
+            self.conn.commit()
+
+    def _evict(self, now: float):
+        self.conn.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stages = set(self.hits) | set(self.misses)
+        return {
+            stage: {'hits': self.hits.get(stage, 0), 'misses': self.misses.get(stage, 0)}
+            for stage in sorted(stages)
+        }
@@ -0,0 +1,154 @@
+import asyncio
+import email.utils
+import time
+from typing import Dict, Optional
+
+from src.config.Config import Config
+
+
+class TokenBucket:
+    """
+    按分钟补充的令牌桶, 允许透支 (实际 token 用量超出预估时), 透支部分会延后之后的请求
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def refund(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter:
+    """
+    面向单个模型的自适应限流器, 同一进程内所有 category 的工作流共享
+      - requests/min 与 tokens/min 两个令牌桶
+      - 并发上限按 AIMD 调整: 成功时加性增长, 收到 429 时减半并按 Retry-After 暂停
+    """
+    _limiters: Dict[str, 'RateLimiter'] = {}
+
+    def __init__(self, rpm: int, tpm: int, concurrency: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = concurrency
+        self.limit = float(concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.rate_limited = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._cond: Optional[asyncio.Condition] = None
+
+    @classmethod
+    def for_model(cls, model_name: str) -> 'RateLimiter':
+        if model_name not in cls._limiters:
+            rpm, tpm, concurrency = cls._parse_limits(model_name)
+            cls._limiters[model_name] = cls(rpm, tpm, concurrency)
+        return cls._limiters[model_name]
+
+    @staticmethod
+    def _parse_limits(model_name: str):
+        """
+        LLM_RATE_LIMITS 形如 gpt-5-mini=rpm:500,tpm:200000,concurrency:32;gpt-5.1=rpm:60
+        未配置的项使用 LLM_DEFAULT_* 默认值
+        """
+        limits = {'rpm': Config.LLM_DEFAULT_RPM, 'tpm': Config.LLM_DEFAULT_TPM,
+                  'concurrency': Config.LLM_DEFAULT_CONCURRENCY}
+        for entry in Config.LLM_RATE_LIMITS.split(';'):
+            name, _, spec = entry.partition('=')
+            if name.strip() != model_name:
+                continue
+            for item in spec.split(','):
+                k, _, v = item.partition(':')
+                if k.strip() in limits and v.strip():
+                    limits[k.strip()] = int(v)
+        return limits['rpm'], limits['tpm'], limits['concurrency']
+
+    def _ensure_primitives(self):
+        if self._cond is None:
+            self._lock = asyncio.Lock()
+            self._cond = asyncio.Condition()
+
+    async def acquire(self, estimated_tokens: int):
+        self._ensure_primitives()
+        async with self._cond:
+            while self.in_flight >= int(self.limit):
+                await self._cond.wait()
+            self.in_flight += 1
+        try:
+            async with self._lock:
+                while True:
+                    delay = max(
+                        self.paused_until - time.monotonic(),
+                        self.requests.wait_time(1),
+                        self.tokens.wait_time(estimated_tokens),
+                    )
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                self.requests.consume(1)
+                self.tokens.consume(estimated_tokens)
+        except BaseException:
+            await self._release()
+            raise
+
+    async def release(self, estimated_tokens: int, actual_tokens: Optional[int], ok: bool):
+        if actual_tokens is not None:
+            if actual_tokens > estimated_tokens:
+                self.tokens.consume(actual_tokens - estimated_tokens)
+            else:
+                self.tokens.refund(estimated_tokens - actual_tokens)
+        if ok:
+            self.limit = min(self.max_concurrency, self.limit + 1.0 / self.limit)
+        await self._release()
+
+    async def _release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_rate_limited(self, retry_after: Optional[float]):
+        self.rate_limited += 1
+        self.limit = max(1.0, self.limit / 2)
+        pause = retry_after if retry_after is not None else min(60.0, 2.0 ** min(self.rate_limited, 6))
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    @staticmethod
+    def parse_retry_after(headers) -> Optional[float]:
+        if headers is None:
+            return None
+        value = headers.get('retry-after-ms')
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get('retry-after')
+        if not value:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
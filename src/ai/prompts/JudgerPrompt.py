@@ -10,3 +10,7 @@ class JudgeResult(BaseModel):
 ```
 我的研究方向是:{Config.RESEARCH_PREFER},我不喜欢:{Config.RESEARCH_NOT_PREFER} ,你需要进行严格的判断,而不是觉得有部分相似内容就推荐给我。
 """
+
+JudgerBatchPrompt = JudgerPrompt + """
+我会一次给你多篇文章(JSON 列表),请对每一篇分别独立判断,不要互相比较。输出 results 列表,每篇文章一项,并附上与输入完全一致的 arxiv_id,不要遗漏,也不要重复。
+"""
@@ -1,4 +1,5 @@
 import os
+import warnings
 import dotenv
 
 dotenv.load_dotenv()
@@ -11,6 +12,8 @@ class Config:
         os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(os.path.realpath(__file__))))), 'downloads')
     ANALYZE_REPORT_PATH = os.path.join(
         os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(os.path.realpath(__file__))))), 'analysis')
+    CACHE_PATH = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(os.path.realpath(__file__))))), 'cache')
     ANALYZER_MODEL = os.getenv('ANALYZER_MODEL') or 'gpt-5-mini'
     MAX_FIGURE_NUM = int(os.getenv('MAX_FIGURE_NUM')) or 40
     JUDGER_MODEL = os.getenv('JUDGER_MODEL') or 'gpt-5-mini'
@@ -18,3 +21,52 @@ class Config:
     RESEARCH_NOT_PREFER= os.getenv('RESEARCH_NOT_PREFER') or ''
     PREFER_CATEGORY = os.getenv('PREFER_CATEGORY').split(',')
     ONLY_INCLUDE_WORTH_READ = True if int(os.getenv('ONLY_INCLUDE_WORTH_READ')) == 1 else False
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL') or 7 * 24 * 3600)
+    LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES') or 256 * 1024 * 1024)
+    LLM_CACHE_BYPASS = os.getenv('LLM_CACHE_BYPASS') == '1'
+    LLM_RATE_LIMITS = os.getenv('LLM_RATE_LIMITS') or ''
+    LLM_DEFAULT_RPM = int(os.getenv('LLM_DEFAULT_RPM') or 500)
+    LLM_DEFAULT_TPM = int(os.getenv('LLM_DEFAULT_TPM') or 1_000_000)
+    LLM_DEFAULT_CONCURRENCY = int(os.getenv('LLM_DEFAULT_CONCURRENCY') or 16)
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES') or 5)
+    LLM_CONTEXT_WINDOWS = os.getenv('LLM_CONTEXT_WINDOWS') or ''
+    LLM_DEFAULT_CONTEXT_WINDOW = int(os.getenv('LLM_DEFAULT_CONTEXT_WINDOW') or 128_000)
+    LLM_OUTPUT_RESERVE = int(os.getenv('LLM_OUTPUT_RESERVE') or 16_000)
+    WORKFLOW_MODE = os.getenv('WORKFLOW_MODE') or 'batch'
+    MAX_CONCURRENT_DOWNLOADS = int(os.getenv('MAX_CONCURRENT_DOWNLOADS') or 16)
+    DOWNLOAD_RETRIES = int(os.getenv('DOWNLOAD_RETRIES') or 3)
+    SOURCE_CACHE_MAX_BYTES = int(os.getenv('SOURCE_CACHE_MAX_BYTES') or 2 * 1024 * 1024 * 1024)
+    EXTRACT_IN_MEMORY = os.getenv('EXTRACT_IN_MEMORY') == '1'
+    MAX_SOURCE_MEMBER_BYTES = int(os.getenv('MAX_SOURCE_MEMBER_BYTES') or 50 * 1024 * 1024)
+    PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS') or 0)
+    IMAGE_NORMALIZE = (os.getenv('IMAGE_NORMALIZE') or '1') == '1'
+    IMAGE_MAX_EDGE = int(os.getenv('IMAGE_MAX_EDGE') or 2048)
+    IMAGE_FORMAT = (os.getenv('IMAGE_FORMAT') or 'JPEG').upper()
+    if IMAGE_FORMAT not in ('JPEG', 'PNG'):
+        warnings.warn(f"IMAGE_FORMAT={IMAGE_FORMAT} is not supported (JPEG/PNG), falling back to JPEG")
+        IMAGE_FORMAT = 'JPEG'
+    IMAGE_QUALITY = int(os.getenv('IMAGE_QUALITY') or 85)
+    LATEX_DROP_BIBLIOGRAPHY = os.getenv('LATEX_DROP_BIBLIOGRAPHY') == '1'
+    LATEX_DROP_APPENDIX = os.getenv('LATEX_DROP_APPENDIX') == '1'
+    LISTING_PARSER = os.getenv('LISTING_PARSER') or 'auto'
+    CRAWL_BACKEND = os.getenv('CRAWL_BACKEND') or 'html'
+    OAI_BASE_URL = os.getenv('OAI_BASE_URL') or 'https://oaipmh.arxiv.org/oai'
+    OAI_INITIAL_DAYS = int(os.getenv('OAI_INITIAL_DAYS') or 1)
+    HTTP_CACHE = (os.getenv('HTTP_CACHE') or '1') == '1'
+    WORKFLOW_RESUME = os.getenv('WORKFLOW_RESUME') == '1'
+    JUDGE_BATCH_SIZE = int(os.getenv('JUDGE_BATCH_SIZE') or 5)
+    PREFILTER = os.getenv('PREFILTER') == '1'
+    PREFILTER_KEYWORDS = os.getenv('PREFILTER_KEYWORDS') or RESEARCH_PREFER
+    PREFILTER_NEGATIVE = os.getenv('PREFILTER_NEGATIVE') or RESEARCH_NOT_PREFER
+    PREFILTER_THRESHOLD = float(os.getenv('PREFILTER_THRESHOLD')) if os.getenv('PREFILTER_THRESHOLD') else None
+    METRICS_PATH = os.getenv('METRICS_PATH') or os.path.join(CACHE_PATH, 'metrics')
+    LLM_PRICES = os.getenv('LLM_PRICES') or ''
+    PUBLISH_METRICS_FOOTER = os.getenv('PUBLISH_METRICS_FOOTER') == '1'
+    ANALYZER_STREAM = os.getenv('ANALYZER_STREAM') == '1'
+    FIGURE_SPOOL_TTL = int(os.getenv('FIGURE_SPOOL_TTL') or 24 * 3600)
+    ARCHIVE = (os.getenv('ARCHIVE') or '1') == '1'
+    ARCHIVE_PATH = os.getenv('ARCHIVE_PATH') or os.path.join(ANALYZE_REPORT_PATH, 'archive.sqlite3')
+    SEARCH_INDEX = (os.getenv('SEARCH_INDEX') or '1') == '1'
+    SEARCH_INDEX_PATH = os.getenv('SEARCH_INDEX_PATH') or os.path.join(ANALYZE_REPORT_PATH, 'search.sqlite3')
+    SEEN_INDEX = (os.getenv('SEEN_INDEX') or '1') == '1'
+    SEEN_INDEX_PATH = os.getenv('SEEN_INDEX_PATH') or os.path.join(CACHE_PATH, 'seen_papers.sqlite3')
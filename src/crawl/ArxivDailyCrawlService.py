@@ -1,20 +1,31 @@
+import asyncio
+import mimetypes
 import os
+import posixpath
+import re
 from datetime import datetime, timezone
-from typing import Literal, List, Optional
+from typing import Dict, Literal, List, Optional, Union
 from urllib.parse import urljoin
 
 import bs4
-from bs4 import BeautifulSoup
 from pydantic import HttpUrl
 
+from src.config.Config import Config
 from src.crawl.BaseCrawlService import BaseCrawlService
+from src.crawl.FigureSelector import FigureSelector
+from src.crawl.ListingParser import ListingEntry, ListingParser, SoupListingParser
+from src.crawl.PdfRenderer import FigureBudget, PdfRenderer
 from src.models.Arxiv import ArxivArticle, ArxivPageResult, ArxivMetaData, Tex
-from src.models.Content import FigureB64
+from src.models.Content import FigureB64, SourceFile
+from src.utils.LatexFlattener import LatexFlattener
+from src.utils.TokenUtils import TokenUtils
 from src.utils.helperTypes import arxivCategory
 
 
 class ArxivDailyCrawlService(BaseCrawlService):
     BASE_URL = "https://arxiv.org"
+    pdfRenderer = PdfRenderer()
+    listingParser = ListingParser.create(Config.LISTING_PARSER)
 
     def __init__(self, category: arxivCategory):
         super().__init__()
@@ -23,13 +34,16 @@ class ArxivDailyCrawlService(BaseCrawlService):
         self.full_path = f"{self.BASE_URL}{self.api_path}"
 
     def parse_single_article(self, dt:bs4.element.Tag, dd:bs4.element.Tag, category: str, scraped_at: datetime) -> ArxivArticle:
+        return self.build_article(SoupListingParser.extract(dt, dd), category, scraped_at)
+
+    def build_article(self, entry: ListingEntry, category: str, scraped_at: datetime) -> ArxivArticle:
         # --- 解析 dt 部分 ---
-        a_tags = dt.find_all("a")
+        anchors = entry.anchors
 
         # index: [1]
         index = None
-        if a_tags:
-            index_text = a_tags[0].get_text(strip=True)
+        if anchors:
+            index_text = anchors[0][0]
             index = int(index_text.strip("[]"))
 
         abs_url = None
@@ -38,10 +52,8 @@ class ArxivDailyCrawlService(BaseCrawlService):
         html_url = None
         other_url = None
 
-        for a in a_tags:
-            href = a.get("href", "")
-            title = a.get("title", "").lower()
-            aid = a.get("id", "")
+        for _, href, title, aid in anchors:
+            title = title.lower()
 
             # Abstract 链接
             if "abstract" in title or href.startswith("/abs/"):
@@ -63,47 +75,35 @@ class ArxivDailyCrawlService(BaseCrawlService):
             raise ValueError("Failed to parse index/arxiv_id/abs_url from dt.")
 
         # --- 解析 dd 部分 ---
-        meta = dd.find("div", class_="meta")
-        if not meta:
+        if not entry.has_meta:
             raise ValueError("No .meta div in dd.")
 
         # title
-        title_div = meta.find("div", class_="list-title")
-        if not title_div:
+        if entry.title is None:
             raise ValueError("No .list-title div.")
-        title_text = title_div.get_text(" ", strip=True)
+        title_text = entry.title
         if "Title:" in title_text:
             title_text = title_text.replace("Title:", "", 1).strip()
 
         # authors
-        authors_div = meta.find("div", class_="list-authors")
-        authors: List[str] = []
-        if authors_div:
-            for a in authors_div.find_all("a"):
-                name = a.get_text(strip=True)
-                if name:
-                    authors.append(name)
+        authors: List[str] = [name for name in entry.authors if name]
 
         # comments
-        comments_div = meta.find("div", class_="list-comments")
         comments: Optional[str] = None
-        if comments_div:
-            comments_text = comments_div.get_text(" ", strip=True)
+        if entry.comments is not None:
+            comments_text = entry.comments
             if "Comments:" in comments_text:
                 comments_text = comments_text.replace("Comments:", "", 1).strip()
             if comments_text:
                 comments = comments_text
 
         # subjects
-        subjects_div = meta.find("div", class_="list-subjects")
         subjects_primary: Optional[str] = None
         subjects_other: List[str] = []
-        if subjects_div:
-            primary_span = subjects_div.find("span", class_="primary-subject")
-            if primary_span:
-                subjects_primary = primary_span.get_text(strip=True)
+        if entry.subjects is not None:
+            subjects_primary = entry.subjects_primary
 
-            full_text = subjects_div.get_text(" ", strip=True)
+            full_text = entry.subjects
             if "Subjects:" in full_text:
                 full_text = full_text.replace("Subjects:", "", 1).strip()
             if subjects_primary and subjects_primary in full_text:
@@ -115,10 +115,9 @@ class ArxivDailyCrawlService(BaseCrawlService):
                     subjects_other.append(t)
 
         # abstract
-        abstract_p = meta.find("p", class_="mathjax")
-        if not abstract_p:
+        if entry.abstract is None:
             raise ValueError("No abstract <p class='mathjax'>.")
-        abstract_text = abstract_p.get_text(" ", strip=True)
+        abstract_text = entry.abstract
 
         return ArxivArticle(
             index=index,
@@ -138,26 +137,15 @@ class ArxivDailyCrawlService(BaseCrawlService):
         )
 
     def parse_articles(self, html: str, list_url: str) -> ArxivPageResult:
-        soup = BeautifulSoup(html, "html.parser")
-
-        dl = soup.find("dl", id="articles")
-        if not dl:
-            raise RuntimeError("Could not find <dl id='articles'> in the page.")
-
-        dts = dl.find_all("dt", recursive=False)
-        dds = dl.find_all("dd", recursive=False)
-        if len(dts) != len(dds):
-            n = min(len(dts), len(dds))
-            dts = dts[:n]
-            dds = dds[:n]
+        entries = self.listingParser.entries(html)
 
         scraped_at = datetime.now(timezone.utc)
         category = self.category
 
         articles: List[ArxivArticle] = []
-        for dt, dd in zip(dts, dds):
+        for entry in entries:
             try:
-                article = self.parse_single_article(dt, dd, category, scraped_at)
+                article = self.build_article(entry, category, scraped_at)
                 articles.append(article)
             except Exception as e:
                 # 可换成 logging.warning
@@ -170,36 +158,122 @@ class ArxivDailyCrawlService(BaseCrawlService):
             articles=articles,
         )
 
+    @staticmethod
+    def parse_version(article: ArxivArticle) -> Optional[int]:
+        """
+        从 html 链接 (例如 /html/2511.19314v1) 中解析版本号, 无法得知时返回 None
+        """
+        if article.html_url is None:
+            return None
+        m = re.search(r'v(\d+)/?$', str(article.html_url))
+        return int(m.group(1)) if m else None
+
     async def crawl(self):
-        html = await self.fetch_page_async(self.api_path)
-        page_result = self.parse_articles(html, self.full_path)
-        return page_result
+        # 今天的列表页没有更新时 (304) 直接复用上次的解析结果
+        return await self.fetch_parsed_cached(self.api_path, lambda html: self.parse_articles(html, self.full_path),
+                                              ArxivPageResult)
 
     async def _process_tex_file(self, tex_path: str):
         name, ext = os.path.splitext(os.path.basename(tex_path))
         text = await self.read_text(tex_path)
         return Tex(name=name, text=text)
 
-    async def process_file_lists(self, paths: List[str]) -> ArxivMetaData:
-        figures = []
+    @staticmethod
+    def _source_keys(paths: List[Union[str, SourceFile]]) -> List[str]:
+        """
+        把文件统一成相对于源码根目录的 / 分隔路径, 用于和 LaTeX 中的引用匹配
+        """
+        local = [p for p in paths if not isinstance(p, SourceFile)]
+        root = os.path.commonpath([os.path.dirname(p) for p in local]) if local else ''
+        return [p.name if isinstance(p, SourceFile) else os.path.relpath(p, root).replace(os.sep, '/')
+                for p in paths]
+
+    @staticmethod
+    def _flatten_texts(texts: List[Tex], tex_sources: Dict[str, str]) -> List[Tex]:
+        """
+        找到主文档后合并为一个 Tex, 未被引用的 tex 文件 (旧稿, 草稿) 不再发送
+        找不到 \\documentclass 时逐个文件去掉注释后发送
+        """
+        options = dict(drop_bibliography=Config.LATEX_DROP_BIBLIOGRAPHY, drop_appendix=Config.LATEX_DROP_APPENDIX)
+        flattener = LatexFlattener(tex_sources)
+        main = flattener.find_main()
+        if main is None:
+            return [Tex(name=tex.name, text=flattener.prune(flattener.strip_comments(tex.text), **options))
+                    for tex in texts]
+        name = os.path.splitext(posixpath.basename(main))[0]
+        return [Tex(name=name, text=flattener.prune(flattener.flatten(main), **options))]
+
+    async def _image_figure(self, name: str, mime: str, data: bytes) -> List[FigureB64]:
+        # 在进程池中归一化, 再写入 spool 文件, 元数据只保留引用
+        image = await self.pdfRenderer.normalize(self.imageNormalizer, data, mime)
+        (spool_path, offset, length, digest), = self.figureSpool.write([image.data])
+        # 带上尺寸, ContextPacker 按尺寸估算图片 token
+        return [FigureB64(mime=image.mime, name=name, path=spool_path, offset=offset, length=length, digest=digest,
+                          width=image.width, height=image.height)]
+
+    async def process_file_lists(self, paths: List[Union[str, SourceFile]]) -> ArxivMetaData:
         texts = []
-        # only extract .tex and .pdf(figure)
-
-        for path in paths:
-            if path.endswith(".pdf"):
-                figures.extend(self.pdf_to_base64_pymupdf(path, 1, 'PNG'))
-            elif path.endswith(".tex"):
-                tex = await self._process_tex_file(path)
+        tex_sources = {}
+        candidates = {}
+        for key, path in zip(self._source_keys(paths), paths):
+            filename = path.name if isinstance(path, SourceFile) else path
+            name, ext = os.path.splitext(os.path.basename(filename))
+            ext = ext.lower()
+            if ext == ".tex":
+                if isinstance(path, SourceFile):
+                    tex = Tex(name=name, text=path.data.decode("utf-8", errors="replace"))
+                else:
+                    tex = await self._process_tex_file(path)
                 texts.append(tex)
+                tex_sources[key] = tex.text
+            elif ext == ".pdf" or (mimetypes.guess_type(filename)[0] or '').startswith('image'):
+                candidates[key] = path
+
+        tokens_before = sum(TokenUtils.count_tokens(t.text) for t in texts)
+        if texts:
+            texts = await asyncio.to_thread(self._flatten_texts, texts, tex_sources)
+        tokens_after = sum(TokenUtils.count_tokens(t.text) for t in texts)
+
+        # 按 LaTeX 中的引用顺序处理图片, 解析不到引用的图片排在最后, 超出预算的不会被读取
+        ordered = FigureSelector(tex_sources).order(list(candidates))
+
+        # 同一篇文章的所有图片来源共享预算, 达到 MAX_FIGURE_NUM 后不再渲染/编码
+        budget = FigureBudget(Config.MAX_FIGURE_NUM)
+        # pdf 页面的渲染和图片的归一化都提交到进程池并行处理, 最后按顺序收集
+        pending: List[asyncio.Task] = []
+
+        for key in ordered:
+            if budget.exhausted:
+                break
+            path = candidates[key]
+            source = path.data if isinstance(path, SourceFile) else path
+            filename = path.name if isinstance(path, SourceFile) else path
+            name, ext = os.path.splitext(os.path.basename(filename))
+            if ext.lower() == ".pdf":
+                try:
+                    pages = budget.take(await self.pdfRenderer.page_count(source))
+                except Exception as e:
+                    print(f"Failed to open pdf {filename}: {e}")
+                    continue
+                pending.append(asyncio.create_task(self.pdfRenderer.render(
+                    name, source, list(range(pages)), normalizer=self.imageNormalizer, spool=self.figureSpool)))
             else:
-                res = self._get_minetype_and_b64(path)
-                if res:
-                    mime,b64 = res
-                    if not mime.startswith('image'):
-                        continue
-                    if not b64:
+                if isinstance(path, SourceFile):
+                    mime, data = self._get_minetype_and_bytes_from_bytes(path.name, path.data, normalize=False)
+                else:
+                    res = self._get_minetype_and_bytes(path, normalize=False)
+                    if not res:
                         continue
-                    name, ext = os.path.splitext(os.path.basename(path))
-                    figures.append(FigureB64(mime=mime, b64=b64,name=name))
+                    mime, data = res
+                if not mime.startswith('image') or not data:
+                    continue
+                budget.take(1)
+                pending.append(asyncio.create_task(self._image_figure(name, mime, data)))
 
-        return ArxivMetaData(figures=figures, texts=texts)
+        figures = []
+        for item in pending:
+            try:
+                figures.extend(await item)
+            except Exception as e:
+                print(f"Failed to process figure: {e}")
+        return ArxivMetaData(figures=figures, texts=texts, tokens_before=tokens_before, tokens_after=tokens_after)
@@ -0,0 +1,188 @@
+import asyncio
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import HttpUrl
+
+from src.ai.RateLimiter import RateLimiter
+from src.config.Config import Config
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.models.Arxiv import ArxivArticle, ArxivPageResult
+from src.utils.ArticleRegistry import ArticleRegistry
+from src.utils.helperTypes import arxivCategory, arxivCategoryNames
+
+OAI_NS = '{http://www.openarchives.org/OAI/2.0/}'
+ARXIV_NS = '{http://arxiv.org/OAI/arXiv/}'
+
+
+class ArxivOAICrawlService(ArxivDailyCrawlService):
+    """
+    通过 OAI-PMH ListRecords (metadataPrefix=arXiv) 增量获取新论文, 替代抓取 /list/<cat>/new 页面
+      - 按 resumptionToken 翻页, 503 时按 Retry-After 等待
+      - 每个分类持久化上次收割到的 datestamp, 下次从该日期开始 (含当天), 并跳过当天已经返回过的论文
+      - crawl 只把新的收割状态放在 crawlState 中, 由工作流在 JSON 导出成功后调用 save_state 提交,
+        中途失败时下次仍从旧状态开始, 不会漏掉本次的论文
+      - 只保留主分类为当前分类且没有新版本 (<updated>) 的记录, 与列表页的 New submissions 一致
+      - OAI 只能按顶级 set (如 cs) 收割, 同一进程中同一 (set, from) 的收割结果由所有分类共享, 只翻页一次
+    下载 / 解析源码等能力继承自 ArxivDailyCrawlService
+    """
+    OAI_URL = Config.OAI_BASE_URL
+    STATE_PATH = Path(Config.CACHE_PATH) / 'oai'
+    MAX_RETRIES = 5
+    # 进程内所有分类共享, 以 (oai:<set>, from) 为键, 同一 set 的多个分类等待同一次收割
+    harvests = ArticleRegistry()
+
+    def __init__(self, category: arxivCategory):
+        super().__init__(category)
+        self.oai_set = category.split('.')[0]
+
+    # ------------------------------------------------------------------
+    # 收割状态
+    # ------------------------------------------------------------------
+    def _state_file(self) -> Path:
+        return self.STATE_PATH / f'{self.category}.json'
+
+    def load_state(self) -> Dict:
+        try:
+            return json.loads(self._state_file().read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+
+    def save_state(self, state: Dict):
+        self.STATE_PATH.mkdir(parents=True, exist_ok=True)
+        tmp = self._state_file().with_suffix('.tmp')
+        tmp.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+        tmp.replace(self._state_file())
+
+    # ------------------------------------------------------------------
+    # OAI-PMH
+    # ------------------------------------------------------------------
+    async def _request(self, params: Dict[str, str]) -> ET.Element:
+        for attempt in range(self.MAX_RETRIES):
+            with self.metrics.timer('http'):
+                resp = await self.client.get(self.OAI_URL, params=params, timeout=60.0, follow_redirects=True)
+            if resp.status_code == 503 and attempt < self.MAX_RETRIES - 1:
+                # arXiv 的 OAI 接口在连续翻页时会返回 503 + Retry-After
+                retry_after = RateLimiter.parse_retry_after(resp.headers)
+                await asyncio.sleep(10.0 if retry_after is None else retry_after)
+                continue
+            resp.raise_for_status()
+            return await asyncio.to_thread(ET.fromstring, resp.content)
+        raise RuntimeError(f"OAI-PMH request failed: {params}")
+
+    async def list_records(self, params: Dict[str, str]) -> AsyncIterator[ET.Element]:
+        while True:
+            root = await self._request(params)
+            error = root.find(f'{OAI_NS}error')
+            if error is not None:
+                if error.get('code') == 'noRecordsMatch':
+                    return
+                raise RuntimeError(f"OAI-PMH error {error.get('code')}: {error.text}")
+            records = root.find(f'{OAI_NS}ListRecords')
+            if records is None:
+                return
+            for record in records.findall(f'{OAI_NS}record'):
+                yield record
+            token = records.findtext(f'{OAI_NS}resumptionToken')
+            if not token or not token.strip():
+                return
+            params = {'verb': 'ListRecords', 'resumptionToken': token.strip()}
+
+    async def harvest(self, start_date: str) -> List[Tuple[str, ET.Element]]:
+        """
+        从 start_date 开始收割当前 set 的全部记录, 返回 (datestamp, record); 各分类自行过滤, 不修改记录
+        """
+        async def _harvest():
+            params = {'verb': 'ListRecords', 'metadataPrefix': 'arXiv', 'set': self.oai_set, 'from': start_date}
+            return [(record.findtext(f'{OAI_NS}header/{OAI_NS}datestamp') or start_date, record)
+                    async for record in self.list_records(params)]
+
+        return await self.harvests.run(f'oai:{self.oai_set}', start_date, _harvest)
+
+    # ------------------------------------------------------------------
+    # 记录 -> ArxivArticle
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _clean(text: Optional[str]) -> Optional[str]:
+        if text is None:
+            return None
+        return ' '.join(text.split()) or None
+
+    @staticmethod
+    def _subject(code: str) -> str:
+        name = arxivCategoryNames.get(code)
+        return f'{name} ({code})' if name else code
+
+    def parse_record(self, record: ET.Element, index: int, scraped_at: datetime) -> Optional[ArxivArticle]:
+        """
+        已删除, 主分类不是当前分类, 或者是旧论文的新版本时返回 None
+        """
+        header = record.find(f'{OAI_NS}header')
+        if header is None or header.get('status') == 'deleted':
+            return None
+        meta = record.find(f'{OAI_NS}metadata/{ARXIV_NS}arXiv')
+        if meta is None:
+            return None
+        categories = (meta.findtext(f'{ARXIV_NS}categories') or '').split()
+        if not categories or categories[0] != self.category:
+            return None
+        if meta.find(f'{ARXIV_NS}updated') is not None:
+            return None
+
+        arxiv_id = meta.findtext(f'{ARXIV_NS}id').strip()
+        authors = []
+        for author in meta.iterfind(f'{ARXIV_NS}authors/{ARXIV_NS}author'):
+            parts = [author.findtext(f'{ARXIV_NS}{k}') for k in ('forenames', 'keyname', 'suffix')]
+            name = self._clean(' '.join(p for p in parts if p))
+            if name:
+                authors.append(name)
+
+        return ArxivArticle(
+            index=index,
+            arxiv_id=arxiv_id,
+            category=self.category,
+            abs_url=HttpUrl(f'{self.BASE_URL}/abs/{arxiv_id}'),
+            pdf_url=f'{self.BASE_URL}/pdf/{arxiv_id}',
+            other_url=f'{self.BASE_URL}/format/{arxiv_id}',
+            title=self._clean(meta.findtext(f'{ARXIV_NS}title')) or '',
+            authors=authors,
+            comments=self._clean(meta.findtext(f'{ARXIV_NS}comments')),
+            subjects_primary=self._subject(categories[0]),
+            subjects_other=[self._subject(c) for c in categories[1:]],
+            abstract=self._clean(meta.findtext(f'{ARXIV_NS}abstract')) or '',
+            scraped_at=scraped_at,
+        )
+
+    async def crawl(self) -> ArxivPageResult:
+        state = self.load_state()
+        start_date = state.get('from') or (
+                datetime.now(timezone.utc) - timedelta(days=Config.OAI_INITIAL_DAYS)).strftime('%Y-%m-%d')
+        seen = set(state.get('seen', []))
+
+        scraped_at = datetime.now(timezone.utc)
+        articles: List[ArxivArticle] = []
+        latest, latest_ids = start_date, set(seen)
+        for datestamp, record in await self.harvest(start_date):
+            try:
+                article = self.parse_record(record, len(articles) + 1, scraped_at)
+            except Exception as e:
+                print(f"Failed to parse one record: {e}")
+                continue
+            if datestamp > latest:
+                latest, latest_ids = datestamp, set()
+            if article is None or article.arxiv_id in seen:
+                continue
+            if datestamp == latest:
+                latest_ids.add(article.arxiv_id)
+            articles.append(article)
+
+        self.crawlState = {'from': latest, 'seen': sorted(latest_ids)}
+        return ArxivPageResult(
+            category=self.category,
+            url=HttpUrl(self.OAI_URL),
+            scraped_at=scraped_at,
+            articles=articles,
+        )
@@ -1,24 +1,46 @@
 import asyncio
 import base64
+import gzip
+import hashlib
 import mimetypes
 import os
+import re
 import tarfile
 from abc import ABC
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Literal, Optional, Tuple, Type, TypeVar, Union
 from urllib.parse import urlparse
 
 import aiofiles
 import pymupdf
 import httpx
+from pydantic import BaseModel
 
 from src.config.Config import Config
+from src.crawl.FigureSpool import FigureSpool
+from src.crawl.HttpCache import HttpCache
+from src.crawl.ImageNormalizer import ImageNormalizer, encode_pixmap, fit_zoom, image_mime
+from src.crawl.SourceCache import SourceCache
 from src.models.Arxiv import FigureB64
+from src.models.Content import SourceFile
+from src.utils.Metrics import metrics
+
+T = TypeVar('T', bound=BaseModel)
 
 
 class BaseCrawlService(ABC):
     BASE_URL = ""
     BASE_DOWNLOAD_PATH = Config.DOWNLOAD_PATH
+    sourceCache = SourceCache()
+    imageNormalizer = ImageNormalizer()
+    httpCache = HttpCache()
+    figureSpool = FigureSpool()
+    metrics = metrics
+    lastFetchCached = False
+    # 最近一次 crawl 得到的增量状态, 需要在结果导出后再持久化; 无状态的爬虫为 None
+    crawlState: Optional[Dict] = None
+    DOWNLOAD_CHUNK_SIZE = 256 * 1024
+    MAX_IMAGE_BYTES = 3 * 1024 * 1024
 
     def __init__(self):
         limits = httpx.Limits(max_connections=1000, max_keepalive_connections=200)
@@ -29,72 +51,265 @@ class BaseCrawlService(ABC):
         self.client = httpx.AsyncClient(base_url=self.BASE_URL, timeout=timeout, limits=limits, headers=headers)
 
     async def fetch_page_async(self, url) -> str:
-        resp = await self.client.get(url, timeout=20.0)
+        with self.metrics.timer('http'):
+            resp = await self.client.get(url, timeout=20.0)
         resp.raise_for_status()
         return resp.text
 
-    def _download_with_httpx_sync(self, url: str, target_folder: str) -> str:
+    async def fetch_parsed_cached(self, url: str, parse: Callable[[str], T], model: Type[T]) -> T:
+        """
+        带条件请求的页面获取: 服务端返回 304 时直接复用上次解析的结果
+        lastFetchCached 标记最近一次是否命中
+        """
+        key = str(self.client.base_url.join(url))
+        cached = self.httpCache.get(key)
+        with self.metrics.timer('http'):
+            resp = await self.client.get(url, headers=HttpCache.conditional_headers(cached), timeout=20.0)
+        if resp.status_code == 304 and cached is not None:
+            self.httpCache.hit(cached)
+            self.lastFetchCached = True
+            return model.model_validate_json(cached.value)
+        resp.raise_for_status()
+        result = parse(resp.text)
+        self.httpCache.store(key, resp.headers.get("etag"), resp.headers.get("last-modified"),
+                             result.model_dump_json())
+        self.lastFetchCached = False
+        return result
+
+    # 进程内所有 crawl service 共享, 限制同时进行的附件下载数量
+    _download_semaphore: Optional[asyncio.Semaphore] = None
+
+    @classmethod
+    def _get_download_semaphore(cls) -> asyncio.Semaphore:
+        if BaseCrawlService._download_semaphore is None:
+            BaseCrawlService._download_semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_DOWNLOADS)
+        return BaseCrawlService._download_semaphore
+
+    @staticmethod
+    def _filename_from_response(r: httpx.Response, url: str) -> str:
+        filename = None
+        cd = r.headers.get("content-disposition")
+        if cd:
+            m = re.search(r'filename="?([^"]+)"?', cd)
+            filename = m.group(1) if m else None
+        if not filename:
+            filename = os.path.basename(urlparse(url).path) or "downloaded.file"
+        return os.path.basename(filename)
+
+    async def _download_async(self, url: str, target_folder: str) -> str:
+        """
+        使用共享的 AsyncClient 流式下载:
+          - 先写入 .part 临时文件, 完成后原子重命名
+          - 临时文件已存在时通过 HTTP Range 断点续传
+          - 网络错误时按指数退避重试
+        """
         os.makedirs(target_folder, exist_ok=True)
-        with httpx.stream("GET", url, timeout=60.0) as r:
-            r.raise_for_status()
-            filename = None
-            cd = r.headers.get("content-disposition")
-            if cd:
-                import re
-                m = re.search(r'filename="?([^"]+)"?', cd)
-                filename = m.group(1) if m else None
-            if not filename:
-                filename = os.path.basename(urlparse(url).path) or "downloaded.file"
-            dest = os.path.join(target_folder, filename)
-            with open(dest, "wb") as f:
-                for chunk in r.iter_bytes():
-                    if chunk:
-                        f.write(chunk)
-        return os.path.abspath(dest)
+        part = os.path.join(target_folder, f".{hashlib.sha1(url.encode('utf-8')).hexdigest()}.part")
+        for attempt in range(Config.DOWNLOAD_RETRIES):
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            try:
+                async with self.client.stream("GET", url, headers=headers, timeout=60.0,
+                                              follow_redirects=True) as r:
+                    if r.status_code == 416:
+                        # Content-Range: bytes */总长度 与临时文件大小一致, 说明上次已下载完整 (例如重命名前中断)
+                        m = re.fullmatch(r"bytes \*/(\d+)", r.headers.get("content-range", "").strip())
+                        if m and int(m.group(1)) == offset:
+                            dest = os.path.join(target_folder, self._filename_from_response(r, url))
+                            os.replace(part, dest)
+                            return os.path.abspath(dest)
+                        # 临时文件与服务器上的文件不一致, 从头下载
+                        os.remove(part)
+                        continue
+                    r.raise_for_status()
+                    if r.status_code != 206 or not r.headers.get("content-range", "").startswith(f"bytes {offset}-"):
+                        offset = 0
+                    filename = self._filename_from_response(r, url)
+                    async with aiofiles.open(part, "ab" if offset else "wb") as f:
+                        async for chunk in r.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                            await f.write(chunk)
+                dest = os.path.join(target_folder, filename)
+                os.replace(part, dest)
+                return os.path.abspath(dest)
+            except httpx.TransportError:
+                if attempt == Config.DOWNLOAD_RETRIES - 1:
+                    raise
+                await asyncio.sleep(2 ** attempt)
+        raise RuntimeError(f"Failed to download {url}")
 
     async def download_attachment_async(self, attachment_url: str) -> str:
-        return self._download_with_httpx_sync(attachment_url, self.BASE_DOWNLOAD_PATH)
+        async with self._get_download_semaphore():
+            with self.metrics.timer('download'):
+                return await self._download_async(attachment_url, self.BASE_DOWNLOAD_PATH)
 
-    async def extract_tar_gz(self, path: str) -> List[str]:
-        p = Path(path)
-        if not p.name.endswith(".tar.gz"):
-            return [path]
-        archive_name = p.name
-        if archive_name.endswith(".tar.gz"):
-            archive_name = archive_name[: -len(".tar.gz")]
-        target_dir = Path(self.BASE_DOWNLOAD_PATH) / archive_name
-        target_dir.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def _version_from_filename(filename: str) -> Optional[int]:
+        # arXiv 返回的文件名形如 arXiv-2511.00001v2.tar.gz
+        m = re.search(r'v(\d+)(?=\.|$)', os.path.basename(filename))
+        return int(m.group(1)) if m else None
 
-        def _extract():
-            extracted_paths: List[Path] = []
-            with tarfile.open(p, mode="r:gz") as tf:
-                for member in tf.getmembers():
+    async def _resolve_version(self, src_url: str) -> Optional[int]:
+        """
+        版本号未知时 (例如 OAI 抓取的文章没有 html 链接) 用 HEAD 请求从服务器返回的文件名中得知当前版本
+        """
+        try:
+            r = await self.client.head(src_url, timeout=20.0, follow_redirects=True)
+            r.raise_for_status()
+        except httpx.HTTPError:
+            return None
+        return self._version_from_filename(self._filename_from_response(r, src_url))
+
+    async def fetch_source_files(self, arxiv_id: str, src_url: str,
+                                 version: Optional[int] = None) -> List[Union[str, SourceFile]]:
+        """
+        获取论文源码中有用的文件, 优先使用本地源码缓存, 未命中时下载并解压到缓存目录
+        版本号未知时先向服务器确认当前版本, 仍然无法得知时不使用缓存, 避免替换后的论文拿到旧版本的源码
+        Config.EXTRACT_IN_MEMORY 开启时未命中的源码直接在内存中解压, 不写入缓存
+        """
+        if version is None:
+            version = await self._resolve_version(src_url)
+        files = self.sourceCache.lookup(arxiv_id, version)
+        if files is not None:
+            return files
+        path = await self.download_attachment_async(src_url)
+        if Config.EXTRACT_IN_MEMORY:
+            try:
+                return await self.extract_sources_in_memory(path)
+            finally:
+                os.remove(path)
+        version = self._version_from_filename(path) or version or 0
+        target_dir = self.sourceCache.prepare(arxiv_id, version)
+        files = await self.extract_tar_gz(path, target_dir)
+        if files == [path]:
+            # 直接返回的 pdf, 移动到缓存目录
+            dest = target_dir / os.path.basename(path)
+            os.replace(path, dest)
+            files = [str(dest)]
+        else:
+            os.remove(path)
+        return self.sourceCache.commit(arxiv_id, version, files)
+
+    @staticmethod
+    def _archive_stem(path: str) -> str:
+        name = os.path.basename(path)
+        for suffix in (".tar.gz", ".tgz", ".tar", ".gz", ".pdf"):
+            if name.lower().endswith(suffix):
+                return name[: -len(suffix)]
+        return name
+
+    @staticmethod
+    def _detect_payload(path: str) -> Literal["tar", "gzip", "pdf", "other"]:
+        """
+        arXiv 的 /src 可能返回 tar.gz, 单个 gzip 压缩的 tex 文件, 或者直接返回 pdf
+        按文件头判断, 不依赖文件名
+        """
+        with open(path, "rb") as f:
+            head = f.read(4)
+        if head.startswith(b"%PDF"):
+            return "pdf"
+        if head.startswith(b"\x1f\x8b"):
+            try:
+                with tarfile.open(path, mode="r:gz"):
+                    return "tar"
+            except tarfile.ReadError:
+                return "gzip"
+        if tarfile.is_tarfile(path):
+            return "tar"
+        return "other"
+
+    def _wanted_member(self, name: str, size: int) -> bool:
+        """
+        只保留 .tex / .pdf 和图片, 在解压前按扩展名和大小过滤
+        """
+        lower = name.lower()
+        if lower.endswith(".tex") or lower.endswith(".pdf"):
+            return size <= Config.MAX_SOURCE_MEMBER_BYTES
+        mime, _ = mimetypes.guess_type(lower)
+        return bool(mime and mime.startswith("image")) and size <= self.MAX_IMAGE_BYTES
+
+    def _iter_source_members(self, path: str) -> Iterator[Tuple[str, bytes]]:
+        """
+        只读一遍压缩包, 依次产出需要的 (相对路径, 内容)
+        """
+        kind = self._detect_payload(path)
+        stem = self._archive_stem(path)
+        if kind == "tar":
+            with tarfile.open(path, mode="r|*") as tf:
+                for member in tf:
+                    if not member.isfile():
+                        continue
                     member_path = Path(member.name)
                     if member_path.is_absolute() or ".." in member_path.parts:
                         continue
-                    tf.extract(member, path=target_dir)
-                for fp in target_dir.rglob("*"):
-                    if fp.is_file():
-                        extracted_paths.append(fp.resolve())
+                    if not self._wanted_member(member.name, member.size):
+                        continue
+                    yield member.name, tf.extractfile(member).read()
+        elif kind == "gzip":
+            with gzip.open(path, "rb") as g:
+                data = g.read(Config.MAX_SOURCE_MEMBER_BYTES + 1)
+            if len(data) <= Config.MAX_SOURCE_MEMBER_BYTES:
+                yield stem + (".pdf" if data.startswith(b"%PDF") else ".tex"), data
+        elif kind == "pdf":
+            with open(path, "rb") as f:
+                yield stem + ".pdf", f.read()
+
+    async def extract_tar_gz(self, path: str, target_dir: Optional[Path] = None) -> List[str]:
+        """
+        选择性解压源码到磁盘, 无关文件不会落盘; 直接返回的 pdf 原样返回其路径
+        """
+        if self._detect_payload(path) == "pdf":
+            return [path]
+        if target_dir is None:
+            target_dir = Path(self.BASE_DOWNLOAD_PATH) / self._archive_stem(path)
+        target_dir.mkdir(parents=True, exist_ok=True)
+
+        def _extract():
+            extracted_paths: List[str] = []
+            for name, data in self._iter_source_members(path):
+                dest = target_dir / name
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                dest.write_bytes(data)
+                extracted_paths.append(str(dest.resolve()))
             return extracted_paths
 
-        extracted = await asyncio.to_thread(_extract)
-        return [str(p) for p in extracted]
+        with self.metrics.timer('extract'):
+            return await asyncio.to_thread(_extract)
+
+    async def extract_sources_in_memory(self, path: str) -> List[SourceFile]:
+        """
+        与 extract_tar_gz 相同的选择逻辑, 但直接返回文件内容, 交给 process_file_lists 处理
+        """
+        def _extract():
+            return [SourceFile(name=name, data=data) for name, data in self._iter_source_members(path)]
+
+        with self.metrics.timer('extract'):
+            return await asyncio.to_thread(_extract)
 
     def pdf_to_base64_pymupdf(self, pdf_path: str, zoom: float = 2.0, fmt: str = "PNG",
-                              first_page: Optional[int] = None, last_page: Optional[int] = None) -> List[FigureB64]:
+                              first_page: Optional[int] = None, last_page: Optional[int] = None,
+                              stream: Optional[bytes] = None) -> List[FigureB64]:
         name, ext = os.path.splitext(os.path.basename(pdf_path))
-        doc = pymupdf.open(pdf_path)
+        doc = pymupdf.open(stream=stream, filetype="pdf") if stream is not None else pymupdf.open(pdf_path)
         start = (first_page - 1) if first_page else 0
         end = last_page if last_page else doc.page_count
         results = []
         mat = pymupdf.Matrix(zoom, zoom)
+        normalizer = self.imageNormalizer
         for i in range(start, end):
             page = doc.load_page(i)
-            pix = page.get_pixmap(matrix=mat, alpha=(fmt.upper() == "PNG"))
-            img_bytes = pix.tobytes(output=fmt.upper())
+            if normalizer.enabled:
+                page_zoom = fit_zoom(page.rect.width, page.rect.height, zoom, normalizer.max_edge)
+                pix = page.get_pixmap(matrix=pymupdf.Matrix(page_zoom, page_zoom), alpha=False)
+                img_bytes = encode_pixmap(pix, normalizer.fmt, normalizer.quality)
+                normalizer.record('pdf_page', round(page.rect.width * zoom) * round(page.rect.height * zoom) * 3,
+                                  len(img_bytes))
+                mime = normalizer.mime
+            else:
+                pix = page.get_pixmap(matrix=mat, alpha=(fmt.upper() == "PNG"))
+                img_bytes = pix.tobytes(output=fmt.upper())
+                mime = image_mime(fmt)
             b64 = base64.b64encode(img_bytes).decode("utf-8")
-            results.append(FigureB64(name=f'{name}-{i}', b64=b64,mime='image/png'))
+            results.append(FigureB64(name=f'{name}-{i}', b64=b64,mime=mime, width=pix.width, height=pix.height))
         doc.close()
         return results
 
@@ -103,13 +318,14 @@ class BaseCrawlService(ABC):
             content = await f.read()
         return content
 
-    def _get_minetype_and_b64(self,path: str) -> Optional[Tuple[str, Optional[str]]]:
+    def _get_minetype_and_bytes(self, path: str, normalize: bool = True) -> Optional[Tuple[str, Optional[bytes]]]:
         """
-        返回 (mime_type, base64_str_or_None)：
+        返回 (mime_type, bytes_or_None)：
           - 若文件不存在或读取失败 -> 返回 None
           - 若文件大小 > 3MB -> 返回 (mime_type, None)
-          - 否则 -> 返回 (mime_type, base64_string)
+          - 否则 -> 返回 (mime_type, 归一化后的图片字节)
         使用 mimetypes.guess_type 来确定 mime type，无法猜测时使用 "application/octet-stream"。
+        normalize=False 时返回原始字节, 由调用方在进程池中归一化
         """
         p = Path(path)
         if not p.is_file():
@@ -121,12 +337,28 @@ class BaseCrawlService(ABC):
             size = p.stat().st_size
         except (OSError, IOError):
             return None
-        MAX_BYTES = 3 * 1024 * 1024
-        if size > MAX_BYTES:
+        if size > self.MAX_IMAGE_BYTES:
             return mime_type, None
         try:
             data = p.read_bytes()
         except (OSError, IOError):
             return None
-        b64_str = base64.b64encode(data).decode("utf-8")
-        return mime_type, b64_str
\ No newline at end of file
+        if normalize and mime_type.startswith("image"):
+            image = self.imageNormalizer.normalize(data, mime_type)
+            data, mime_type = image.data, image.mime
+        return mime_type, data
+
+    def _get_minetype_and_bytes_from_bytes(self, name: str, data: bytes,
+                                           normalize: bool = True) -> Tuple[str, Optional[bytes]]:
+        """
+        与 _get_minetype_and_bytes 相同, 用于内存中解压出的文件
+        """
+        mime_type, _ = mimetypes.guess_type(name)
+        if not mime_type:
+            mime_type = "application/octet-stream"
+        if len(data) > self.MAX_IMAGE_BYTES:
+            return mime_type, None
+        if normalize and mime_type.startswith("image"):
+            image = self.imageNormalizer.normalize(data, mime_type)
+            data, mime_type = image.data, image.mime
+        return mime_type, data
\ No newline at end of file
@@ -0,0 +1,82 @@
+import posixpath
+import re
+from typing import Dict, List, Optional
+
+from src.utils.LatexFlattener import LatexFlattener
+
+
+class FigureSelector:
+    """
+    根据 LaTeX 源码中 \\includegraphics 的引用决定图片的处理顺序:
+      1. 正文中引用的图片, 按出现顺序
+      2. 附录中引用的图片
+      3. 仅在未被主文档使用的 tex 文件中引用的图片
+      4. 没有解析到引用的图片 (通过宏 / TikZ 等方式引入, 也可能是 logo 等未使用的文件), 保持原顺序
+    未被引用的图片不会被丢弃, MAX_FIGURE_NUM 的预算足够时仍会被读取和编码, 只是排在最后
+    没有 tex 源码时保持原顺序
+    """
+    INCLUDEGRAPHICS_PATTERN = re.compile(r'\\includegraphics\*?\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+    GRAPHICSPATH_PATTERN = re.compile(r'\\graphicspath\s*\{((?:\s*\{[^}]*\})+)\s*\}')
+    APPENDIX_PATTERN = LatexFlattener.APPENDIX_PATTERN
+    FIGURE_EXTENSIONS = ('.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp')
+
+    def __init__(self, tex_sources: Dict[str, str]):
+        self.tex_sources = tex_sources
+
+    def _references(self, text: str) -> List[str]:
+        return [m.group(1).strip() for m in self.INCLUDEGRAPHICS_PATTERN.finditer(text)]
+
+    def _graphics_paths(self, text: str) -> List[str]:
+        paths = ['']
+        for m in self.GRAPHICSPATH_PATTERN.finditer(text):
+            paths.extend(p.strip() for p in re.findall(r'\{([^}]*)\}', m.group(1)))
+        return paths
+
+    def _resolve(self, ref: str, base_dir: str, graphics_paths: List[str],
+                 figures: Dict[str, str], by_stem: Dict[str, List[str]]) -> Optional[str]:
+        ref = ref.strip('"')
+        for prefix in graphics_paths:
+            path = posixpath.normpath(posixpath.join(base_dir, prefix, ref))
+            for candidate in (path, *(path + ext for ext in self.FIGURE_EXTENSIONS)):
+                if candidate in figures:
+                    return figures[candidate]
+        # 路径对不上时按文件名匹配, 仅在唯一时采用
+        stem = posixpath.splitext(posixpath.basename(ref))[0]
+        matches = by_stem.get(stem, [])
+        return matches[0] if len(matches) == 1 else None
+
+    def order(self, figure_keys: List[str]) -> List[str]:
+        """
+        figure_keys 为图片的相对路径 (/ 分隔), 返回排序后的全部图片
+        """
+        if not self.tex_sources:
+            return list(figure_keys)
+
+        flattener = LatexFlattener(self.tex_sources)
+        main = flattener.find_main()
+        if main is not None:
+            document = flattener.flatten(main)
+            base_dir = posixpath.dirname(main)
+        else:
+            document = '\n'.join(flattener.strip_comments(self.tex_sources[k]) for k in sorted(self.tex_sources))
+            flattener.used.update(self.tex_sources)
+            base_dir = ''
+        m = self.APPENDIX_PATTERN.search(document)
+        body, appendix = (document[:m.start()], document[m.start():]) if m else (document, '')
+        leftovers = '\n'.join(flattener.strip_comments(self.tex_sources[k]) for k in flattener.unused())
+
+        figures = {posixpath.normpath(k).lower(): k for k in figure_keys}
+        by_stem: Dict[str, List[str]] = {}
+        for k in figure_keys:
+            by_stem.setdefault(posixpath.splitext(posixpath.basename(k))[0].lower(), []).append(k)
+        graphics_paths = self._graphics_paths(document)
+
+        ordered: List[str] = []
+        for text in (body, appendix, leftovers):
+            for ref in self._references(text):
+                key = self._resolve(ref.lower(), base_dir.lower(), [p.lower() for p in graphics_paths],
+                                    figures, by_stem)
+                if key is not None and key not in ordered:
+                    ordered.append(key)
+        # 引用方式无法识别时不能直接丢弃, 排在最后, 由 MAX_FIGURE_NUM 截断
+        return ordered + [k for k in figure_keys if k not in ordered]
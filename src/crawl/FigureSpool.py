@@ -0,0 +1,63 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.config.Config import Config
+
+# (路径, 偏移, 长度, sha256)
+SpoolRef = Tuple[str, int, int, str]
+
+
+def spool_write(root: str, blobs: List[bytes]) -> List[SpoolRef]:
+    """
+    把一组编码后的图片依次写入 root 下的一个新文件, 返回每张图片的字节区间
+    只依赖标准库, 可以在渲染子进程中直接调用, 避免把图片数据传回主进程
+    """
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, f'{uuid.uuid4().hex}.bin')
+    refs = []
+    offset = 0
+    with open(path, 'wb') as f:
+        for data in blobs:
+            f.write(data)
+            refs.append((path, offset, len(data), hashlib.sha256(data).hexdigest()))
+            offset += len(data)
+    return refs
+
+
+class FigureSpool:
+    """
+    图片编码后不再以 base64 字符串常驻内存, 而是写入磁盘上的 spool 文件,
+    FigureB64 只保存 (path, offset, length) 引用, 发送请求时再读取并编码
+    spool 文件在进程第一次使用时按 FIGURE_SPOOL_TTL 清理
+    """
+    ROOT = Path(Config.DOWNLOAD_PATH) / '.figures'
+    _purged = False
+    _purge_lock = threading.Lock()
+
+    def __init__(self, root: Optional[Path] = None, ttl: int = Config.FIGURE_SPOOL_TTL):
+        self.root = Path(root or self.ROOT)
+        self.ttl = ttl
+
+    def purge(self):
+        # 渲染子进程直接调用 spool_write, 清理只在主进程中进行
+        with FigureSpool._purge_lock:
+            if FigureSpool._purged or not self.root.exists():
+                FigureSpool._purged = True
+                return
+            FigureSpool._purged = True
+            deadline = time.time() - self.ttl
+            for path in self.root.glob('*.bin'):
+                try:
+                    if path.stat().st_mtime < deadline:
+                        path.unlink()
+                except OSError:
+                    continue
+
+    def write(self, blobs: List[bytes]) -> List[SpoolRef]:
+        self.purge()
+        return spool_write(str(self.root), blobs)
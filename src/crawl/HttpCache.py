@@ -0,0 +1,91 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from src.config.Config import Config
+
+
+class CachedPage(BaseModel):
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # 上次解析出的结果 (json), 304 时直接复用, 不再解析页面
+    value: str
+
+
+class HttpCache:
+    """
+    条件请求缓存: 按 url 保存 ETag / Last-Modified 和解析后的结果
+    下次请求时带上 If-None-Match / If-Modified-Since, 服务端返回 304 即命中
+    """
+
+    def __init__(self, path: Optional[str] = None, enabled: bool = Config.HTTP_CACHE):
+        self.path = Path(path or os.path.join(Config.CACHE_PATH, 'http_cache.sqlite3'))
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    value TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self.conn.execute("SELECT etag, last_modified, value FROM pages WHERE url = ?",
+                                    (url,)).fetchone()
+        if row is None:
+            return None
+        return CachedPage(url=url, etag=row[0], last_modified=row[1], value=row[2])
+
+    @staticmethod
+    def conditional_headers(page: Optional[CachedPage]) -> Dict[str, str]:
+        headers = {}
+        if page is None:
+            return headers
+        if page.etag:
+            headers['If-None-Match'] = page.etag
+        if page.last_modified:
+            headers['If-Modified-Since'] = page.last_modified
+        return headers
+
+    def hit(self, page: CachedPage):
+        self.hits += 1
+        with self._lock:
+            self.conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), page.url))
+            self.conn.commit()
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], value: str):
+        self.misses += 1
+        if not self.enabled or not (etag or last_modified):
+            # 没有校验信息的响应无法做条件请求, 不缓存
+            return
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages(url, etag, last_modified, value, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, value, time.time()),
+            )
+            self.conn.commit()
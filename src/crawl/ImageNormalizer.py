@@ -0,0 +1,120 @@
+from typing import Dict, Literal, NamedTuple, Optional, Tuple
+
+import pymupdf
+
+from src.config.Config import Config
+
+ImageFormat = Literal["JPEG", "PNG"]
+# 支持的编码格式及其 MIME 类型, mime 必须与实际编码的格式一致
+IMAGE_MIME_TYPES: Dict[str, str] = {"JPEG": "image/jpeg", "PNG": "image/png"}
+
+
+class NormalizedImage(NamedTuple):
+    data: bytes
+    mime: str
+    # 最终发送的图片尺寸, 用于估算图片 token; 无法解析时为 None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+def image_mime(fmt: str) -> str:
+    try:
+        return IMAGE_MIME_TYPES[fmt.upper()]
+    except KeyError:
+        raise ValueError(f"Unsupported image format: {fmt}") from None
+
+
+def encode_pixmap(pix: "pymupdf.Pixmap", fmt: ImageFormat, quality: int) -> bytes:
+    if fmt == "JPEG":
+        return pix.tobytes(output="jpeg", jpg_quality=quality)
+    if fmt == "PNG":
+        return pix.tobytes(output="png")
+    raise ValueError(f"Unsupported image format: {fmt}")
+
+
+def fit_zoom(width: float, height: float, zoom: float, max_edge: int) -> float:
+    """
+    在不超过 max_edge 的前提下尽量使用请求的缩放倍数
+    """
+    long_edge = max(width, height) * zoom
+    if max_edge and long_edge > max_edge:
+        return zoom * max_edge / long_edge
+    return zoom
+
+
+def image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    try:
+        pix = pymupdf.Pixmap(data)
+    except Exception:
+        return None
+    return pix.width, pix.height
+
+
+def normalize_image_bytes(data: bytes, max_edge: int, fmt: ImageFormat,
+                          quality: int) -> Optional[Tuple[bytes, int, int, int, int]]:
+    """
+    把图片绘制到白底页面上再栅格化: 同时完成缩放, 去除 alpha, 统一色彩空间
+    返回 (重新编码后的字节, 宽, 高, 原图宽, 原图高), 无法解析的图片返回 None
+    """
+    try:
+        src = pymupdf.Pixmap(data)
+    except Exception:
+        return None
+    scale = fit_zoom(src.width, src.height, 1.0, max_edge)
+    width, height = max(1, round(src.width * scale)), max(1, round(src.height * scale))
+    with pymupdf.open() as doc:
+        page = doc.new_page(width=width, height=height)
+        page.insert_image(page.rect, stream=data)
+        pix = page.get_pixmap(alpha=False)
+    return encode_pixmap(pix, fmt, quality), pix.width, pix.height, src.width, src.height
+
+
+class ImageNormalizer:
+    """
+    base64 编码前的图片归一化: 限制长边, 重新压缩为 JPEG/PNG, 去掉 alpha 通道
+    同时统计处理前后的字节数; pdf 页面的 "处理前" 为请求缩放倍数下未压缩的栅格大小
+    """
+
+    def __init__(self, enabled: bool = Config.IMAGE_NORMALIZE, max_edge: int = Config.IMAGE_MAX_EDGE,
+                 fmt: ImageFormat = Config.IMAGE_FORMAT, quality: int = Config.IMAGE_QUALITY):
+        self.enabled = enabled
+        self.max_edge = max_edge
+        self.fmt = fmt.upper()
+        # 提前校验, 避免编码为一种格式却标注为另一种 MIME 类型
+        self._mime = image_mime(self.fmt)
+        self.quality = quality
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def mime(self) -> str:
+        return self._mime
+
+    def record(self, kind: str, before: int, after: int):
+        entry = self.stats.setdefault(kind, {'count': 0, 'bytes_before': 0, 'bytes_after': 0})
+        entry['count'] += 1
+        entry['bytes_before'] += before
+        entry['bytes_after'] += after
+
+    def normalize(self, data: bytes, mime: str) -> NormalizedImage:
+        """
+        在当前线程中同步处理; 事件循环中应使用 PdfRenderer.normalize, 在进程池中执行
+        """
+        if not self.enabled:
+            return NormalizedImage(data, mime)
+        return self.accept(data, mime, normalize_image_bytes(data, self.max_edge, self.fmt, self.quality))
+
+    def accept(self, data: bytes, mime: str,
+               result: Optional[Tuple[bytes, int, int, int, int]]) -> NormalizedImage:
+        """
+        根据 normalize_image_bytes 的结果决定使用哪一份图片, 并记录统计
+        """
+        if result is None:
+            self.record('image', len(data), len(data))
+            return NormalizedImage(data, mime)
+        out, width, height, source_width, source_height = result
+        # 重新编码后反而更大时保留原图
+        if len(out) >= len(data):
+            self.record('image', len(data), len(data))
+            return NormalizedImage(data, mime, source_width, source_height)
+        self.record('image', len(data), len(out))
+        return NormalizedImage(out, self.mime, width, height)
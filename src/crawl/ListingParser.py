@@ -0,0 +1,189 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import bs4
+from bs4 import BeautifulSoup, SoupStrainer
+from pydantic import BaseModel
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:  # lxml 已在依赖中声明, 仅在手动安装的精简环境中可能缺失
+    lxml = None
+
+
+class ListingEntry(BaseModel):
+    """
+    /list/<cat>/new 页面中一对 <dt>/<dd> 的原始文本, 与解析后端无关
+    文本的提取方式与 bs4 的 get_text(" ", strip=True) 一致
+    """
+    # dt 中的链接: (文本, href, title, id)
+    anchors: List[Tuple[str, str, str, str]]
+    has_meta: bool = True
+    title: Optional[str] = None
+    authors: List[str] = []
+    comments: Optional[str] = None
+    subjects_primary: Optional[str] = None
+    subjects: Optional[str] = None
+    abstract: Optional[str] = None
+
+
+class ListingParser(ABC):
+    """
+    列表页解析后端, 只负责从 dl#articles 中取出原始文本, 字段校验和规范化由
+    ArxivDailyCrawlService.build_article 完成, 因此各后端输出的 ArxivArticle 一致
+    """
+    name = ''
+
+    @abstractmethod
+    def entries(self, html: str) -> List[ListingEntry]:
+        pass
+
+    @staticmethod
+    def _pair(dts: list, dds: list) -> List[tuple]:
+        if len(dts) != len(dds):
+            n = min(len(dts), len(dds))
+            dts = dts[:n]
+            dds = dds[:n]
+        return list(zip(dts, dds))
+
+    @staticmethod
+    def available() -> List[str]:
+        return ['soup', 'strainer'] + (['lxml'] if lxml is not None else [])
+
+    @staticmethod
+    def create(name: str = 'auto') -> 'ListingParser':
+        """
+        auto: 使用 lxml (项目依赖); 缺少 lxml 时使用原有的 html.parser 整页解析
+        (strainer 在 html.parser 下并不比整页解析快, 只在显式指定时使用)
+        """
+        if name == 'auto':
+            name = 'lxml' if lxml is not None else 'soup'
+        if name == 'soup':
+            return SoupListingParser()
+        if name == 'strainer':
+            return StrainerListingParser()
+        if name == 'lxml':
+            if lxml is None:
+                raise RuntimeError("LISTING_PARSER=lxml requires the lxml package")
+            return LxmlListingParser()
+        raise ValueError(f"Unknown listing parser: {name}")
+
+
+class SoupListingParser(ListingParser):
+    """
+    使用 html.parser 构建整页的 BeautifulSoup 树 (原有实现)
+    """
+    name = 'soup'
+
+    def _soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser")
+
+    def entries(self, html: str) -> List[ListingEntry]:
+        soup = self._soup(html)
+        dl = soup.find("dl", id="articles")
+        if not dl:
+            raise RuntimeError("Could not find <dl id='articles'> in the page.")
+        dts = dl.find_all("dt", recursive=False)
+        dds = dl.find_all("dd", recursive=False)
+        return [self.extract(dt, dd) for dt, dd in self._pair(dts, dds)]
+
+    @staticmethod
+    def extract(dt: bs4.element.Tag, dd: bs4.element.Tag) -> ListingEntry:
+        anchors = [(a.get_text(strip=True), a.get("href", ""), a.get("title", ""), a.get("id", ""))
+                   for a in dt.find_all("a")]
+        meta = dd.find("div", class_="meta")
+        if not meta:
+            return ListingEntry(anchors=anchors, has_meta=False)
+
+        def _text(tag) -> Optional[str]:
+            return tag.get_text(" ", strip=True) if tag else None
+
+        authors_div = meta.find("div", class_="list-authors")
+        subjects_div = meta.find("div", class_="list-subjects")
+        primary_span = subjects_div.find("span", class_="primary-subject") if subjects_div else None
+        return ListingEntry(
+            anchors=anchors,
+            title=_text(meta.find("div", class_="list-title")),
+            authors=[a.get_text(strip=True) for a in authors_div.find_all("a")] if authors_div else [],
+            comments=_text(meta.find("div", class_="list-comments")),
+            subjects_primary=primary_span.get_text(strip=True) if primary_span else None,
+            subjects=_text(subjects_div),
+            abstract=_text(meta.find("p", class_="mathjax")),
+        )
+
+
+class StrainerListingParser(SoupListingParser):
+    """
+    使用 SoupStrainer 只为 dl#articles 建树, 其余部分在解析时直接丢弃
+    """
+    name = 'strainer'
+
+    def _soup(self, html: str) -> BeautifulSoup:
+        return BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("dl", id="articles"))
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlListingParser(ListingParser):
+    """
+    使用 lxml (libxml2) 解析, 通过预编译的 xpath 定位 dl#articles 中的字段
+    """
+    name = 'lxml'
+
+    def __init__(self):
+        xpath = lxml.etree.XPath
+        # 与 bs4 的 get_text 一致: 跳过注释和 script/style 中的文本
+        self.text = xpath('.//text()[not(parent::script) and not(parent::style)]')
+        self.articles = xpath("//dl[@id='articles']")
+        self.dts = xpath("./dt")
+        self.dds = xpath("./dd")
+        self.anchors = xpath(".//a")
+        self.meta = xpath(f".//div[{_has_class('meta')}]")
+        self.title = xpath(f".//div[{_has_class('list-title')}]")
+        self.authors = xpath(f".//div[{_has_class('list-authors')}]")
+        self.comments = xpath(f".//div[{_has_class('list-comments')}]")
+        self.subjects = xpath(f".//div[{_has_class('list-subjects')}]")
+        self.primary = xpath(f".//span[{_has_class('primary-subject')}]")
+        self.abstract = xpath(f".//p[{_has_class('mathjax')}]")
+
+    def _text(self, el, sep: str = " ") -> Optional[str]:
+        if el is None:
+            return None
+        return sep.join(s for s in (s.strip() for s in self.text(el)) if s)
+
+    @staticmethod
+    def _first(el, xpath):
+        # bs4 中没有任何子节点的 Tag 为假值, 这里保持一致
+        if el is None:
+            return None
+        for found in xpath(el):
+            return found if len(found) or found.text else None
+        return None
+
+    def entries(self, html: str) -> List[ListingEntry]:
+        root = lxml.html.fromstring(html)
+        dl = self._first(root, self.articles)
+        if dl is None:
+            raise RuntimeError("Could not find <dl id='articles'> in the page.")
+        return [self.extract(dt, dd) for dt, dd in self._pair(self.dts(dl), self.dds(dl))]
+
+    def extract(self, dt, dd) -> ListingEntry:
+        anchors = [(self._text(a, ""), a.get("href", ""), a.get("title", ""), a.get("id", ""))
+                   for a in self.anchors(dt)]
+        meta = self._first(dd, self.meta)
+        if meta is None:
+            return ListingEntry(anchors=anchors, has_meta=False)
+        authors_div = self._first(meta, self.authors)
+        subjects_div = self._first(meta, self.subjects)
+        return ListingEntry(
+            anchors=anchors,
+            title=self._text(self._first(meta, self.title)),
+            authors=[self._text(a, "") for a in self.anchors(authors_div)] if authors_div is not None else [],
+            comments=self._text(self._first(meta, self.comments)),
+            subjects_primary=self._text(self._first(subjects_div, self.primary), ""),
+            subjects=self._text(subjects_div),
+            abstract=self._text(self._first(meta, self.abstract)),
+        )
@@ -0,0 +1,127 @@
+import asyncio
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import pymupdf
+
+from src.config.Config import Config
+from src.crawl.FigureSpool import FigureSpool, SpoolRef, spool_write
+from src.crawl.ImageNormalizer import (ImageNormalizer, NormalizedImage, encode_pixmap, fit_zoom, image_mime,
+                                      image_size, normalize_image_bytes)
+from src.models.Content import FigureB64
+
+PdfSource = Union[str, bytes]
+
+
+def _open(source: PdfSource):
+    return pymupdf.open(stream=source, filetype="pdf") if isinstance(source, bytes) else pymupdf.open(source)
+
+
+def _page_count(source: PdfSource) -> int:
+    with _open(source) as doc:
+        return doc.page_count
+
+
+def _render_pages(source: PdfSource, pages: List[int], zoom: float, fmt: str, spool_root: str,
+                  normalize: bool = False, max_edge: int = 0,
+                  quality: int = 85) -> List[Tuple[int, SpoolRef, int, int, int]]:
+    """
+    在子进程中渲染指定页并写入 spool 文件, 返回 (页码, spool 引用, 未压缩栅格字节数, 宽, 高)
+    normalize 时按 max_edge 限制长边并去掉 alpha 通道
+    """
+    results = []
+    blobs = []
+    with _open(source) as doc:
+        for i in pages:
+            page = doc.load_page(i)
+            if normalize:
+                page_zoom = fit_zoom(page.rect.width, page.rect.height, zoom, max_edge)
+                raw = round(page.rect.width * zoom) * round(page.rect.height * zoom) * 3
+                pix = page.get_pixmap(matrix=pymupdf.Matrix(page_zoom, page_zoom), alpha=False)
+                data = encode_pixmap(pix, fmt.upper(), quality)
+            else:
+                pix = page.get_pixmap(matrix=pymupdf.Matrix(zoom, zoom), alpha=(fmt.upper() == "PNG"))
+                raw = pix.width * pix.height * pix.n
+                data = pix.tobytes(output=fmt.upper())
+            blobs.append(data)
+            results.append((i, raw, pix.width, pix.height))
+    refs = spool_write(spool_root, blobs)
+    return [(i, ref, raw, width, height) for (i, raw, width, height), ref in zip(results, refs)]
+
+
+class FigureBudget:
+    """
+    单篇文章的图片预算, 所有图片来源共享, 用完后不再渲染/编码
+    """
+
+    def __init__(self, total: int):
+        self.remaining = total
+
+    def take(self, n: int) -> int:
+        granted = max(0, min(n, self.remaining))
+        self.remaining -= granted
+        return granted
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0
+
+
+class PdfRenderer:
+    """
+    使用进程池渲染 pdf 页面, 避免阻塞事件循环; 同一文档按页分片并行渲染
+    """
+    _executor: Optional[ProcessPoolExecutor] = None
+    workers = Config.PDF_RENDER_WORKERS or os.cpu_count() or 1
+
+    @classmethod
+    def executor(cls) -> ProcessPoolExecutor:
+        if cls._executor is None:
+            cls._executor = ProcessPoolExecutor(max_workers=cls.workers)
+        return cls._executor
+
+    async def normalize(self, normalizer: ImageNormalizer, data: bytes, mime: str) -> NormalizedImage:
+        """
+        图片的解码 / 缩放 / 重新编码同样在进程池中执行; 关闭归一化时只读取尺寸
+        """
+        loop = asyncio.get_running_loop()
+        if not normalizer.enabled:
+            size = await loop.run_in_executor(self.executor(), image_size, data)
+            return NormalizedImage(data, mime, *size) if size else NormalizedImage(data, mime)
+        out = await loop.run_in_executor(self.executor(), normalize_image_bytes, data, normalizer.max_edge,
+                                         normalizer.fmt, normalizer.quality)
+        return normalizer.accept(data, mime, out)
+
+    async def page_count(self, source: PdfSource) -> int:
+        return await asyncio.to_thread(_page_count, source)
+
+    async def render(self, name: str, source: PdfSource, pages: List[int], zoom: float = 1.0,
+                     normalizer: Optional[ImageNormalizer] = None,
+                     spool: Optional[FigureSpool] = None) -> List[FigureB64]:
+        if not pages:
+            return []
+        loop = asyncio.get_running_loop()
+        normalize = normalizer is not None and normalizer.enabled
+        if normalize:
+            fmt, max_edge, quality = normalizer.fmt, normalizer.max_edge, normalizer.quality
+        else:
+            fmt, max_edge, quality = "PNG", 0, 0
+        spool = spool or FigureSpool()
+        spool.purge()
+        chunk = max(1, math.ceil(len(pages) / self.workers))
+        tasks = [
+            loop.run_in_executor(self.executor(), _render_pages, source, pages[i:i + chunk], zoom, fmt,
+                                 str(spool.root), normalize, max_edge, quality)
+            for i in range(0, len(pages), chunk)
+        ]
+        rendered = [item for part in await asyncio.gather(*tasks) for item in part]
+        mime = image_mime(fmt)
+        figures = []
+        for i, (path, offset, length, digest), before, width, height in rendered:
+            if normalizer is not None:
+                normalizer.record('pdf_page', before, length)
+            figures.append(FigureB64(name=f'{name}-{i}', mime=mime, path=path, offset=offset, length=length,
+                                     digest=digest, width=width, height=height))
+        return figures
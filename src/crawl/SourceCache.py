@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from src.config.Config import Config
+
+
+class SourceCache:
+    """
+    以 arxiv_id + 版本为键的源码缓存, 每个条目是一个解压目录, 索引中保存解压出的文件清单
+      - 命中时直接返回本地文件, 不再访问网络
+      - 超出字节预算时按最近访问时间 (LRU) 淘汰整个条目
+    只按确定的版本号命中; 版本号未知时由调用方先向服务器确认 (见 BaseCrawlService.fetch_source_files)
+    """
+
+    def __init__(self, root: Optional[str] = None, max_bytes: int = Config.SOURCE_CACHE_MAX_BYTES):
+        self.root = Path(root or os.path.join(Config.CACHE_PATH, 'sources'))
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.root.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.root / 'index.sqlite3'), check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    arxiv_id TEXT NOT NULL,
+                    version INTEGER NOT NULL,
+                    files TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (arxiv_id, version)
+                )
+                """
+            )
+            self._conn.commit()
+        return self._conn
+
+    def entry_dir(self, arxiv_id: str, version: int) -> Path:
+        return self.root / f"{arxiv_id.replace('/', '_')}v{version}"
+
+    def lookup(self, arxiv_id: str, version: Optional[int]) -> Optional[List[str]]:
+        """
+        version 为 None 时视为未命中: 缓存中的最新版本不一定是服务器上的当前版本
+        """
+        with self._lock:
+            row = None
+            if version is not None:
+                row = self.conn.execute(
+                    "SELECT version, files FROM entries WHERE arxiv_id = ? AND version = ?",
+                    (arxiv_id, version)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            base = self.entry_dir(arxiv_id, row[0])
+            files = [str(base / f) for f in json.loads(row[1])]
+            if not all(os.path.isfile(f) for f in files):
+                # 目录被外部清理过, 视为未命中
+                self._remove(arxiv_id, row[0])
+                self.conn.commit()
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE entries SET accessed_at = ? WHERE arxiv_id = ? AND version = ?",
+                              (time.time(), arxiv_id, row[0]))
+            self.conn.commit()
+        self.hits += 1
+        return files
+
+    def prepare(self, arxiv_id: str, version: int) -> Path:
+        """
+        返回一个干净的条目目录, 用于解压
+        """
+        target = self.entry_dir(arxiv_id, version)
+        shutil.rmtree(target, ignore_errors=True)
+        target.mkdir(parents=True, exist_ok=True)
+        return target
+
+    def commit(self, arxiv_id: str, version: int, files: List[str]) -> List[str]:
+        base = self.entry_dir(arxiv_id, version).resolve()
+        relative = [str(Path(f).resolve().relative_to(base)) for f in files]
+        size = sum(os.path.getsize(f) for f in files)
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries(arxiv_id, version, files, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (arxiv_id, version, json.dumps(relative), size, time.time()),
+            )
+            self._evict(keep=(arxiv_id, version))
+            self.conn.commit()
+        return [str(base / f) for f in relative]
+
+    def _remove(self, arxiv_id: str, version: int):
+        shutil.rmtree(self.entry_dir(arxiv_id, version), ignore_errors=True)
+        self.conn.execute("DELETE FROM entries WHERE arxiv_id = ? AND version = ?", (arxiv_id, version))
+
+    def _evict(self, keep):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.conn.execute("SELECT arxiv_id, version, size FROM entries ORDER BY accessed_at").fetchall()
+        for arxiv_id, version, size in rows:
+            if total <= self.max_bytes:
+                break
+            if (arxiv_id, version) == keep:
+                continue
+            self._remove(arxiv_id, version)
+            total -= size
@@ -12,6 +12,11 @@ class Tex(Text):
 class ArxivMetaData(BaseModel):
     figures: List[FigureB64]
     texts: List[Tex]
+    # LaTeX 合并精简前后的 token 数
+    tokens_before: Optional[int] = None
+    tokens_after: Optional[int] = None
+    # 因上下文窗口限制未发送给分析模型的内容
+    dropped: List[str] = []
 
 
 class JudgeResult(BaseModel):
@@ -21,6 +26,14 @@ class JudgeResult(BaseModel):
     comment: str = Field(description='你的评价,为什么认为他值得阅读,和我们的领域有什么关系,请勿使用任何的markdown语法,字数限制在200字以内,简短干练')
 
 
+class BatchJudgeItem(JudgeResult):
+    arxiv_id: str = Field(description='对应输入文章的 arxiv_id, 必须与输入完全一致')
+
+
+class BatchJudgeResult(BaseModel):
+    results: List[BatchJudgeItem] = Field(description='每篇输入文章一项, 不要遗漏或重复')
+
+
 class ArxivArticle(BaseModel):
     index: int
     arxiv_id: str
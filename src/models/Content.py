@@ -1,10 +1,41 @@
+import base64
+from typing import Optional
+
 from pydantic import BaseModel
 
 class FigureB64(BaseModel):
+    """
+    图片引用: 编码后的字节保存在 path 文件的 [offset, offset + length) 区间, 只在发送请求时读取并转成 base64
+    b64 不为空时为直接内联的图片
+    """
     name: str
-    b64: str
     mime:str
+    b64: Optional[str] = None
+    path: Optional[str] = None
+    offset: int = 0
+    length: int = 0
+    # 图片字节的 sha256, 用作缓存键
+    digest: Optional[str] = None
+    # 像素尺寸, 用于估算图片 token; 未知时为 None
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+    def read_bytes(self) -> bytes:
+        if self.b64 is not None:
+            return base64.b64decode(self.b64)
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+    def load_b64(self) -> str:
+        if self.b64 is not None:
+            return self.b64
+        return base64.b64encode(self.read_bytes()).decode('utf-8')
 
 class Text(BaseModel):
     name: str
-    text: str
\ No newline at end of file
+    text: str
+
+class SourceFile(BaseModel):
+    name: str
+    data: bytes
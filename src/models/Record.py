@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _url(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+
+@dataclass(slots=True)
+class JudgeRecord:
+    chinese_name: str
+    chinese_abstract: str
+    worth_read: bool
+    comment: str
+
+    @classmethod
+    def from_dict(cls, d: Optional[Dict[str, Any]]) -> Optional['JudgeRecord']:
+        if d is None:
+            return None
+        return cls(d['chinese_name'], d['chinese_abstract'], d['worth_read'], d['comment'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'chinese_name': self.chinese_name,
+            'chinese_abstract': self.chinese_abstract,
+            'worth_read': self.worth_read,
+            'comment': self.comment,
+        }
+
+
+@dataclass(slots=True)
+class ArticleRecord:
+    """
+    ArxivArticle 的轻量版本 (不含 metadata), 用于导出 / 聚合等批量读写的路径
+    链接保存为字符串, 不做校验; 字段顺序与 ArxivArticle 一致, 保证导出的 JSON 与原来完全相同
+    """
+    index: int
+    arxiv_id: str
+    category: str
+    abs_url: str
+    pdf_url: Optional[str]
+    html_url: Optional[str]
+    other_url: Optional[str]
+    title: str
+    authors: List[str]
+    comments: Optional[str]
+    subjects_primary: Optional[str]
+    subjects_other: List[str]
+    abstract: str
+    scraped_at: str
+    judgerResult: Optional[JudgeRecord]
+
+    @classmethod
+    def from_model(cls, a: ArxivArticle) -> 'ArticleRecord':
+        judge = a.judgerResult
+        return cls(
+            a.index, a.arxiv_id, a.category, str(a.abs_url), _url(a.pdf_url), _url(a.html_url), _url(a.other_url),
+            a.title, a.authors, a.comments, a.subjects_primary, a.subjects_other, a.abstract, _iso(a.scraped_at),
+            JudgeRecord(judge.chinese_name, judge.chinese_abstract, judge.worth_read, judge.comment)
+            if judge is not None else None,
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'ArticleRecord':
+        return cls(
+            d['index'], d['arxiv_id'], d['category'], d['abs_url'], d.get('pdf_url'), d.get('html_url'),
+            d.get('other_url'), d['title'], d['authors'], d.get('comments'), d.get('subjects_primary'),
+            d.get('subjects_other', []), d['abstract'], d['scraped_at'], JudgeRecord.from_dict(d.get('judgerResult')),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'index': self.index,
+            'arxiv_id': self.arxiv_id,
+            'category': self.category,
+            'abs_url': self.abs_url,
+            'pdf_url': self.pdf_url,
+            'html_url': self.html_url,
+            'other_url': self.other_url,
+            'title': self.title,
+            'authors': self.authors,
+            'comments': self.comments,
+            'subjects_primary': self.subjects_primary,
+            'subjects_other': self.subjects_other,
+            'abstract': self.abstract,
+            'scraped_at': self.scraped_at,
+            'judgerResult': self.judgerResult.to_dict() if self.judgerResult is not None else None,
+        }
+
+    def to_model(self) -> ArxivArticle:
+        return ArxivArticle.model_validate(self.to_dict())
+
+
+@dataclass(slots=True)
+class PageRecord:
+    category: str
+    url: Optional[str]
+    scraped_at: Optional[str]
+    articles: Optional[List[ArticleRecord]]
+
+    @classmethod
+    def from_model(cls, page: ArxivPageResult) -> 'PageRecord':
+        articles = [ArticleRecord.from_model(a) for a in page.articles] if page.articles is not None else None
+        return cls(page.category, _url(page.url), _iso(page.scraped_at), articles)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> 'PageRecord':
+        articles = d.get('articles')
+        return cls(d['category'], d.get('url'), d.get('scraped_at'),
+                   [ArticleRecord.from_dict(a) for a in articles] if articles is not None else None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'category': self.category,
+            'url': self.url,
+            'scraped_at': self.scraped_at,
+            'articles': [a.to_dict() for a in self.articles] if self.articles is not None else None,
+        }
+
+    def to_model(self) -> ArxivPageResult:
+        return ArxivPageResult.model_validate(self.to_dict())
@@ -1,8 +1,11 @@
 import json
 from pathlib import Path
+from typing import Collection
 
 from src.config.Config import Config
 from src.models.Arxiv import ArxivPageResult
+from src.models.Record import PageRecord
+from src.utils.JsonUtils import JsonUtils
 from src.utils.TimeUtils import TimeUtils
 
 
@@ -18,3 +21,12 @@ class AggregationUtils:
             arxivPageResult = ArxivPageResult.model_validate_json(text)
             res.append(arxivPageResult)
         return res
+
+    def agg_all_today_records(self, skip: Collection[str] = ()) -> list[PageRecord]:
+        """
+        与 agg_all_today_json 相同, 但只解析为轻量记录, 不做 pydantic 校验, 用于发布等只读场景
+        skip: 不需要读取的分类 (文件名即分类), 例如已经从历史归档中读取的分类
+        """
+        root = Path(Config.ANALYZE_REPORT_PATH)/TimeUtils.current_date_str()
+        return [PageRecord.from_dict(JsonUtils.loads(file.read_bytes())) for file in root.rglob('*.json')
+                if file.stem not in skip]
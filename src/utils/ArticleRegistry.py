@@ -0,0 +1,61 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class ArticleRegistry:
+    """
+    以 arxiv_id 为键的全局文章登记表, 用于合并同一篇论文在多个 category 中的重复工作
+    同一 (stage, arxiv_id) 只有第一个调用者真正执行, 其余调用者等待同一个 future
+    执行失败时记录会被移除, 之后的调用者可以重新尝试
+    """
+
+    def __init__(self):
+        self._futures: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._executed: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+
+    async def run(self, stage: str, arxiv_id: str, factory: Callable[[], Awaitable[T]]) -> T:
+        key = (stage, arxiv_id)
+        while True:
+            fut = self._futures.get(key)
+            if fut is None:
+                break
+            self._coalesced[stage] = self._coalesced.get(stage, 0) + 1
+            try:
+                return await asyncio.shield(fut)
+            except asyncio.CancelledError:
+                # 执行者被取消而不是自己被取消: 重新抢占执行权
+                if fut.cancelled():
+                    self._coalesced[stage] -= 1
+                    continue
+                raise
+
+        fut = asyncio.get_running_loop().create_future()
+        self._futures[key] = fut
+        self._executed[stage] = self._executed.get(stage, 0) + 1
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            self._futures.pop(key, None)
+            fut.cancel()
+            raise
+        except Exception as e:
+            self._futures.pop(key, None)
+            fut.set_exception(e)
+            # 没有等待者时避免 "exception was never retrieved" 警告
+            fut.exception()
+            raise
+        fut.set_result(result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        stages = set(self._executed) | set(self._coalesced)
+        return {
+            stage: {
+                'executed': self._executed.get(stage, 0),
+                'coalesced': self._coalesced.get(stage, 0),
+            }
+            for stage in sorted(stages)
+        }
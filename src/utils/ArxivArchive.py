@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.config.Config import Config
+from src.models.Record import ArticleRecord, JudgeRecord, PageRecord
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    url TEXT,
+    scraped_at TEXT,
+    PRIMARY KEY (date, category)
+);
+CREATE TABLE IF NOT EXISTS articles (
+    arxiv_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    abs_url TEXT NOT NULL,
+    pdf_url TEXT,
+    html_url TEXT,
+    other_url TEXT,
+    title TEXT NOT NULL,
+    authors TEXT NOT NULL,
+    comments TEXT,
+    subjects_primary TEXT,
+    subjects_other TEXT NOT NULL,
+    abstract TEXT NOT NULL,
+    scraped_at TEXT,
+    PRIMARY KEY (arxiv_id, date, category)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_category_date ON articles(category, date);
+CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date);
+CREATE TABLE IF NOT EXISTS judge_results (
+    arxiv_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    chinese_name TEXT NOT NULL,
+    chinese_abstract TEXT NOT NULL,
+    worth_read INTEGER NOT NULL,
+    comment TEXT NOT NULL,
+    PRIMARY KEY (arxiv_id, date, category)
+);
+CREATE INDEX IF NOT EXISTS idx_judge_worth_read ON judge_results(worth_read, category, date);
+CREATE TABLE IF NOT EXISTS analysis_reports (
+    arxiv_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (arxiv_id, date, category)
+);
+"""
+
+ARTICLE_COLUMNS = ('a.arxiv_id, a.date, a.category, a.idx, a.abs_url, a.pdf_url, a.html_url, a.other_url, a.title, '
+                   'a.authors, a.comments, a.subjects_primary, a.subjects_other, a.abstract, a.scraped_at, '
+                   'j.chinese_name, j.chinese_abstract, j.worth_read, j.comment')
+
+
+class ArxivArchive:
+    """
+    跨天的历史归档 (SQLite), 由 ArxivDailyWorkflow.save_json 写入, 发布和跨天查询直接读取
+    以 (arxiv_id, date, category) 为键, 分为文章 / 判断结果 / 分析报告路径三张表
+    同一 (date, category) 重新写入时整体替换, 与当天导出的 JSON 保持一致
+    报告路径保存为相对 ANALYZE_REPORT_PATH 的路径
+    """
+
+    def __init__(self, path: Optional[str] = None, root: Optional[str] = None):
+        self.path = path or Config.ARCHIVE_PATH
+        self.root = Path(root or Config.ANALYZE_REPORT_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def store_page(self, date: str, page: PageRecord, reports: Optional[Dict[str, Path]] = None):
+        """
+        reports: arxiv_id -> 分析报告文件路径
+        """
+        reports = reports or {}
+        key = (date, page.category)
+        articles = page.articles or []
+        with self._lock, self.conn:
+            for table in ('articles', 'judge_results', 'analysis_reports'):
+                self.conn.execute(f"DELETE FROM {table} WHERE date = ? AND category = ?", key)
+            self.conn.execute("INSERT OR REPLACE INTO pages(date, category, url, scraped_at) VALUES (?, ?, ?, ?)",
+                              (*key, page.url, page.scraped_at))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(a.arxiv_id, *key, a.index, a.abs_url, a.pdf_url, a.html_url, a.other_url, a.title,
+                  json.dumps(a.authors, ensure_ascii=False), a.comments, a.subjects_primary,
+                  json.dumps(a.subjects_other, ensure_ascii=False), a.abstract, a.scraped_at) for a in articles],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO judge_results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(a.arxiv_id, *key, j.chinese_name, j.chinese_abstract, int(j.worth_read), j.comment)
+                 for a in articles if (j := a.judgerResult) is not None],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO analysis_reports VALUES (?, ?, ?, ?)",
+                [(arxiv_id, *key, self._relative(path)) for arxiv_id, path in reports.items()],
+            )
+
+    def _relative(self, path: Path) -> str:
+        path = Path(path)
+        try:
+            return path.resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return str(path)
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _article(row) -> ArticleRecord:
+        judge = JudgeRecord(row[15], row[16], bool(row[17]), row[18]) if row[15] is not None else None
+        return ArticleRecord(row[3], row[0], row[2], row[4], row[5], row[6], row[7], row[8], json.loads(row[9]),
+                             row[10], row[11], json.loads(row[12]), row[13], row[14], judge)
+
+    def load_pages(self, date: str) -> List[PageRecord]:
+        """
+        某一天所有分类的结果, 与当天导出的 JSON 内容相同
+        """
+        with self._lock:
+            pages = self.conn.execute(
+                "SELECT category, url, scraped_at FROM pages WHERE date = ? ORDER BY category", (date,)).fetchall()
+            rows = self.conn.execute(
+                f"SELECT {ARTICLE_COLUMNS} FROM articles a LEFT JOIN judge_results j "
+                "USING (arxiv_id, date, category) WHERE a.date = ? ORDER BY a.category, a.idx", (date,)).fetchall()
+        by_category: Dict[str, List[ArticleRecord]] = {}
+        for row in rows:
+            by_category.setdefault(row[2], []).append(self._article(row))
+        return [PageRecord(category, url, scraped_at, by_category.get(category, []))
+                for category, url, scraped_at in pages]
+
+    def query(self, category: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+              worth_read: Optional[bool] = None) -> List[Tuple[str, ArticleRecord]]:
+        """
+        跨天查询, 返回 (日期, 文章), 例如本月所有值得阅读的 cs.OS 论文: query('cs.OS', since='20251101', worth_read=True)
+        日期格式与目录名相同 (YYYYMMDD), 两端都包含
+        """
+        conditions, params = [], []
+        if category is not None:
+            conditions.append("a.category = ?")
+            params.append(category)
+        if since is not None:
+            conditions.append("a.date >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("a.date <= ?")
+            params.append(until)
+        if worth_read is not None:
+            conditions.append("j.worth_read = ?")
+            params.append(int(worth_read))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {ARTICLE_COLUMNS} FROM articles a LEFT JOIN judge_results j USING (arxiv_id, date, category) "
+                f"{where} ORDER BY a.date, a.category, a.idx", params).fetchall()
+        return [(row[1], self._article(row)) for row in rows]
+
+    def report_path(self, arxiv_id: str, date: str, category: str) -> Optional[Path]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT path FROM analysis_reports WHERE arxiv_id = ? AND date = ? AND category = ?",
+                (arxiv_id, date, category)).fetchone()
+        return self.root / row[0] if row else None
@@ -0,0 +1,27 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JsonUtils:
+    """
+    有 orjson 时使用 orjson, 否则退回标准库; 两者输出的字节完全相同 (UTF-8, 缩进 2 空格)
+    """
+
+    @staticmethod
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        if indent:
+            return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
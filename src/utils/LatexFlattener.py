@@ -0,0 +1,92 @@
+import posixpath
+import re
+from typing import Dict, List, Optional, Set
+
+
+class LatexFlattener:
+    """
+    将多文件的 LaTeX 工程合并为单个文档:
+      - 以包含 \\documentclass 的文件作为主文档
+      - 递归内联 \\input / \\include
+      - 去掉注释
+    prune 进一步去掉 comment 环境 / \\iffalse 块, 可选去掉参考文献和附录, 并压缩空白
+    sources 的键为文件相对路径 (使用 / 分隔), 值为文件内容
+    """
+    INPUT_PATTERN = re.compile(r'\\(?:input|include|subfile)\s*(?:\{([^}]+)\}|\s([^\s{}\\]+))')
+    COMMENT_PATTERN = re.compile(r'(?m)(?<!\\)((?:\\\\)*)%.*$')
+    COMMENT_ENV_PATTERN = re.compile(r'\\begin\{comment\}.*?\\end\{comment\}', re.S)
+    IFFALSE_PATTERN = re.compile(r'\\iffalse\b.*?\\fi\b', re.S)
+    BIBLIOGRAPHY_PATTERN = re.compile(
+        r'\\begin\{thebibliography\}.*?\\end\{thebibliography\}'
+        r'|\\bibliography(?:style)?\s*\{[^}]*\}|\\printbibliography\b(?:\[[^\]]*\])?',
+        re.S)
+    APPENDIX_PATTERN = re.compile(r'\\appendix\b|\\begin\{appendix\}|\\begin\{appendices\}')
+    END_DOCUMENT_PATTERN = re.compile(r'\\end\{document\}')
+    MAX_DEPTH = 20
+
+    def __init__(self, sources: Dict[str, str]):
+        self.sources = sources
+        self.used: Set[str] = set()
+
+    @classmethod
+    def strip_comments(cls, text: str) -> str:
+        return cls.COMMENT_PATTERN.sub(r'\1', text)
+
+    def find_main(self) -> Optional[str]:
+        candidates = [key for key, text in self.sources.items()
+                      if '\\documentclass' in self.strip_comments(text)]
+        if not candidates:
+            return None
+        # 同时存在多个时优先选择包含 \begin{document} 且内容最长的文件
+        return max(candidates, key=lambda k: ('\\begin{document}' in self.sources[k], len(self.sources[k])))
+
+    def resolve(self, name: str, base_dir: str) -> Optional[str]:
+        name = name.strip().strip('"')
+        for candidate in (name, f'{name}.tex'):
+            key = posixpath.normpath(posixpath.join(base_dir, candidate))
+            if key in self.sources:
+                return key
+        return None
+
+    def flatten(self, main: Optional[str] = None) -> str:
+        main = main or self.find_main()
+        if main is None:
+            return ''
+        return self._inline(main, posixpath.dirname(main), [])
+
+    def _inline(self, key: str, base_dir: str, stack: List[str]) -> str:
+        self.used.add(key)
+        text = self.strip_comments(self.sources[key])
+        if len(stack) >= self.MAX_DEPTH:
+            return text
+
+        def _replace(m: re.Match) -> str:
+            target = self.resolve(m.group(1) or m.group(2), base_dir)
+            if target is None or target in stack or target == key:
+                return m.group(0)
+            # \input 的路径相对于主文档目录解析
+            return self._inline(target, base_dir, stack + [key])
+
+        return self.INPUT_PATTERN.sub(_replace, text)
+
+    def unused(self) -> List[str]:
+        return [key for key in self.sources if key not in self.used]
+
+    @classmethod
+    def prune(cls, text: str, drop_bibliography: bool = False, drop_appendix: bool = False) -> str:
+        """
+        去掉不会被编译的内容, text 应已去掉注释
+        """
+        text = cls.COMMENT_ENV_PATTERN.sub('', text)
+        text = cls.IFFALSE_PATTERN.sub('', text)
+        if drop_bibliography:
+            text = cls.BIBLIOGRAPHY_PATTERN.sub('', text)
+        if drop_appendix:
+            m = cls.APPENDIX_PATTERN.search(text)
+            if m:
+                end = cls.END_DOCUMENT_PATTERN.search(text, m.start())
+                text = text[:m.start()] + (text[end.start():] if end else '')
+        # 去掉行尾空白, 连续空行只保留一个 (LaTeX 中空行表示分段)
+        text = re.sub(r'[ \t]+$', '', text, flags=re.M)
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        return text.strip() + '\n'
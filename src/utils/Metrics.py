@@ -0,0 +1,241 @@
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage
+
+from src.config.Config import Config
+
+# 美元 / 百万 tokens: (输入, 输出, 缓存命中的输入), 可用 LLM_PRICES 覆盖或补充
+DEFAULT_PRICES: Dict[str, Tuple[float, float, float]] = {
+    'gpt-5': (1.25, 10.0, 0.125),
+    'gpt-5-mini': (0.25, 2.0, 0.025),
+    'gpt-5-nano': (0.05, 0.4, 0.005),
+}
+
+
+def parse_prices(spec: str) -> Dict[str, Tuple[float, float, float]]:
+    """
+    解析 "gpt-5-mini=0.25,2,0.025;my-model=1,4" 形式的价格配置, 缺省的缓存价格按输入价格计
+    """
+    prices = dict(DEFAULT_PRICES)
+    for item in filter(None, (s.strip() for s in spec.split(';'))):
+        model, _, values = item.partition('=')
+        numbers = [float(v) for v in values.split(',') if v.strip()]
+        if len(numbers) < 2:
+            continue
+        prices[model.strip()] = (numbers[0], numbers[1], numbers[2] if len(numbers) > 2 else numbers[0])
+    return prices
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class MetricsCollector:
+    """
+    进程内共享的运行指标:
+      - 每次模型调用的 usage_metadata (输入/输出/缓存/推理 tokens), 按模型和分类汇总成本
+      - 每个阶段 (模型调用, 页面请求, 下载, 解压/解析) 的耗时分布和失败次数
+      - 模型调用的重试次数和原因
+      - 因本地预筛选 / 跨天复用等原因省下的模型调用次数
+    每次工作流结束时写出汇总 JSON 和 Prometheus textfile (供 node_exporter 的 textfile collector 采集)
+    """
+    QUANTILES = (0.5, 0.9, 0.99)
+    # 当前工作流的分类, asyncio 任务创建时会复制上下文
+    category: contextvars.ContextVar[str] = contextvars.ContextVar('metrics_category', default='-')
+
+    def __init__(self, path: Optional[str] = None, prices: Optional[Dict[str, Tuple[float, float, float]]] = None):
+        self.path = Path(path or Config.METRICS_PATH)
+        self.prices = prices if prices is not None else parse_prices(Config.LLM_PRICES)
+        self.started_at = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+        self.llm: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.categories: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.retries: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.saved: Dict[str, int] = defaultdict(int)
+
+    # ------------------------------------------------------------------
+    # 采集
+    # ------------------------------------------------------------------
+    def cost(self, model: str, input_tokens: int, output_tokens: int, cached_tokens: int) -> float:
+        price = self.prices.get(model)
+        if price is None:
+            return 0.0
+        return ((input_tokens - cached_tokens) * price[0] + output_tokens * price[1]
+                + cached_tokens * price[2]) / 1_000_000
+
+    def record_latency(self, stage: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.latencies[stage].append(seconds)
+            if not ok:
+                self.errors[stage] += 1
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record_latency(stage, time.perf_counter() - start, ok)
+
+    def record_retry(self, stage: str, reason: str):
+        with self._lock:
+            self.retries[(stage, reason)] += 1
+
+    def record_saved(self, reason: str, calls: int):
+        with self._lock:
+            self.saved[reason] += calls
+
+    def record_usage(self, model: str, messages: Iterable):
+        """
+        累加一次模型调用返回的 usage_metadata; agent 的结果中可能包含多条 AIMessage
+        """
+        usage = {'input_tokens': 0, 'output_tokens': 0, 'cached_tokens': 0, 'reasoning_tokens': 0}
+        for m in messages:
+            if not isinstance(m, AIMessage) or not m.usage_metadata:
+                continue
+            meta = m.usage_metadata
+            usage['input_tokens'] += meta.get('input_tokens', 0)
+            usage['output_tokens'] += meta.get('output_tokens', 0)
+            usage['cached_tokens'] += (meta.get('input_token_details') or {}).get('cache_read', 0) or 0
+            usage['reasoning_tokens'] += (meta.get('output_token_details') or {}).get('reasoning', 0) or 0
+        cost = self.cost(model, usage['input_tokens'], usage['output_tokens'], usage['cached_tokens'])
+        with self._lock:
+            for bucket in (self.llm[model], self.categories[self.category.get()]):
+                bucket['calls'] += 1
+                bucket['cost'] += cost
+                for k, v in usage.items():
+                    bucket[k] += v
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+    def summary(self) -> Dict:
+        with self._lock:
+            latency = {
+                stage: {
+                    'count': len(values),
+                    'errors': self.errors.get(stage, 0),
+                    'sum': sum(values),
+                    'max': max(values),
+                    **{f'p{int(q * 100)}': percentile(values, q) for q in self.QUANTILES},
+                }
+                for stage, values in sorted(self.latencies.items()) if values
+            }
+            return {
+                'started_at': self.started_at.isoformat(),
+                'updated_at': datetime.now(timezone.utc).isoformat(),
+                'total_cost': sum(b['cost'] for b in self.llm.values()),
+                'unpriced_models': sorted(m for m in self.llm if m not in self.prices),
+                'llm': {m: dict(b) for m, b in sorted(self.llm.items())},
+                'categories': {c: dict(b) for c, b in sorted(self.categories.items())},
+                'latency': latency,
+                'retries': [{'stage': s, 'reason': r, 'count': n} for (s, r), n in sorted(self.retries.items())],
+                'saved_calls': dict(sorted(self.saved.items())),
+            }
+
+    @staticmethod
+    def _label(value: str) -> str:
+        return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def prometheus(self, summary: Optional[Dict] = None) -> str:
+        summary = summary or self.summary()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]]):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                label = ','.join(f'{k}="{self._label(v)}"' for k, v in labels.items())
+                lines.append(f'{name}{{{label}}} {value:.12g}' if label else f'{name} {value:.12g}')
+
+        llm = summary['llm']
+        metric('arxiv_llm_calls_total', 'counter', 'LLM calls per model',
+               (({'model': m}, b['calls']) for m, b in llm.items()))
+        metric('arxiv_llm_tokens_total', 'counter', 'LLM tokens per model and kind',
+               (({'model': m, 'kind': k.removesuffix('_tokens')}, b[k]) for m, b in llm.items()
+                for k in ('input_tokens', 'output_tokens', 'cached_tokens', 'reasoning_tokens')))
+        metric('arxiv_llm_cost_usd_total', 'counter', 'Estimated LLM cost in USD per model',
+               (({'model': m}, b['cost']) for m, b in llm.items()))
+        metric('arxiv_category_cost_usd_total', 'counter', 'Estimated LLM cost in USD per category',
+               (({'category': c}, b['cost']) for c, b in summary['categories'].items()))
+        metric('arxiv_llm_retries_total', 'counter', 'LLM call retries per stage and reason',
+               (({'stage': r['stage'], 'reason': r['reason']}, r['count']) for r in summary['retries']))
+        metric('arxiv_llm_calls_saved_total', 'counter', 'LLM calls avoided per reason',
+               (({'reason': r}, n) for r, n in summary.get('saved_calls', {}).items()))
+        metric('arxiv_stage_errors_total', 'counter', 'Failed operations per stage',
+               (({'stage': s}, v['errors']) for s, v in summary['latency'].items()))
+
+        lines.append('# HELP arxiv_stage_latency_seconds Latency per stage')
+        lines.append('# TYPE arxiv_stage_latency_seconds summary')
+        for stage, v in summary['latency'].items():
+            label = self._label(stage)
+            for q in self.QUANTILES:
+                lines.append(f'arxiv_stage_latency_seconds{{stage="{label}",quantile="{q:g}"}} '
+                             f'{v[f"p{int(q * 100)}"]:.12g}')
+            lines.append(f'arxiv_stage_latency_seconds_sum{{stage="{label}"}} {v["sum"]:.12g}')
+            lines.append(f'arxiv_stage_latency_seconds_count{{stage="{label}"}} {v["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _write_atomic(path: Path, text: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(text, encoding='utf-8')
+        tmp.replace(path)
+
+    def summary_path(self, date: str) -> Path:
+        return self.path / f'{date}.json'
+
+    def write(self, date: str) -> Dict:
+        """
+        写出 {METRICS_PATH}/{date}.json 和 {METRICS_PATH}/arxiv_archive.prom
+        """
+        summary = self.summary()
+        self._write_atomic(self.summary_path(date), json.dumps(summary, ensure_ascii=False, indent=2))
+        self._write_atomic(self.path / 'arxiv_archive.prom', self.prometheus(summary))
+        return summary
+
+    @staticmethod
+    def footer(summary: Dict) -> str:
+        """
+        发布页末尾的成本 / 耗时说明
+        """
+        lines = ['## 运行统计', f"- 预估模型成本: ${summary['total_cost']:.4f}"]
+        for model, b in summary['llm'].items():
+            lines.append(f"- {model}: {int(b['calls'])} 次调用, 输入 {int(b['input_tokens'])} tokens "
+                         f"(缓存 {int(b['cached_tokens'])}), 输出 {int(b['output_tokens'])} tokens, ${b['cost']:.4f}")
+        for category, b in summary['categories'].items():
+            if category != '-':
+                lines.append(f"- {category}: {int(b['calls'])} 次调用, ${b['cost']:.4f}")
+        for stage, v in summary['latency'].items():
+            lines.append(f"- {stage} 耗时: p50 {v['p50']:.2f}s / p90 {v['p90']:.2f}s / max {v['max']:.2f}s"
+                         f" ({v['count']} 次, 失败 {v['errors']})")
+        retries = sum(r['count'] for r in summary['retries'])
+        if retries:
+            lines.append(f"- 模型调用重试 {retries} 次")
+        saved = summary.get('saved_calls') or {}
+        if saved:
+            lines.append(f"- 节省模型调用 {sum(saved.values())} 次 ("
+                         + ', '.join(f'{r} {n}' for r, n in saved.items()) + ")")
+        return '\n'.join(lines) + '\n'
+
+
+# 进程内唯一的实例, 模型调用 / 爬取 / 工作流共用
+metrics = MetricsCollector()
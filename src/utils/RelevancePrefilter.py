@@ -0,0 +1,165 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+from src.config.Config import Config
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+
+# 预筛选生成的判断结果都以此开头, 校准时据此排除
+PREFILTER_COMMENT = '本地预筛选'
+
+STOPWORDS = frozenset("""
+a about above after again against all also an and any are as at be because been before being below between both
+but by can could did do does doing down during each few for from further had has have having here how however i
+if in into is it its itself just may might more most much must no nor not now of off on once only or other our
+out over own paper propose proposed same show shows should so some such than that the their them then there these
+they this those through to too under until up upon us use used using very via was we well were what when where
+which while who whom why will with within without would yet
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    小写英文单词 + 相邻词组成的二元组, 做简单的词尾归一
+    """
+    words = []
+    for w in re.findall(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)*", text.lower()):
+        if w in STOPWORDS or len(w) < 2:
+            continue
+        for suffix, repl in (('ies', 'y'), ('sses', 'ss'), ('s', '')):
+            if w.endswith(suffix) and not w.endswith('ss') and len(w) > len(suffix) + 2:
+                w = w[:-len(suffix)] + repl
+                break
+        words.append(w)
+    return words + [f'{a} {b}' for a, b in zip(words, words[1:])]
+
+
+class TfidfIndex:
+    """
+    纯 Python 的稀疏 TF-IDF, 以当天一个分类的全部文章为语料一次性建索引
+    """
+
+    def __init__(self, documents: List[str]):
+        self.tokens = [tokenize(d) for d in documents]
+        df = Counter(t for tokens in self.tokens for t in set(tokens))
+        n = len(documents)
+        self.idf = {t: math.log((1 + n) / (1 + c)) + 1 for t, c in df.items()}
+        # 查询中出现但语料中没有的词按只出现一次计算
+        self.default_idf = math.log((1 + n) / 2) + 1
+        self.vectors = [self.vectorize_tokens(tokens) for tokens in self.tokens]
+
+    def vectorize_tokens(self, tokens: List[str]) -> Dict[str, float]:
+        tf = Counter(tokens)
+        vec = {t: (1 + math.log(c)) * self.idf.get(t, self.default_idf) for t, c in tf.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {t: v / norm for t, v in vec.items()}
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        return self.vectorize_tokens(tokenize(text))
+
+    @staticmethod
+    def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+        if len(a) > len(b):
+            a, b = b, a
+        return sum(v * b.get(t, 0.0) for t, v in a.items())
+
+
+class RelevancePrefilter:
+    """
+    在调用判断模型之前, 用 TF-IDF 相似度把明显与研究方向无关的文章直接标记为不值得阅读
+      score = max(与各个偏好短语的相似度) - NEGATIVE_WEIGHT * max(与各个不偏好短语的相似度)
+    score < threshold 的文章跳过模型调用
+    偏好短语来自 PREFILTER_KEYWORDS (英文, 逗号/分号/换行分隔), 未配置时使用 RESEARCH_PREFER
+    阈值优先使用 PREFILTER_THRESHOLD, 其次使用校准脚本 scripts/calibratePrefilter.py 生成的报告;
+    两者都没有时 threshold 为 None, 不跳过任何文章 (与关键词没有共同词的摘要得分为 0, 不能默认跳过)
+    """
+    NEGATIVE_WEIGHT = 0.5
+    SEPARATORS = re.compile(r'[,;，；、\n]+')
+    CALIBRATION_PATH = os.path.join(Config.CACHE_PATH, 'prefilter_calibration.json')
+
+    def __init__(self, keywords: str = Config.PREFILTER_KEYWORDS, negative: str = Config.PREFILTER_NEGATIVE,
+                 threshold: Optional[float] = Config.PREFILTER_THRESHOLD):
+        self.positive = [p.strip() for p in self.SEPARATORS.split(keywords) if tokenize(p)]
+        self.negative = [p.strip() for p in self.SEPARATORS.split(negative) if tokenize(p)]
+        self.threshold = threshold if threshold is not None else self.calibrated_threshold()
+
+    @classmethod
+    def calibrated_threshold(cls) -> Optional[float]:
+        try:
+            with open(cls.CALIBRATION_PATH, encoding='utf-8') as f:
+                return float(json.load(f)['threshold'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @property
+    def calibrated(self) -> bool:
+        return self.threshold is not None
+
+    def skips(self, score: float) -> bool:
+        return self.threshold is not None and score < self.threshold
+
+    @property
+    def enabled(self) -> bool:
+        # 偏好中没有可用的英文词 (例如默认的 <everything> 或纯中文描述) 时不做预筛选
+        return bool(self.positive) and self.positive != ['<everything>']
+
+    @staticmethod
+    def document(article: ArxivArticle) -> str:
+        return ' '.join([article.title, article.abstract, article.subjects_primary or '', *article.subjects_other])
+
+    def score(self, articles: List[ArxivArticle]) -> List[float]:
+        index = TfidfIndex([self.document(a) for a in articles])
+        positive = [index.vectorize(p) for p in self.positive]
+        negative = [index.vectorize(p) for p in self.negative]
+        scores = []
+        for vec in index.vectors:
+            pos = max((index.cosine(vec, p) for p in positive), default=0.0)
+            neg = max((index.cosine(vec, n) for n in negative), default=0.0)
+            scores.append(pos - self.NEGATIVE_WEIGHT * neg)
+        return scores
+
+    def skipped_result(self, article: ArxivArticle, score: float) -> JudgeResult:
+        return JudgeResult(
+            chinese_name=article.title,
+            chinese_abstract=article.abstract,
+            worth_read=False,
+            comment=f'{PREFILTER_COMMENT}: 与研究方向的相关度 {score:.3f} 低于阈值 {self.threshold:.3f}, 未调用模型',
+        )
+
+    def calibrate(self, pages: List[ArxivPageResult], target_recall: float = 0.98) -> Dict:
+        """
+        用历史的模型判断结果校准阈值: 对每个候选阈值统计会跳过的比例, 以及模型认为值得阅读的文章被保留的比例 (召回率)
+        推荐召回率不低于 target_recall 时跳过最多的阈值; 本地预筛选产生的判断结果不参与校准
+        """
+        samples = []
+        for page in pages:
+            articles = [a for a in page.articles
+                        if a.judgerResult and not a.judgerResult.comment.startswith(PREFILTER_COMMENT)]
+            if articles:
+                samples += zip(self.score(articles), (a.judgerResult.worth_read for a in articles))
+        positives = sum(1 for _, worth in samples if worth)
+
+        table = []
+        # 跳过分数严格低于阈值的文章, 阈值取各个样本分数, 最低分即 "全部保留"
+        for threshold in sorted({s for s, _ in samples}):
+            skipped = [worth for s, worth in samples if s < threshold]
+            table.append({
+                'threshold': threshold,
+                'skip_rate': len(skipped) / len(samples),
+                'recall': 1 - sum(skipped) / positives if positives else 1.0,
+            })
+        accepted = [row for row in table if row['recall'] >= target_recall]
+        best = max(accepted, key=lambda row: row['skip_rate'], default={'threshold': None, 'skip_rate': 0.0,
+                                                                         'recall': 1.0})
+        return {
+            **best,
+            'target_recall': target_recall,
+            'samples': len(samples),
+            'positives': positives,
+            'keywords': self.positive,
+            'negative': self.negative,
+            'table': table,
+        }
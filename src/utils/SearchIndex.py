@@ -0,0 +1,217 @@
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from src.config.Config import Config
+from src.models.Record import PageRecord
+from src.utils.JsonUtils import JsonUtils
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    arxiv_id TEXT,
+    date TEXT NOT NULL,
+    category TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_docs_source ON docs(source);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, chinese_title, abstract, chinese_abstract, comment, body, tokenize = 'trigram'
+);
+"""
+
+FTS_COLUMNS = ('title', 'chinese_title', 'abstract', 'chinese_abstract', 'comment', 'body')
+# bm25 各列权重, 顺序与 FTS_COLUMNS 一致
+BM25_WEIGHTS = (5.0, 5.0, 2.0, 2.0, 3.0, 1.0)
+
+
+class SearchHit(BaseModel):
+    arxiv_id: Optional[str] = None
+    date: str
+    category: str
+    # article: 文章元信息与判断结果; report: 分析报告
+    kind: str
+    title: str
+    snippet: str
+    score: float
+    path: str
+
+
+class SearchIndex:
+    """
+    基于 SQLite FTS5 (trigram 分词, 中英文都可以按子串检索) 的全文索引
+    覆盖每日 JSON 中的标题 / 摘要 / 中文标题 / 中文摘要 / 评价, 以及分析报告正文
+    按文件的 mtime + size 增量更新, 只重新索引有变化的文件, 已删除的文件同时移出索引
+    """
+
+    def __init__(self, path: Optional[str] = None, root: Optional[str] = None):
+        self.path = path or Config.SEARCH_INDEX_PATH
+        self.root = Path(root or Config.ANALYZE_REPORT_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # ------------------------------------------------------------------
+    # 索引
+    # ------------------------------------------------------------------
+    def _files(self, folder: Optional[Path]) -> Tuple[List[Path], List[Path]]:
+        """
+        返回 (每日 JSON, 分析报告), 目录结构为 日期/分类/分类.json 与 日期/分类/*.md
+        """
+        folders = [Path(folder)] if folder is not None else sorted(self.root.glob('*/*'))
+        pages, reports = [], []
+        for f in folders:
+            if not f.is_dir() or not f.parent.name.isdigit():
+                continue
+            page = f / f'{f.name}.json'
+            if page.exists():
+                pages.append(page)
+            reports += sorted(f.glob('*.md'))
+        return pages, reports
+
+    def _delete_source(self, source: str):
+        ids = [row[0] for row in self.conn.execute("SELECT id FROM docs WHERE source = ?", (source,))]
+        self.conn.executemany("DELETE FROM docs_fts WHERE rowid = ?", [(i,) for i in ids])
+        self.conn.execute("DELETE FROM docs WHERE source = ?", (source,))
+        self.conn.execute("DELETE FROM sources WHERE path = ?", (source,))
+
+    def _insert(self, source: str, kind: str, arxiv_id: Optional[str], date: str, category: str,
+                fields: Dict[str, str]):
+        cur = self.conn.execute("INSERT INTO docs(source, kind, arxiv_id, date, category) VALUES (?, ?, ?, ?, ?)",
+                                (source, kind, arxiv_id, date, category))
+        self.conn.execute(
+            f"INSERT INTO docs_fts(rowid, {', '.join(FTS_COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (cur.lastrowid, *(fields.get(c) or '' for c in FTS_COLUMNS)),
+        )
+
+    def _index_page(self, source: str, file: Path):
+        page = PageRecord.from_dict(JsonUtils.loads(file.read_bytes()))
+        date, category = file.parent.parent.name, file.parent.name
+        for a in page.articles or []:
+            judge = a.judgerResult
+            self._insert(source, 'article', a.arxiv_id, date, category, {
+                'title': a.title,
+                'abstract': a.abstract,
+                'chinese_title': judge.chinese_name if judge else '',
+                'chinese_abstract': judge.chinese_abstract if judge else '',
+                'comment': judge.comment if judge else '',
+            })
+
+    def _index_report(self, source: str, file: Path):
+        text = file.read_text(encoding='utf-8', errors='replace')
+        first, _, body = text.partition('\n')
+        title = first[2:].strip() if first.startswith('# ') else file.stem
+        date, category = file.parent.parent.name, file.parent.name
+        # 报告文件名由标题生成, 通过同一天同一分类中标题相同的文章找到 arxiv_id
+        row = self.conn.execute(
+            "SELECT d.arxiv_id FROM docs d JOIN docs_fts f ON f.rowid = d.id "
+            "WHERE d.kind = 'article' AND d.date = ? AND d.category = ? AND f.title = ? LIMIT 1",
+            (date, category, title)).fetchone()
+        self._insert(source, 'report', row[0] if row else None, date, category,
+                     {'title': title, 'body': body if first.startswith('# ') else text})
+
+    def reindex(self, folder: Optional[Path] = None) -> Dict[str, int]:
+        """
+        增量更新索引; folder 为某一天某个分类的目录时只检查该目录, 否则检查整个 ANALYZE_REPORT_PATH
+        返回 {'indexed': 重新索引的文件数, 'removed': 移出索引的文件数, 'unchanged': 未变化的文件数}
+        """
+        pages, reports = self._files(folder)
+        stats = {'indexed': 0, 'removed': 0, 'unchanged': 0}
+        with self._lock, self.conn:
+            known = dict(((p, (m, s)) for p, m, s in self.conn.execute("SELECT path, mtime_ns, size FROM sources")))
+            seen = set()
+            # 先索引 JSON, 报告需要通过文章标题找到 arxiv_id
+            for file, index in [(p, self._index_page) for p in pages] + [(r, self._index_report) for r in reports]:
+                source = file.relative_to(self.root).as_posix()
+                seen.add(source)
+                st = file.stat()
+                if known.get(source) == (st.st_mtime_ns, st.st_size):
+                    stats['unchanged'] += 1
+                    continue
+                self._delete_source(source)
+                try:
+                    index(source, file)
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    print(f"Failed to index {file}: {e}")
+                    continue
+                self.conn.execute("INSERT INTO sources(path, mtime_ns, size) VALUES (?, ?, ?)",
+                                  (source, st.st_mtime_ns, st.st_size))
+                stats['indexed'] += 1
+            prefix = Path(folder).relative_to(self.root).as_posix() + '/' if folder is not None else ''
+            for source in known:
+                if source.startswith(prefix) and source not in seen:
+                    self._delete_source(source)
+                    stats['removed'] += 1
+        return stats
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _terms(query: str) -> List[str]:
+        return [t.replace('"', '') for t in query.split() if t.replace('"', '')]
+
+    def search(self, query: str, limit: int = 20, category: Optional[str] = None, kind: Optional[str] = None,
+               since: Optional[str] = None) -> List[SearchHit]:
+        """
+        多个关键词之间为 AND; 关键词都不短于 3 个字符时走 FTS5 (bm25 排序), 否则退回子串匹配 (按日期倒序)
+        """
+        terms = self._terms(query)
+        if not terms:
+            return []
+        conditions: List[str] = []
+        params: List = []
+        for column, value in (('d.category', category), ('d.kind', kind)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            conditions.append("d.date >= ?")
+            params.append(since)
+
+        if all(len(t) >= 3 for t in terms):
+            match = ' '.join(f'"{t}"' for t in terms)
+            score = f"bm25(docs_fts, {', '.join(map(str, BM25_WEIGHTS))})"
+            snippet = "snippet(docs_fts, -1, '[', ']', '…', 24)"
+            where = ' AND '.join(['docs_fts MATCH ?'] + conditions)
+            sql = (f"SELECT d.arxiv_id, d.date, d.category, d.kind, f.title, {snippet}, {score}, d.source "
+                   f"FROM docs_fts f JOIN docs d ON d.id = f.rowid WHERE {where} ORDER BY {score} LIMIT ?")
+            params = [match] + params + [limit]
+        else:
+            # trigram 无法匹配短于 3 个字符的关键词, 直接做子串扫描
+            for t in terms:
+                conditions.append('(' + ' OR '.join(f"instr(f.{c}, ?) > 0" for c in FTS_COLUMNS) + ')')
+                params += [t] * len(FTS_COLUMNS)
+            sql = (f"SELECT d.arxiv_id, d.date, d.category, d.kind, f.title, "
+                   f"substr(coalesce(nullif(f.chinese_title, ''), nullif(f.abstract, ''), f.body), 1, 80), 0.0, d.source "
+                   f"FROM docs_fts f JOIN docs d ON d.id = f.rowid WHERE {' AND '.join(conditions)} "
+                   f"ORDER BY d.date DESC LIMIT ?")
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [SearchHit(arxiv_id=r[0], date=r[1], category=r[2], kind=r[3], title=r[4],
+                          snippet=' '.join(r[5].split()), score=-r[6], path=r[7]) for r in rows]
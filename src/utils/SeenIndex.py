@@ -0,0 +1,186 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.config.Config import Config
+from src.models.Arxiv import JudgeResult
+from src.models.Record import PageRecord
+from src.utils.RelevancePrefilter import PREFILTER_COMMENT
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    arxiv_id TEXT PRIMARY KEY,
+    version INTEGER,
+    chinese_name TEXT NOT NULL,
+    chinese_abstract TEXT NOT NULL,
+    worth_read INTEGER NOT NULL,
+    comment TEXT NOT NULL,
+    first_date TEXT NOT NULL,
+    last_date TEXT NOT NULL,
+    category TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    fingerprint TEXT NOT NULL DEFAULT ''
+);
+"""
+
+COLUMNS = ('arxiv_id, version, chinese_name, chinese_abstract, worth_read, comment, first_date, last_date, category, '
+           'updated_at, fingerprint')
+
+# 单条 IN 查询的参数个数上限 (SQLite 默认 32766, 留出余量)
+_CHUNK = 900
+
+
+class BloomFilter:
+    """
+    纯 Python 的布隆过滤器, 位数组为 bytearray, k 个哈希由一次 blake2b 的两段做双重哈希得到
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+
+class SeenIndex:
+    """
+    跨天的已判断论文索引, 以 arxiv_id 为键, 保存最近一次模型判断的结果和当时的版本号
+    /new 列表中的交叉列表和替换 (replacement) 常常是之前已经判断过的论文:
+      - 版本号相同或无法得知时直接复用保存的 JudgeResult, 不再调用模型
+      - 版本号变化 (例如 v1 -> v2) 时重新判断, 之后覆盖保存的结果
+      - 与 LLMCache 一样记录判断时的指纹 (模型 + 系统提示词), 指纹不同的结果不复用, 重新判断后覆盖
+    表前面有一个进程内的布隆过滤器, 第一次查询时由表中所有 arxiv_id 构建, 大部分新论文不需要访问数据库
+    本地预筛选产生的判断结果不保存, 阈值调整后仍会重新计算
+    """
+
+    def __init__(self, path: Optional[str] = None, error_rate: float = 0.01):
+        self.path = path or Config.SEEN_INDEX_PATH
+        self.error_rate = error_rate
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.changed = 0
+        # 指纹不同 (模型或提示词已修改) 需要重新判断
+        self.stale = 0
+        self.misses = 0
+        # 布隆过滤器误判, 查询数据库后发现不存在
+        self.false_positives = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            # 旧版本的表没有 fingerprint 列, 补上后旧结果的指纹为空, 不会被复用
+            if 'fingerprint' not in {row[1] for row in self._conn.execute("PRAGMA table_info(seen)")}:
+                self._conn.execute("ALTER TABLE seen ADD COLUMN fingerprint TEXT NOT NULL DEFAULT ''")
+            self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._bloom = None
+
+    @property
+    def bloom(self) -> BloomFilter:
+        if self._bloom is None:
+            ids = [row[0] for row in self.conn.execute("SELECT arxiv_id FROM seen")]
+            # 预留一倍容量给之后写入的论文, 超过后误判率会上升, 但结果仍然正确
+            self._bloom = BloomFilter(max(2 * len(ids), 100_000), self.error_rate)
+            for arxiv_id in ids:
+                self._bloom.add(arxiv_id)
+        return self._bloom
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def lookup(self, papers: Iterable[Tuple[str, Optional[int]]], fingerprint: str) -> Dict[str, JudgeResult]:
+        """
+        papers: (arxiv_id, 当前版本号); fingerprint: 当前判断服务的指纹
+        返回可以复用的 arxiv_id -> JudgeResult
+        """
+        papers = list(papers)
+        with self._lock:
+            bloom = self.bloom
+            candidates = list({arxiv_id for arxiv_id, _ in papers if arxiv_id in bloom})
+            rows = {}
+            for i in range(0, len(candidates), _CHUNK):
+                chunk = candidates[i:i + _CHUNK]
+                rows.update((row[0], row) for row in self.conn.execute(
+                    "SELECT arxiv_id, version, chinese_name, chinese_abstract, worth_read, comment, fingerprint FROM seen "
+                    f"WHERE arxiv_id IN ({', '.join('?' * len(chunk))})", chunk))
+
+            reused: Dict[str, JudgeResult] = {}
+            for arxiv_id, version in papers:
+                row = rows.get(arxiv_id)
+                if row is None:
+                    self.misses += 1
+                    self.false_positives += arxiv_id in bloom
+                    continue
+                if version is not None and row[1] is not None and version != row[1]:
+                    self.changed += 1
+                    continue
+                if row[6] != fingerprint:
+                    self.stale += 1
+                    continue
+                self.hits += 1
+                reused[arxiv_id] = JudgeResult(chinese_name=row[2], chinese_abstract=row[3],
+                                               worth_read=bool(row[4]), comment=row[5])
+        return reused
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'changed': self.changed, 'stale': self.stale, 'misses': self.misses,
+                'false_positives': self.false_positives}
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def remember(self, date: str, page: PageRecord, versions: Dict[str, Optional[int]], fingerprint: str) -> int:
+        """
+        保存某一天某个分类中模型给出的判断结果及判断服务的指纹, 返回写入的条数
+        同一篇论文已存在时更新判断结果 / 版本号 / 指纹 / 最近出现日期, 保留第一次出现的日期
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        rows: List[Tuple] = [
+            (a.arxiv_id, versions.get(a.arxiv_id), j.chinese_name, j.chinese_abstract, int(j.worth_read), j.comment,
+             date, date, page.category, now, fingerprint)
+            for a in page.articles or []
+            if (j := a.judgerResult) is not None and not j.comment.startswith(PREFILTER_COMMENT)
+        ]
+        if not rows:
+            return 0
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT INTO seen ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(arxiv_id) DO UPDATE SET "
+                "version = coalesce(excluded.version, seen.version), chinese_name = excluded.chinese_name, "
+                "chinese_abstract = excluded.chinese_abstract, worth_read = excluded.worth_read, "
+                "comment = excluded.comment, last_date = excluded.last_date, category = excluded.category, "
+                "updated_at = excluded.updated_at, fingerprint = excluded.fingerprint", rows)
+            if self._bloom is not None:
+                for row in rows:
+                    self._bloom.add(row[0])
+        return len(rows)
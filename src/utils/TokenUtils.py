@@ -0,0 +1,33 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # tiktoken 不可用 (或无法下载词表) 时退化为按字符估算
+        return None
+
+
+class TokenUtils:
+    @staticmethod
+    def count_tokens(text: str) -> int:
+        encoding = _encoding()
+        if encoding is None:
+            return (len(text) + 3) // 4
+        return len(encoding.encode(text, disallowed_special=()))
+
+    @staticmethod
+    def truncate(text: str, max_tokens: int) -> str:
+        """
+        截断到不超过 max_tokens 个 token
+        """
+        if max_tokens <= 0:
+            return ''
+        encoding = _encoding()
+        if encoding is None:
+            return text[:max_tokens * 4]
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
@@ -0,0 +1,100 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.models.Arxiv import ArxivPageResult, JudgeResult
+from src.models.Encoder import CustomEncoder
+
+
+class WorkflowJournal:
+    """
+    每个分类每天一个只追加的 JSONL 日志, 每个阶段完成一篇文章就写入一行:
+      {"stage": "crawl", "result": ArxivPageResult, "state": 爬虫的增量状态 (可选)}
+      {"stage": "judge", "arxiv_id": ..., "result": JudgeResult}
+      {"stage": "analyze", "arxiv_id": ..., "text": 分析报告}
+    进程崩溃后可以重放日志, 只执行缺失的 (文章, 阶段); 最后一行写了一半时直接忽略
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.crawl: Optional[ArxivPageResult] = None
+        # 与爬取结果一起记录的增量状态, 导出 JSON 成功后才提交, 续跑时仍可以提交
+        self.crawlState: Optional[Dict[str, Any]] = None
+        self.judged: Dict[str, JudgeResult] = {}
+        self.analyzed: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        # 上次崩溃时最后一行没有写完, 下次追加前先补一个换行
+        self._torn = False
+
+    def reset(self):
+        """
+        非续跑模式下清空旧日志
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text('', encoding='utf-8')
+        self._torn = False
+        self.crawl = None
+        self.crawlState = None
+        self.judged.clear()
+        self.analyzed.clear()
+
+    def load(self) -> 'WorkflowJournal':
+        if not self.path.exists():
+            return self
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                self._torn = not line.endswith('\n')
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    continue
+        return self
+
+    def _apply(self, entry: Dict[str, Any]):
+        stage = entry['stage']
+        if stage == 'crawl':
+            self.crawl = ArxivPageResult.model_validate(entry['result'])
+            self.crawlState = entry.get('state')
+        elif stage == 'judge':
+            self.judged[entry['arxiv_id']] = JudgeResult.model_validate(entry['result'])
+        elif stage == 'analyze':
+            self.analyzed[entry['arxiv_id']] = entry['text']
+
+    def _append(self, entry: Dict[str, Any]):
+        line = (json.dumps(entry, ensure_ascii=False, cls=CustomEncoder) + '\n').encode('utf-8')
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # O_APPEND 保证整行追加, fsync 保证崩溃后已完成的结果不丢失
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, b'\n' + line if self._torn else line)
+                self._torn = False
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        self._apply(json.loads(line))
+
+    def record_crawl(self, result: ArxivPageResult, state: Optional[Dict[str, Any]] = None):
+        entry = {'stage': 'crawl', 'result': result.model_dump(exclude={'articles': {'__all__': {'metadata'}}})}
+        if state is not None:
+            entry['state'] = state
+        self._append(entry)
+
+    def record_judge(self, arxiv_id: str, result: JudgeResult):
+        self._append({'stage': 'judge', 'arxiv_id': arxiv_id, 'result': result.model_dump()})
+
+    def record_analyze(self, arxiv_id: str, text: str):
+        self._append({'stage': 'analyze', 'arxiv_id': arxiv_id, 'text': text})
+
+    def compact(self) -> Optional[ArxivPageResult]:
+        """
+        由日志重建完整的 ArxivPageResult (判断结果写回文章), 没有爬取记录时返回 None
+        """
+        if self.crawl is None:
+            return None
+        result = self.crawl.model_copy(deep=True)
+        for article in result.articles:
+            article.judgerResult = self.judged.get(article.arxiv_id, article.judgerResult)
+        return result
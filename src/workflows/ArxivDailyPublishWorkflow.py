@@ -1,9 +1,12 @@
+import json
 from pathlib import Path
 
 from pydantic import BaseModel
 
 from src.config.Config import Config
 from src.utils.AggUtils import AggregationUtils
+from src.utils.ArxivArchive import ArxivArchive
+from src.utils.Metrics import MetricsCollector, metrics
 from src.utils.TimeUtils import TimeUtils
 
 
@@ -17,8 +20,17 @@ class ArxivDailyPublishWorkflow:
         comment: str
         download_url: str
 
+    @staticmethod
+    def _load_today():
+        # 优先读取历史归档; 归档中缺少的分类 (例如当天部分分类关闭了 ARCHIVE, 或写入归档失败) 读取当天的 JSON 补齐
+        if not Config.ARCHIVE:
+            return AggregationUtils().agg_all_today_records()
+        pages = ArxivArchive().load_pages(TimeUtils.current_date_str())
+        pages += AggregationUtils().agg_all_today_records(skip={p.category for p in pages})
+        return sorted(pages, key=lambda p: p.category)
+
     def _combine_json_to_markdown(self):
-        jsons = AggregationUtils().agg_all_today_json()
+        jsons = self._load_today()
         finalMarkdown = ''
         for j in jsons:
             finalMarkdown += f"# {j.category}\n"
@@ -46,8 +58,17 @@ class ArxivDailyPublishWorkflow:
             finalMarkdown += '---\n'
         return finalMarkdown
 
+    def _metrics_footer(self) -> str:
+        # 读取工作流写出的当天运行指标, 发布可能在另一个进程中执行
+        path = metrics.summary_path(TimeUtils.current_date_str())
+        if not path.exists():
+            return ''
+        return '\n' + MetricsCollector.footer(json.loads(path.read_text(encoding='utf-8')))
+
     def publish_markdown(self):
         markdown = self._combine_json_to_markdown()
+        if Config.PUBLISH_METRICS_FOOTER:
+            markdown += self._metrics_footer()
         path = Path(Config.ANALYZE_REPORT_PATH)/TimeUtils.current_date_str()/f'{TimeUtils.current_date_str()}-Arxiv.md'
         with open(path,'w',encoding='utf-8') as f:
             f.write(markdown)
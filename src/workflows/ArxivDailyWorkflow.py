@@ -1,19 +1,32 @@
-import json
+import asyncio
 import logging
+import math
 import time
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Literal
+from typing import Dict, Literal, List, Optional, Union
 
+from pydantic import BaseModel
 from tqdm.asyncio import tqdm_asyncio
 
 from src.ai.ArxivAnalyzer import ArxivAnalyzer
 from src.ai.ArxivJudger import ArxivJudger
+from src.ai.JudgeBatcher import JudgeBatcher
 from src.config.Config import Config
 from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
-from src.models.Arxiv import ArxivPageResult, ArxivArticle
-from src.models.Encoder import CustomEncoder
+from src.crawl.ArxivOAICrawlService import ArxivOAICrawlService
+from src.models.Arxiv import ArxivPageResult, ArxivArticle, ArxivMetaData
+from src.models.Content import SourceFile
+from src.models.Record import PageRecord
+from src.utils.ArticleRegistry import ArticleRegistry
+from src.utils.ArxivArchive import ArxivArchive
+from src.utils.JsonUtils import JsonUtils
+from src.utils.Metrics import metrics
+from src.utils.RelevancePrefilter import RelevancePrefilter
+from src.utils.SearchIndex import SearchIndex
+from src.utils.SeenIndex import SeenIndex
 from src.utils.TimeUtils import TimeUtils
+from src.utils.WorkflowJournal import WorkflowJournal
 from src.utils.helperTypes import arxivCategory
 
 
@@ -71,26 +84,60 @@ class AsyncTqdmLoggingHandler(logging.StreamHandler):
             self.handleError(record)
 
 
+# 流水线各阶段之间传递的结束标记
+_DONE = object()
+
+
 # ------------------------------------------------------------------
 # 主流程
 # ------------------------------------------------------------------
 class ArxivDailyWorkflow:
+    # 进程内所有 category 共享, 跨分类的论文只判断/下载/分析一次
+    registry = ArticleRegistry()
+    metrics = metrics
+    # 跨天的历史归档, save_json 时写入
+    archive = ArxivArchive()
+    # 标题 / 摘要 / 评价 / 分析报告的全文索引, save_json 时增量更新当前目录
+    searchIndex = SearchIndex()
+    # 跨天的已判断论文索引, 判断之前查询, save_json 时写入
+    seenIndex = SeenIndex()
+
+    class PipelineOptions(BaseModel):
+        """
+        流水线模式下每个阶段的 worker 数量, 以及阶段之间队列的容量 (背压)
+        """
+        judge_workers: int = 16
+        fetch_workers: int = 4
+        build_workers: int = 2
+        analyze_workers: int = 4
+        write_workers: int = 1
+        queue_size: int = 8
+
     def __init__(
             self,
             category:arxivCategory,
             batchsize: int = 5,
+            pipelineOptions: Optional[PipelineOptions] = None,
     ):
         self.category = category
         self.batchsize = batchsize
+        self.pipelineOptions = pipelineOptions or self.PipelineOptions()
 
         self.crawlResult: ArxivPageResult = ArxivPageResult(category=self.category)
-        self.crawlService = ArxivDailyCrawlService(self.category)
+        crawlServiceClass = ArxivOAICrawlService if Config.CRAWL_BACKEND == 'oai' else ArxivDailyCrawlService
+        self.crawlService = crawlServiceClass(self.category)
         self.judgeService = ArxivJudger()
+        # batchsize > 1 时把并发的判断请求合并成批量请求
+        self.judgeBatcher = JudgeBatcher(self.judgeService, batchsize) if batchsize > 1 else None
         self.aiService = ArxivAnalyzer()
+        self.prefilter = RelevancePrefilter() if Config.PREFILTER else None
+        self.prefiltered = 0
+        self.reused = 0
 
-        today = TimeUtils.current_date_str()
-        self.folder = Path(Config.ANALYZE_REPORT_PATH) / today / self.category
+        self.date = TimeUtils.current_date_str()
+        self.folder = Path(Config.ANALYZE_REPORT_PATH) / self.date / self.category
         self.folder.mkdir(parents=True, exist_ok=True)
+        self.journal = WorkflowJournal(self.folder / f"{self.category}.journal.jsonl")
 
         self.logger = _setup_logger(category)
 
@@ -98,16 +145,25 @@ class ArxivDailyWorkflow:
     # 01 爬取
     # ------------------------------------------------------------------
     async def crawl(self) -> ArxivPageResult:
+        restored = self.journal.compact()
+        if restored is not None:
+            self.crawlResult = restored
+            self.logger.info("♻️  从日志恢复 %s 今日文章，共 %d 篇", self.category, len(restored.articles))
+            return self.crawlResult
+
         self.logger.info("📥 开始爬取 %s 今日文章...", self.category)
         start = time.perf_counter()
 
         try:
-            self.crawlResult = await self.crawlService.crawl()
+            with self.metrics.timer('crawl'):
+                self.crawlResult = await self.crawlService.crawl()
+            self.journal.record_crawl(self.crawlResult, self.crawlService.crawlState)
             elapsed = time.perf_counter() - start
             self.logger.info(
-                "✅ 爬取完成，共 %d 篇文章，耗时 %.2f 秒",
+                "✅ 爬取完成，共 %d 篇文章，耗时 %.2f 秒%s",
                 len(self.crawlResult.articles),
                 elapsed,
+                "（列表页未更新，HTTP 缓存命中）" if self.crawlService.lastFetchCached else "",
             )
             return self.crawlResult
         except Exception as e:
@@ -117,11 +173,87 @@ class ArxivDailyWorkflow:
     # ------------------------------------------------------------------
     # 02 粗筛
     # ------------------------------------------------------------------
+    def _saved_calls(self, articles: int) -> int:
+        # 批量判断时每 batchsize 篇文章合并成一次模型调用
+        return math.ceil(articles / self.batchsize) if self.judgeBatcher else articles
+
+    def reuse_seen(self):
+        """
+        之前某天已经判断过的论文 (交叉列表 / 替换 / 重跑) 直接复用保存的判断结果, 版本号或判断服务的指纹变化时重新判断
+        """
+        articles = [a for a in self.crawlResult.articles if a.judgerResult is None]
+        if not articles:
+            return
+
+        start = time.perf_counter()
+        changed, stale = self.seenIndex.changed, self.seenIndex.stale
+        try:
+            reused = self.seenIndex.lookup(
+                ((a.arxiv_id, ArxivDailyCrawlService.parse_version(a)) for a in articles), self.judgeService.fingerprint)
+        except Exception as e:
+            self.logger.warning("⚠️ 查询已判断论文索引失败：%s", e)
+            return
+        for article in articles:
+            res = reused.get(article.arxiv_id)
+            if res is None:
+                continue
+            article.judgerResult = res
+            self.journal.record_judge(article.arxiv_id, res)
+            self.reused += 1
+
+        saved = self._saved_calls(self.reused)
+        self.metrics.record_saved('seen', saved)
+        elapsed = time.perf_counter() - start
+        self.logger.info(
+            "♻️  已判断论文去重：%d/%d 篇此前已判断过，复用判断结果（%d 篇版本更新、%d 篇模型或提示词变化需重新判断），"
+            "节省约 %d 次模型调用，耗时 %.3f 秒",
+            self.reused, len(articles), self.seenIndex.changed - changed, self.seenIndex.stale - stale, saved, elapsed,
+        )
+
+    def prefilter_articles(self):
+        """
+        调用判断模型之前先做本地相关度预筛选, 明显无关的文章直接标记为不值得阅读
+        """
+        if self.prefilter is None:
+            return
+        if not self.prefilter.enabled:
+            self.logger.warning("⚠️ PREFILTER_KEYWORDS 中没有可用的英文关键词，跳过本地预筛选")
+            return
+        if not self.prefilter.calibrated:
+            self.logger.warning("⚠️ PREFILTER=1 但没有设置 PREFILTER_THRESHOLD，也没有校准报告 %s，本地预筛选不会跳过任何文章；"
+                                "请先运行 scripts/calibratePrefilter.py", self.prefilter.CALIBRATION_PATH)
+            return
+        articles = [a for a in self.crawlResult.articles if a.judgerResult is None]
+        if not articles:
+            return
+
+        start = time.perf_counter()
+        scores = self.prefilter.score(articles)
+        for article, score in zip(articles, scores):
+            if not self.prefilter.skips(score):
+                continue
+            article.judgerResult = self.prefilter.skipped_result(article, score)
+            self.journal.record_judge(article.arxiv_id, article.judgerResult)
+            self.prefiltered += 1
+        self.metrics.record_saved('prefilter', self._saved_calls(self.prefiltered))
+
+        elapsed = time.perf_counter() - start
+        self.logger.info(
+            "🧹 本地预筛选：%d/%d 篇低于阈值 %.3f，跳过模型判断，耗时 %.2f 秒",
+            self.prefiltered, len(articles), self.prefilter.threshold, elapsed,
+        )
+
     async def _judge_one_article(self, article: ArxivArticle):
+        if article.judgerResult is not None:
+            # 已从日志恢复, 复用了之前的判断结果, 或已被本地预筛选
+            return article.judgerResult
         try:
-            return await self.judgeService.judge(article)
+            judge = self.judgeBatcher.judge if self.judgeBatcher else self.judgeService.judge
+            res = await self.registry.run('judge', article.arxiv_id, lambda: judge(article))
+            self.journal.record_judge(article.arxiv_id, res)
+            return res
         except Exception as e:
-            self.logger.error("⚠️ 判断文章 %s 失败：%s", article.id, e)
+            self.logger.error("⚠️ 判断文章 %s 失败：%s", article.arxiv_id, e)
             return None
 
     async def judge_articles(self):
@@ -130,6 +262,9 @@ class ArxivDailyWorkflow:
             self.logger.warning("⚠️ 无文章可筛选，跳过 judge 阶段")
             return
 
+        restored = sum(1 for a in articles if a.judgerResult is not None) - self.prefiltered - self.reused
+        if restored:
+            self.logger.info("♻️  从日志恢复 %d 篇判断结果", restored)
         self.logger.info("🔍 开始筛选文章，共 %d 篇...", len(articles))
 
         start = time.perf_counter()
@@ -156,24 +291,40 @@ class ArxivDailyWorkflow:
     # ------------------------------------------------------------------
     # 03 拉取元数据（仅 worth_read）
     # ------------------------------------------------------------------
+    async def _download_sources(self, article: ArxivArticle) -> List[Union[str, SourceFile]]:
+        src_url = str(article.pdf_url).replace("pdf", "src")
+        version = self.crawlService.parse_version(article)
+        return await self.crawlService.fetch_source_files(article.arxiv_id, src_url, version)
+
+    async def _process_sources(self, article: ArxivArticle, files: List[Union[str, SourceFile]]) -> ArxivMetaData:
+        with self.metrics.timer('metadata'):
+            metadata = await self.crawlService.process_file_lists(files)
+        if metadata.texts and metadata.tokens_before is not None:
+            self.logger.info("✂️  %s LaTeX 精简：%d → %d tokens",
+                             article.arxiv_id, metadata.tokens_before, metadata.tokens_after)
+        if len(metadata.figures) > Config.MAX_FIGURE_NUM:
+            metadata.figures = metadata.figures[: Config.MAX_FIGURE_NUM]
+        return metadata
+
+    async def _fetch_sources(self, article: ArxivArticle) -> List[Union[str, SourceFile]]:
+        return await self.registry.run('sources', article.arxiv_id, lambda: self._download_sources(article))
+
+    async def _build_metadata(self, article: ArxivArticle, files: List[Union[str, SourceFile]]) -> ArxivMetaData:
+        return await self.registry.run('metadata', article.arxiv_id, lambda: self._process_sources(article, files))
+
     async def _generate_metadata(self, article: ArxivArticle):
+        if not article.pdf_url:
+            return None
         try:
-            pdf_url = str(article.pdf_url)
-            if not pdf_url:
-                return None
-            src_url = pdf_url.replace("pdf", "src")
-            paths = await self.crawlService.download_attachment_async(src_url)
-            files = await self.crawlService.extract_tar_gz(paths)
-            metadata = await self.crawlService.process_file_lists(files)
-            if len(metadata.figures) > Config.MAX_FIGURE_NUM:
-                metadata.figures = metadata.figures[: Config.MAX_FIGURE_NUM]
-            return metadata
+            files = await self._fetch_sources(article)
+            return await self._build_metadata(article, files)
         except Exception as e:
-            self.logger.warning("⚠️ 获取 %s 元数据失败：%s", article.id, e)
+            self.logger.warning("⚠️ 获取 %s 元数据失败：%s", article.arxiv_id, e)
             return None
 
     async def fill_meta_data(self):
-        articles = [a for a in self.crawlResult.articles if a.judgerResult and a.judgerResult.worth_read]
+        articles = [a for a in self.crawlResult.articles if a.judgerResult and a.judgerResult.worth_read
+                    and not self._restore_report(a)]
         if not articles:
             self.logger.warning("⚠️ 没有值得阅读的文章，跳过元数据拉取")
             return
@@ -203,31 +354,69 @@ class ArxivDailyWorkflow:
     # ------------------------------------------------------------------
     async def _ai_analyze_one(self, article: ArxivArticle):
         try:
-            return await self.aiService.analyze(article.metadata)
+            if Config.ANALYZER_STREAM:
+                analyze = lambda: self.aiService.analyze(article.metadata, stream_to=self._report_path(article),
+                                                         header=self._report_header(article))
+            else:
+                analyze = lambda: self.aiService.analyze(article.metadata)
+            res = await self.registry.run('analyze', article.arxiv_id, analyze)
+            if article.metadata.dropped:
+                self.logger.warning("✂️  %s 超出上下文预算，省略：%s", article.arxiv_id, article.metadata.dropped)
+            return res
         except Exception as e:
-            self.logger.error("⚠️ AI 分析 %s 失败：%s", article.id, e)
+            self.logger.error("⚠️ AI 分析 %s 失败：%s", article.arxiv_id, e)
             return None
 
+    @staticmethod
+    def report_filename(title: str) -> str:
+        filename = f"{title}.md"
+        return "".join(c for c in filename if c.isalnum() or c in " ._-")
+
+    def _report_path(self, article: ArxivArticle) -> Path:
+        return self.folder / self.report_filename(article.title)
+
+    @staticmethod
+    def _report_header(article: ArxivArticle) -> str:
+        return f"# {article.title}\n"
+
+    def _write_report(self, article: ArxivArticle, analyzeResult):
+        out_path = self._report_path(article)
+        # 流式模式下分析时已经写入同一个文件
+        if analyzeResult.response_metadata.get('stream_path') != str(out_path):
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write(self._report_header(article))
+                f.write(analyzeResult.text)
+        self.journal.record_analyze(article.arxiv_id, analyzeResult.text)
+
+    def _restore_report(self, article: ArxivArticle) -> bool:
+        """
+        日志中已有分析结果时跳过分析, 报告文件丢失则按日志重写
+        """
+        text = self.journal.analyzed.get(article.arxiv_id)
+        if text is None:
+            return False
+        out_path = self._report_path(article)
+        if not out_path.exists():
+            with open(out_path, "w", encoding="utf-8") as f:
+                f.write(self._report_header(article))
+                f.write(text)
+        return True
+
     async def _write_and_analyze_one(self, article: ArxivArticle):
         try:
             analyzeResult = await self._ai_analyze_one(article)
             if not analyzeResult:
                 return None
-            filename = f"{article.title}.md"
-            safe_filename = "".join(c for c in filename if c.isalnum() or c in " ._-")
-            out_path = self.folder / safe_filename
-            with open(out_path, "w", encoding="utf-8") as f:
-                f.write(f"# {article.title}\n")
-                f.write(analyzeResult.text)
+            self._write_report(article, analyzeResult)
             return analyzeResult
         except Exception as e:
-            self.logger.exception("❌ 保存分析报告 %s 失败：%s", article.id, e)
+            self.logger.exception("❌ 保存分析报告 %s 失败：%s", article.arxiv_id, e)
             return None
 
     async def analyze(self):
         articles = [
             a for a in self.crawlResult.articles
-            if a.judgerResult and a.judgerResult.worth_read and a.metadata
+            if a.judgerResult and a.judgerResult.worth_read and a.metadata and not self._restore_report(a)
         ]
         if not articles:
             self.logger.warning("⚠️ 无可分析的文章，跳过 AI 分析阶段")
@@ -242,38 +431,234 @@ class ArxivDailyWorkflow:
         elapsed = time.perf_counter() - start
         self.logger.info("✅ AI 分析完成，耗时 %.2f 秒", elapsed)
 
+    # ------------------------------------------------------------------
+    # 流水线模式: judge → fetch → build → analyze → write 各阶段重叠执行
+    # ------------------------------------------------------------------
+    async def _run_stage(self, name: str, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                         workers: int, downstream_workers: int, handler):
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    return
+                try:
+                    result = await handler(item)
+                except Exception as e:
+                    self.logger.exception("❌ 流水线阶段 %s 异常：%s", name, e)
+                    continue
+                if result is not None and outbox is not None:
+                    await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        if outbox is not None:
+            for _ in range(downstream_workers):
+                await outbox.put(_DONE)
+
+    async def run_pipeline(self, without_analyze: bool = False):
+        articles = self.crawlResult.articles
+        if not articles:
+            self.logger.warning("⚠️ 无文章可处理，跳过流水线")
+            return
+
+        opts = self.pipelineOptions
+        counts = {'judge': 0, 'worth_read': 0, 'metadata': 0, 'analyze': 0}
+
+        async def judge(article: ArxivArticle):
+            res = await self._judge_one_article(article)
+            if res is None:
+                return None
+            article.judgerResult = res
+            counts['judge'] += 1
+            if not res.worth_read:
+                return None
+            counts['worth_read'] += 1
+            return article
+
+        async def fetch(article: ArxivArticle):
+            if self._restore_report(article):
+                counts['analyze'] += 1
+                return None
+            if not article.pdf_url:
+                return None
+            try:
+                return article, await self._fetch_sources(article)
+            except Exception as e:
+                self.logger.warning("⚠️ 获取 %s 元数据失败：%s", article.arxiv_id, e)
+                return None
+
+        async def build(item):
+            article, files = item
+            try:
+                article.metadata = await self._build_metadata(article, files)
+            except Exception as e:
+                self.logger.warning("⚠️ 获取 %s 元数据失败：%s", article.arxiv_id, e)
+                return None
+            counts['metadata'] += 1
+            return article
+
+        async def analyze(article: ArxivArticle):
+            res = await self._ai_analyze_one(article)
+            return (article, res) if res else None
+
+        async def write(item):
+            article, res = item
+            try:
+                self._write_report(article, res)
+                counts['analyze'] += 1
+            except Exception as e:
+                self.logger.exception("❌ 保存分析报告 %s 失败：%s", article.arxiv_id, e)
+
+        stages = [('judge', judge, opts.judge_workers)]
+        if not without_analyze:
+            stages += [
+                ('fetch', fetch, opts.fetch_workers),
+                ('build', build, opts.build_workers),
+                ('analyze', analyze, opts.analyze_workers),
+                ('write', write, opts.write_workers),
+            ]
+        queues = [asyncio.Queue(maxsize=opts.queue_size) for _ in stages]
+
+        async def feed():
+            for article in articles:
+                await queues[0].put(article)
+            for _ in range(stages[0][2]):
+                await queues[0].put(_DONE)
+
+        self.logger.info("🚰 开始流水线处理，共 %d 篇...", len(articles))
+        start = time.perf_counter()
+        runners = []
+        for i, (name, handler, workers) in enumerate(stages):
+            last = i == len(stages) - 1
+            runners.append(self._run_stage(
+                name, queues[i], None if last else queues[i + 1],
+                workers, 0 if last else stages[i + 1][2], handler,
+            ))
+        await asyncio.gather(feed(), *runners)
+
+        elapsed = time.perf_counter() - start
+        self.logger.info(
+            "✅ 流水线完成：筛选 %d/%d 成功，值得阅读 %d，元数据 %d，分析 %d，耗时 %.2f 秒",
+            counts['judge'], len(articles), counts['worth_read'], counts['metadata'], counts['analyze'], elapsed,
+        )
+
     # ------------------------------------------------------------------
     # 05 导出 JSON
     # ------------------------------------------------------------------
-    async def save_json(self):
+    async def save_json(self, from_journal: bool = False):
+        """
+        from_journal 为 True 时由日志重建结果再导出, 用于工作流中途崩溃后补写 JSON
+        导出成功后才提交爬虫的增量状态 (OAI 的收割位置), 导出失败时下次仍从旧位置开始
+        """
         outfile = self.folder / f"{self.category}.json"
         self.logger.info("💾 导出 JSON 到 %s ...", outfile)
+        journal = self.journal
         try:
-            with open(outfile, "w", encoding="utf-8") as f:
-                json.dump(
-                    self.crawlResult.model_dump(exclude={
-                        "articles": {
-                            "__all__": {"metadata"}
-                        }
-                    }),
-                    f,
-                    ensure_ascii=False,
-                    cls=CustomEncoder,
-                    indent=2,
-                )
+            result = self.crawlResult
+            if from_journal:
+                journal = WorkflowJournal(self.journal.path).load()
+                result = journal.compact()
+                if result is None:
+                    self.logger.warning("⚠️ 日志中没有爬取记录，跳过导出")
+                    return
+            # 轻量记录 + orjson 导出, 输出与 model_dump + json.dump(indent=2) 完全相同
+            record = PageRecord.from_model(result)
+            outfile.write_bytes(JsonUtils.dumps(record.to_dict(), indent=True))
             self.logger.info("✅ JSON 导出完成")
         except Exception as e:
             self.logger.exception("❌ JSON 导出失败：%s", e)
+            return
+        self._commit_crawl_state(journal.crawlState)
+        if Config.ARCHIVE:
+            self._archive(record)
+        if Config.SEARCH_INDEX:
+            self._reindex_search()
+        if Config.SEEN_INDEX:
+            self._remember_seen(record)
+
+    def _commit_crawl_state(self, state: Optional[Dict]):
+        if state is None or not isinstance(self.crawlService, ArxivOAICrawlService):
+            return
+        try:
+            self.crawlService.save_state(state)
+            self.logger.info("📌 已提交 OAI 收割位置：%s", state['from'])
+        except Exception as e:
+            self.logger.exception("❌ 提交 OAI 收割位置失败：%s", e)
+
+    def _archive(self, record: PageRecord):
+        reports = {}
+        for article in record.articles or []:
+            path = self.folder / self.report_filename(article.title)
+            if article.judgerResult and article.judgerResult.worth_read and path.exists():
+                reports[article.arxiv_id] = path
+        try:
+            self.archive.store_page(self.date, record, reports)
+            self.logger.info("🗄  已写入历史归档：%d 篇文章，%d 篇分析报告", len(record.articles or []), len(reports))
+        except Exception as e:
+            self.logger.exception("❌ 写入历史归档失败：%s", e)
+
+    def _reindex_search(self):
+        try:
+            stats = self.searchIndex.reindex(self.folder)
+            self.logger.info("🔎 全文索引更新：%s", stats)
+        except Exception as e:
+            self.logger.exception("❌ 更新全文索引失败：%s", e)
+
+    def _remember_seen(self, record: PageRecord):
+        try:
+            versions = {a.arxiv_id: ArxivDailyCrawlService.parse_version(a) for a in record.articles or []}
+            stored = self.seenIndex.remember(self.date, record, versions, self.judgeService.fingerprint)
+            self.logger.info("🧾 已判断论文索引：写入 %d 篇", stored)
+        except Exception as e:
+            self.logger.exception("❌ 写入已判断论文索引失败：%s", e)
+
+    def _write_metrics(self):
+        try:
+            summary = self.metrics.write(TimeUtils.current_date_str())
+        except Exception as e:
+            self.logger.warning("⚠️ 写出运行指标失败：%s", e)
+            return
+        category = summary['categories'].get(self.category, {})
+        self.logger.info(
+            "📊 运行指标：本分类 %d 次模型调用，预估 $%.4f；进程累计 $%.4f，已写入 %s",
+            category.get('calls', 0), category.get('cost', 0.0), summary['total_cost'], self.metrics.path,
+        )
 
-    async def run(self, without_analyze: bool = False):
-        self.logger.info("🚀 开始完整工作流，category=%s", self.category)
+    async def run(self, without_analyze: bool = False, mode: Literal['batch', 'pipeline'] = 'batch',
+                  resume: bool = False):
+        """
+        resume 为 True 时重放今天的日志, 只执行缺失的 (文章, 阶段); 否则清空日志重新开始
+        """
+        self.logger.info("🚀 开始完整工作流，category=%s, mode=%s, resume=%s", self.category, mode, resume)
+        self.metrics.category.set(self.category)
+        if resume:
+            self.journal.load()
+        else:
+            self.journal.reset()
         try:
             await self.crawl()
-            await self.judge_articles()
-            if not without_analyze:
-                await self.fill_meta_data()
-                await self.analyze()
+            if Config.SEEN_INDEX:
+                self.reuse_seen()
+            self.prefilter_articles()
+            if mode == 'pipeline':
+                await self.run_pipeline(without_analyze)
+            else:
+                await self.judge_articles()
+                if not without_analyze:
+                    await self.fill_meta_data()
+                    await self.analyze()
             await self.save_json()
+            self.logger.info("🔗 跨分类合并统计：%s", self.registry.stats())
+            if isinstance(self.crawlService, ArxivOAICrawlService):
+                self.logger.info("📡 OAI 收割共享统计：%s", self.crawlService.harvests.stats())
+            self.logger.info("🗃  LLM 缓存统计：%s", self.judgeService.cache.stats())
+            if Config.SEEN_INDEX:
+                self.logger.info("🧾 已判断论文索引统计：%s", self.seenIndex.stats())
+            if self.judgeBatcher:
+                self.logger.info("🧺 批量判断：%d 次批量请求，每批最多 %d 篇", self.judgeBatcher.batches, self.batchsize)
+            self.logger.info("📦 源码缓存统计：命中 %d，未命中 %d",
+                             self.crawlService.sourceCache.hits, self.crawlService.sourceCache.misses)
+            self.logger.info("🖼  图片压缩统计：%s", self.crawlService.imageNormalizer.stats)
+            self._write_metrics()
             self.logger.info("🎉 全部流程完成！")
         except Exception as e:
             self.logger.exception("💥 工作流异常终止：%s", e)
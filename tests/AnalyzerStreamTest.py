@@ -0,0 +1,57 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+from langchain_core.messages import AIMessageChunk
+
+from src.ai.ArxivAnalyzer import ArxivAnalyzer
+from src.ai.BaseAI import BaseAI
+from src.ai.LLMCache import LLMCache
+from src.models.Arxiv import ArxivMetaData, Tex
+
+
+class FakeStreamModel:
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+
+    async def astream(self, messages):
+        for i, piece in enumerate(['## 摘要\n', '第一段', '\n第二段']):
+            if i == self.fail_after:
+                raise ConnectionError('stream interrupted')
+            await asyncio.sleep(0.01)
+            yield AIMessageChunk(content=piece)
+        yield AIMessageChunk(content='', usage_metadata={'input_tokens': 10, 'output_tokens': 3, 'total_tokens': 13})
+
+
+async def main():
+    folder = Path(tempfile.mkdtemp())
+    BaseAI.cache = LLMCache(path=str(folder / 'cache.sqlite3'), bypass=True)
+    analyzer = ArxivAnalyzer()
+    metadata = ArxivMetaData(figures=[], texts=[Tex(name='main.tex', text='\\section{Intro} hello')])
+
+    out = folder / 'report.md'
+    analyzer.streamModel = FakeStreamModel()
+    res = await analyzer.analyze(metadata, stream_to=out, header='# Title\n')
+    print(out.read_text(encoding='utf-8'))
+    assert out.read_text(encoding='utf-8') == '# Title\n## 摘要\n第一段\n第二段'
+    assert res.text == '## 摘要\n第一段\n第二段' and res.response_metadata['stream_path'] == str(out)
+    assert res.usage_metadata['total_tokens'] == 13
+    assert analyzer.metrics.latencies['analyze_ttft']
+    assert not out.with_name('report.md.part').exists()
+
+    # 中途失败: 已生成的内容保留为 .partial, 不覆盖已有的报告
+    failed = folder / 'failed.md'
+    analyzer.streamModel = FakeStreamModel(fail_after=2)
+    try:
+        await analyzer.analyze(metadata, stream_to=failed, header='# Failed\n')
+        raise AssertionError('expected failure')
+    except ConnectionError:
+        pass
+    partial = folder / 'failed.md.partial'
+    print(partial.read_text(encoding='utf-8'))
+    assert partial.read_text(encoding='utf-8') == '# Failed\n## 摘要\n第一段'
+    assert not failed.exists()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
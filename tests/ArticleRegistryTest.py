@@ -0,0 +1,30 @@
+import asyncio
+
+from src.utils.ArticleRegistry import ArticleRegistry
+
+
+async def main():
+    registry = ArticleRegistry()
+    calls = []
+
+    async def judge(arxiv_id):
+        calls.append(arxiv_id)
+        await asyncio.sleep(0.1)
+        return f'result-{arxiv_id}'
+
+    # 同一篇论文在 cs.AI / cs.MA / cs.LG 中各出现一次
+    tasks = [registry.run('judge', '2511.17673', lambda: judge('2511.17673')) for _ in range(3)]
+    tasks.append(registry.run('judge', '2511.19314', lambda: judge('2511.19314')))
+    results = await asyncio.gather(*tasks)
+    print(results)
+    assert calls == ['2511.17673', '2511.19314']
+    assert results[:3] == ['result-2511.17673'] * 3
+
+    # 已完成的结果直接复用
+    assert await registry.run('judge', '2511.17673', lambda: judge('2511.17673')) == 'result-2511.17673'
+    assert len(calls) == 2
+    print(registry.stats())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
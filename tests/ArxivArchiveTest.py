@@ -0,0 +1,61 @@
+import datetime
+import tempfile
+from pathlib import Path
+
+from pydantic import HttpUrl
+
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+from src.models.Record import PageRecord
+from src.utils.ArxivArchive import ArxivArchive
+from src.utils.JsonUtils import JsonUtils
+
+
+def _page(category: str, worth: set) -> ArxivPageResult:
+    now = datetime.datetime(2025, 11, 25, tzinfo=datetime.timezone.utc)
+    articles = []
+    for i in range(4):
+        aid = f'2511.0{category[-1] == "S"}{i:03d}'
+        articles.append(ArxivArticle(
+            index=i + 1, arxiv_id=aid, category=category, abs_url=HttpUrl(f'https://arxiv.org/abs/{aid}'),
+            pdf_url=f'https://arxiv.org/pdf/{aid}', title=f'{category} paper {i}', authors=['a', '张三'],
+            subjects_other=['Multiagent Systems (cs.MA)'], abstract='x', scraped_at=now,
+            judgerResult=JudgeResult(chinese_name='标题', chinese_abstract='摘要', worth_read=i in worth, comment='评价')
+            if i != 3 else None,
+        ))
+    return ArxivPageResult(category=category, url=HttpUrl(f'https://arxiv.org/list/{category}/new'), scraped_at=now,
+                           articles=articles)
+
+
+def main():
+    root = Path(tempfile.mkdtemp())
+    archive = ArxivArchive(path=str(root / 'archive.sqlite3'), root=str(root))
+    report = root / '20251125' / 'cs.OS' / 'cs.OS paper 0.md'
+    report.parent.mkdir(parents=True)
+    report.write_text('# report', encoding='utf-8')
+
+    ai = PageRecord.from_model(_page('cs.AI', {1}))
+    os_page = PageRecord.from_model(_page('cs.OS', {0, 2}))
+    archive.store_page('20251125', os_page, {os_page.articles[0].arxiv_id: report})
+    archive.store_page('20251125', ai)
+    archive.store_page('20251201', PageRecord.from_model(_page('cs.OS', {1})))
+
+    pages = archive.load_pages('20251125')
+    assert [p.category for p in pages] == ['cs.AI', 'cs.OS']
+    # 与导出的 JSON 内容相同
+    assert JsonUtils.dumps(pages[0].to_dict()) == JsonUtils.dumps(ai.to_dict())
+    assert JsonUtils.dumps(pages[1].to_dict()) == JsonUtils.dumps(os_page.to_dict())
+
+    hits = archive.query('cs.OS', since='20251101', until='20251130', worth_read=True)
+    assert [(d, a.title) for d, a in hits] == [('20251125', 'cs.OS paper 0'), ('20251125', 'cs.OS paper 2')]
+    assert len(archive.query(worth_read=True)) == 4
+    assert archive.report_path(os_page.articles[0].arxiv_id, '20251125', 'cs.OS') == report
+
+    # 同一天同一分类重新写入时整体替换
+    archive.store_page('20251125', PageRecord.from_model(_page('cs.AI', set())))
+    assert len(archive.query('cs.AI', worth_read=True)) == 0
+    assert len(archive.load_pages('20251125')[0].articles) == 4
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
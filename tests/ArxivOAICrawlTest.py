@@ -0,0 +1,134 @@
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from src.config.Config import Config
+from src.crawl.ArxivOAICrawlService import ArxivOAICrawlService
+from src.utils.ArticleRegistry import ArticleRegistry
+from src.workflows.ArxivDailyWorkflow import ArxivDailyWorkflow
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'oai'
+
+
+class RecordedOAIHandler(BaseHTTPRequestHandler):
+    """
+    回放录制好的 OAI-PMH 响应: 第一页带 resumptionToken, 第二页前先返回一次 503
+    """
+    requests = []
+    throttled = False
+
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        RecordedOAIHandler.requests.append(params)
+        if 'resumptionToken' in params:
+            if not RecordedOAIHandler.throttled:
+                RecordedOAIHandler.throttled = True
+                self.send_response(503)
+                self.send_header('Retry-After', '0')
+                self.end_headers()
+                return
+            body = (FIXTURES / 'page2.xml').read_bytes()
+        elif params.get('from') == '2025-11-24':
+            body = (FIXTURES / 'page1.xml').read_bytes()
+        else:
+            body = (FIXTURES / 'empty.xml').read_bytes()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecordedOAIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ArxivOAICrawlService.OAI_URL = f'http://127.0.0.1:{server.server_port}/oai'
+    ArxivOAICrawlService.STATE_PATH = Path(tempfile.mkdtemp())
+
+    service = ArxivOAICrawlService('cs.AI')
+    service.save_state({'from': '2025-11-24', 'seen': []})
+    result = await service.crawl()
+    for a in result.articles:
+        print(a.index, a.arxiv_id, a.title, a.authors, a.subjects_primary, a.subjects_other)
+    # 主分类为 cs.LG 的交叉列表, 已删除的记录, 旧论文的新版本都不会出现
+    assert [a.arxiv_id for a in result.articles] == ['2511.19314', '2511.19320']
+    first = result.articles[0]
+    assert first.title == 'Multi-Agent Planning with $\\mathcal{O}(n)$ Communication & Memory'
+    assert first.authors == ['Wei Zhang', 'Jürgen Müller', 'Alice Smith Jr']
+    assert first.subjects_primary == 'Artificial Intelligence (cs.AI)'
+    assert first.subjects_other == ['Multiagent Systems (cs.MA)', 'Machine Learning (cs.LG)']
+    assert str(first.pdf_url) == 'https://arxiv.org/pdf/2511.19314'
+    assert [r.get('resumptionToken') for r in RecordedOAIHandler.requests] == [None, '6960524|1001', '6960524|1001']
+
+    # crawl 不直接写入收割状态, 由工作流导出 JSON 后提交
+    assert service.load_state() == {'from': '2025-11-24', 'seen': []}
+    state = service.crawlState
+    print(state)
+    assert state == {'from': '2025-11-25', 'seen': ['2511.19314', '2511.19320']}
+    service.save_state(state)
+
+    # 下一次从持久化的 datestamp 开始, 没有新记录
+    result = await service.crawl()
+    assert result.articles == []
+    assert RecordedOAIHandler.requests[-1]['from'] == '2025-11-25'
+    assert service.crawlState == state
+    await workflow_commit(service)
+    await shared_harvest()
+    server.shutdown()
+
+
+async def shared_harvest():
+    """
+    同一 set 的多个分类并发爬取时只收割一次, 各自按主分类过滤
+    """
+    ArxivOAICrawlService.harvests = ArticleRegistry()
+    services = [ArxivOAICrawlService(c) for c in ('cs.AI', 'cs.LG')]
+    for service in services:
+        service.save_state({'from': '2025-11-24', 'seen': []})
+    before = len(RecordedOAIHandler.requests)
+    ai, lg = await asyncio.gather(*(s.crawl() for s in services))
+    assert len(RecordedOAIHandler.requests) - before == 2, RecordedOAIHandler.requests[before:]
+    assert [a.arxiv_id for a in ai.articles] == ['2511.19314', '2511.19320']
+    assert [a.arxiv_id for a in lg.articles] == ['2511.18000']
+    assert ArxivOAICrawlService.harvests.stats() == {'oai:cs': {'executed': 1, 'coalesced': 1}}
+    print('shared harvest:', ArxivOAICrawlService.harvests.stats())
+
+
+async def workflow_commit(service: ArxivOAICrawlService):
+    """
+    工作流中 JSON 导出失败时不提交收割状态, 续跑 (由日志恢复) 后导出成功再提交
+    """
+    Config.ANALYZE_REPORT_PATH = tempfile.mkdtemp()
+    Config.ARCHIVE = Config.SEARCH_INDEX = Config.SEEN_INDEX = False
+    Config.CRAWL_BACKEND = 'oai'
+    service.save_state({'from': '2025-11-24', 'seen': []})
+
+    workflow = ArxivDailyWorkflow('cs.AI')
+    workflow.journal.reset()
+    await workflow.crawl()
+    assert workflow.crawlService.crawlState['from'] == '2025-11-25'
+
+    outfile = workflow.folder / 'cs.AI.json'
+    outfile.mkdir()
+    await workflow.save_json()
+    assert service.load_state() == {'from': '2025-11-24', 'seen': []}
+    outfile.rmdir()
+
+    resumed = ArxivDailyWorkflow('cs.AI')
+    resumed.journal.load()
+    await resumed.crawl()
+    assert resumed.crawlService.crawlState is None
+    await resumed.save_json()
+    assert outfile.is_file()
+    assert service.load_state() == {'from': '2025-11-25', 'seen': ['2511.19314', '2511.19320']}
+    print('workflow: state committed after JSON export')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+from src.ai.ContextPacker import ContextPacker
+from src.models.Arxiv import ArxivMetaData, Tex
+from src.models.Content import FigureB64
+
+if __name__ == '__main__':
+    # 图片 token 按尺寸估算
+    assert ContextPacker.image_tokens(512, 512) == 85 + 170
+    assert ContextPacker.image_tokens(1024, 1024) == 85 + 170 * 4
+    assert ContextPacker.image_tokens(4096, 2048) == 85 + 170 * 6
+    assert ContextPacker.image_tokens(None, None) == ContextPacker.UNKNOWN_IMAGE_TOKENS
+
+    packer = ContextPacker('test-model')
+    packer.budget = 3000
+    figures = [FigureB64(name=f'fig-{i}', b64='', mime='image/png', width=1024, height=1024) for i in range(3)]
+    metadata = ArxivMetaData(
+        texts=[Tex(name='main', text='word ' * 1200), Tex(name='extra', text='other ' * 2000)],
+        figures=figures,
+    )
+    pack = packer.pack(metadata, 'system prompt')
+    print(pack.tokens, pack.dropped)
+    assert pack.tokens <= packer.budget
+    # 主文档完整保留, 第一张图放得下, 后面的图被丢弃, 附加文本被截断
+    assert pack.texts[0].text == metadata.texts[0].text
+    assert [f.name for f in pack.figures] == ['fig-0']
+    assert 'figure:fig-1 (765 tokens)' in pack.dropped
+
+    # 主文档过长时截断
+    packer.budget = 1000
+    pack = packer.pack(metadata, 'system prompt')
+    print(pack.tokens, pack.dropped)
+    assert pack.tokens <= packer.budget and pack.texts[0].text != metadata.texts[0].text
+    assert pack.dropped[0].startswith('text:main truncated')
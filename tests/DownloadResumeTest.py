@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+
+# 大于两个 DOWNLOAD_CHUNK_SIZE, 断开前至少写入一个完整的块
+BODY = os.urandom(1024 * 1024 + 123)
+FILENAME = 'arXiv-2511.00001v2.tar.gz'
+
+
+class SourceHandler(BaseHTTPRequestHandler):
+    ranges = []
+    # 第一次完整请求只发送一半内容后断开连接
+    drop_first = True
+
+    def do_GET(self):
+        value = self.headers.get('Range')
+        SourceHandler.ranges.append(value)
+        start = int(re.match(r'bytes=(\d+)-', value).group(1)) if value else 0
+        if start >= len(BODY):
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(BODY)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header('Content-Range', f'bytes {start}-{len(BODY) - 1}/{len(BODY)}')
+        self.send_header('Content-Disposition', f'attachment; filename="{FILENAME}"')
+        self.send_header('Content-Length', str(len(BODY) - start))
+        self.end_headers()
+        if not start and SourceHandler.drop_first:
+            SourceHandler.drop_first = False
+            self.wfile.write(BODY[:len(BODY) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(BODY[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+async def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SourceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/src/2511.00001'
+    service = ArxivDailyCrawlService('cs.AI')
+    folder = tempfile.mkdtemp()
+    part = os.path.join(folder, f".{hashlib.sha1(url.encode('utf-8')).hexdigest()}.part")
+
+    # 连接中途断开: 重试时带 Range 续传, 最终文件与源文件一致
+    path = await service._download_async(url, folder)
+    print('续传请求：', SourceHandler.ranges)
+    assert SourceHandler.ranges[0] is None
+    assert SourceHandler.ranges[1] is not None and SourceHandler.ranges[1] != 'bytes=0-', SourceHandler.ranges
+    assert os.path.basename(path) == FILENAME
+    with open(path, 'rb') as f:
+        assert f.read() == BODY
+    assert not os.path.exists(part)
+
+    # .part 已经完整 (重命名前中断): 416 直接视为完成, 不消耗重试
+    os.remove(path)
+    with open(part, 'wb') as f:
+        f.write(BODY)
+    SourceHandler.ranges.clear()
+    path = await service._download_async(url, folder)
+    assert SourceHandler.ranges == [f'bytes={len(BODY)}-'], SourceHandler.ranges
+    with open(path, 'rb') as f:
+        assert f.read() == BODY
+    assert not os.path.exists(part)
+
+    # .part 比服务器上的文件还大: 删除后从头下载
+    with open(part, 'wb') as f:
+        f.write(BODY + b'garbage')
+    SourceHandler.ranges.clear()
+    path = await service._download_async(url, folder)
+    assert SourceHandler.ranges == [f'bytes={len(BODY) + 7}-', None], SourceHandler.ranges
+    with open(path, 'rb') as f:
+        assert f.read() == BODY
+
+    server.shutdown()
+    print('DownloadResume ok')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
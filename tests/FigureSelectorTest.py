@@ -0,0 +1,46 @@
+from src.crawl.FigureSelector import FigureSelector
+
+if __name__ == '__main__':
+    tex_sources = {
+        'main.tex': r'''
+\documentclass{article}
+\graphicspath{{figures/}}
+\begin{document}
+\input{sections/method}
+\includegraphics[width=\linewidth]{overview}
+% \includegraphics{figures/commented}
+\appendix
+\includegraphics{figures/appendix_plot.png}
+\end{document}
+''',
+        'sections/method.tex': r'\includegraphics{figures/arch.pdf}',
+        'old_draft.tex': r'\includegraphics{figures/draft}',
+    }
+    figures = [
+        'figures/logo.png', 'figures/appendix_plot.png', 'figures/commented.png',
+        'figures/draft.jpg', 'figures/overview.PNG', 'figures/arch.pdf',
+    ]
+    ordered = FigureSelector(tex_sources).order(figures)
+    print(ordered)
+    assert ordered == ['figures/arch.pdf', 'figures/overview.PNG', 'figures/appendix_plot.png', 'figures/draft.jpg',
+                       'figures/logo.png', 'figures/commented.png']
+
+    # 通过宏引入的图片解析不到引用, 不能被丢弃
+    macro_sources = {
+        'main.tex': r'''
+\documentclass{article}
+\newcommand{\fig}[1]{\includegraphics[width=\linewidth]{#1}}
+\begin{document}
+\fig{plot}
+\input{arch.tikz}
+\includegraphics{teaser}
+\end{document}
+''',
+    }
+    ordered = FigureSelector(macro_sources).order(['plot.png', 'arch.pdf', 'teaser.jpg'])
+    print(ordered)
+    assert ordered == ['teaser.jpg', 'plot.png', 'arch.pdf']
+    assert FigureSelector({'main.tex': macro_sources['main.tex'].replace(r'\includegraphics{teaser}', '')}).order(
+        ['plot.png', 'arch.pdf']) == ['plot.png', 'arch.pdf']
+    # 没有 tex 源码 (例如直接返回 pdf) 时保持原顺序
+    assert FigureSelector({}).order(['paper.pdf']) == ['paper.pdf']
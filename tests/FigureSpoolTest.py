@@ -0,0 +1,63 @@
+import base64
+import os
+import tempfile
+import tracemalloc
+
+from src.ai.BaseAI import BaseAI
+from src.crawl.FigureSpool import FigureSpool
+from src.models.Arxiv import ArxivMetaData
+from src.models.Content import FigureB64
+
+FIGURES_PER_ARTICLE = 40
+FIGURE_BYTES = 100 * 1024
+
+
+def _metadata(spool: FigureSpool, lazy: bool) -> ArxivMetaData:
+    figures = []
+    for i in range(FIGURES_PER_ARTICLE):
+        data = os.urandom(FIGURE_BYTES)
+        if lazy:
+            (path, offset, length, digest), = spool.write([data])
+            figures.append(FigureB64(name=f'fig-{i}', mime='image/jpeg', path=path, offset=offset, length=length,
+                                     digest=digest))
+        else:
+            figures.append(FigureB64(name=f'fig-{i}', mime='image/jpeg', b64=base64.b64encode(data).decode()))
+    return ArxivMetaData(figures=figures, texts=[])
+
+
+def peak_memory(articles: int, lazy: bool) -> int:
+    """
+    模拟 fill_meta_data 先拉取全部文章的元数据, 再逐篇构建请求内容
+    """
+    spool = FigureSpool(root=tempfile.mkdtemp())
+    ai = BaseAI()
+    tracemalloc.start()
+    metadata = [_metadata(spool, lazy) for _ in range(articles)]
+    for md in metadata:
+        blocks = [ai.buildB64ImageContent(f) for f in md.figures]
+        assert len(blocks) == FIGURES_PER_ARTICLE
+        del blocks
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    spool = FigureSpool(root=tempfile.mkdtemp())
+    refs = spool.write([b'abc', b'defg'])
+    figure = FigureB64(name='x', mime='image/png', path=refs[1][0], offset=refs[1][1], length=refs[1][2])
+    assert figure.read_bytes() == b'defg' and figure.load_b64() == base64.b64encode(b'defg').decode()
+
+    results = {}
+    for lazy in (False, True):
+        for n in (4, 16):
+            results[(lazy, n)] = peak_memory(n, lazy)
+            print(f"{'lazy' if lazy else 'inline':6} {n:3d} articles: peak {results[(lazy, n)] / 2 ** 20:7.1f} MB")
+    # 引用形式的峰值内存只取决于单篇文章, 与文章数量基本无关
+    assert results[(True, 16)] < results[(True, 4)] * 1.5
+    assert results[(False, 16)] > results[(False, 4)] * 3
+    assert results[(True, 16)] < results[(False, 16)] / 4
+
+
+if __name__ == '__main__':
+    main()
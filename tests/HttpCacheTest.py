@@ -0,0 +1,61 @@
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.crawl.HttpCache import HttpCache
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'arxiv_list_new.html'
+ETAG = '"listing-v1"'
+
+
+class ListingHandler(BaseHTTPRequestHandler):
+    statuses = []
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            ListingHandler.statuses.append(304)
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        body = FIXTURE.read_bytes()
+        ListingHandler.statuses.append(200)
+        self.send_response(200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ListingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    ArxivDailyCrawlService.BASE_URL = f'http://127.0.0.1:{server.server_port}'
+    ArxivDailyCrawlService.httpCache = HttpCache(path=str(Path(tempfile.mkdtemp()) / 'http_cache.sqlite3'))
+    service = ArxivDailyCrawlService('cs.AI')
+    # 第二次请求命中缓存时不应再解析页面
+    parsed = []
+    parse_articles = service.parse_articles
+    service.parse_articles = lambda html, url: parsed.append(url) or parse_articles(html, url)
+
+    first = await service.crawl()
+    assert not service.lastFetchCached
+    second = await service.crawl()
+    assert service.lastFetchCached
+    print(ListingHandler.statuses, len(parsed), service.httpCache.hits, service.httpCache.misses)
+    assert ListingHandler.statuses == [200, 304]
+    assert len(parsed) == 1
+    assert second == first
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+
+import pymupdf
+
+from src.ai.ContextPacker import ContextPacker
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.crawl.FigureSpool import FigureSpool
+from src.crawl.ImageNormalizer import ImageNormalizer, NormalizedImage
+from src.models.Content import SourceFile
+from src.crawl.PdfRenderer import PdfRenderer
+
+
+def _noise_png(width: int, height: int, alpha: bool) -> bytes:
+    """
+    随机像素的 PNG 压缩率很低, 重新编码为 JPEG 后一定更小; 左上角 10x10 为全透明
+    """
+    n = 4 if alpha else 3
+    pix = pymupdf.Pixmap(pymupdf.csRGB, width, height, os.urandom(width * height * n), alpha)
+    if alpha:
+        pix.set_rect(pymupdf.IRect(0, 0, 10, 10), (0, 0, 0, 0))
+    return pix.tobytes(output='png')
+
+
+def main():
+    normalizer = ImageNormalizer(enabled=True, max_edge=1024, fmt='JPEG', quality=85)
+
+    # 缩放到长边不超过 max_edge, 去掉 alpha, 透明区域变为白色
+    data = _noise_png(3000, 800, alpha=True)
+    out, mime, width, height = normalizer.normalize(data, 'image/png')
+    assert mime == 'image/jpeg'
+    pix = pymupdf.Pixmap(out)
+    assert (pix.width, pix.height) == (width, height) == (1024, 273), (pix.width, pix.height, width, height)
+    assert pix.alpha == 0 and pix.n == 3
+    assert all(c > 240 for c in pix.pixel(1, 1)), pix.pixel(1, 1)
+
+    # 小于 max_edge 时不放大
+    small = _noise_png(300, 200, alpha=False)
+    out_small, _, width, height = normalizer.normalize(small, 'image/png')
+    assert (pymupdf.Pixmap(out_small).width, pymupdf.Pixmap(out_small).height) == (width, height) == (300, 200)
+
+    # 重新编码后反而更大时保留原图
+    tiny = pymupdf.Pixmap(pymupdf.csRGB, pymupdf.IRect(0, 0, 64, 64), False)
+    tiny.clear_with(255)
+    tiny_png = tiny.tobytes(output='png')
+    # 重新编码后反而更大时保留原图, 尺寸为原图尺寸
+    assert normalizer.normalize(tiny_png, 'image/png') == NormalizedImage(tiny_png, 'image/png', 64, 64)
+
+    # 无法解析的数据原样返回
+    assert normalizer.normalize(b'not an image', 'image/png') == NormalizedImage(b'not an image', 'image/png')
+
+    stats = normalizer.stats['image']
+    print('图片压缩统计：', normalizer.stats)
+    assert stats['count'] == 4
+    assert stats['bytes_before'] == len(data) + len(small) + len(tiny_png) + len(b'not an image')
+    assert stats['bytes_after'] == len(out) + len(out_small) + len(tiny_png) + len(b'not an image')
+
+    # mime 与实际编码的格式一致, 不支持的格式 (如 WEBP) 直接报错, 不会把 PNG 标注为 image/webp
+    png = ImageNormalizer(enabled=True, max_edge=1024, fmt='png')
+    out_png, mime, _, _ = png.normalize(data, 'image/png')
+    assert mime == 'image/png' and out_png.startswith(b'\x89PNG')
+    for fmt in ('WEBP', 'GIF'):
+        try:
+            ImageNormalizer(fmt=fmt)
+        except ValueError:
+            continue
+        raise AssertionError(f'{fmt} should be rejected')
+    # 环境变量中的不支持格式退回 JPEG
+    script = "from src.config.Config import Config; print(Config.IMAGE_FORMAT)"
+    proc = subprocess.run([sys.executable, '-W', 'always', '-c', script], capture_output=True, text=True,
+                          env={**os.environ, 'IMAGE_FORMAT': 'webp'})
+    assert proc.stdout.strip() == 'JPEG' and 'IMAGE_FORMAT=WEBP' in proc.stderr, (proc.stdout, proc.stderr)
+
+    # 关闭时不处理也不统计
+    disabled = ImageNormalizer(enabled=False)
+    assert disabled.normalize(data, 'image/png') == NormalizedImage(data, 'image/png') and disabled.stats == {}
+
+    # 进程池中的结果与同步处理一致
+    PdfRenderer.workers = 2
+    pooled = ImageNormalizer(enabled=True, max_edge=1024, fmt='JPEG', quality=85)
+    assert asyncio.run(PdfRenderer().normalize(pooled, data, 'image/png')) == (out, 'image/jpeg', 1024, 273)
+    assert pooled.stats['image'] == {'count': 1, 'bytes_before': len(data), 'bytes_after': len(out)}
+    # 关闭归一化时仍在进程池中读取尺寸
+    assert asyncio.run(PdfRenderer().normalize(disabled, small, 'image/png')) == (small, 'image/png', 300, 200)
+    # 有尺寸时按尺寸估算 token, 不再使用默认值
+    assert ContextPacker.image_tokens(width, height) != ContextPacker.UNKNOWN_IMAGE_TOKENS
+    assert ContextPacker.image_tokens(1024, 273) == 85 + 170 * 2
+
+    # 源码中的图片带上归一化后的尺寸
+    ArxivDailyCrawlService.figureSpool = FigureSpool(root=tempfile.mkdtemp())
+    ArxivDailyCrawlService.imageNormalizer = ImageNormalizer(enabled=True, max_edge=1024, fmt='JPEG', quality=85)
+    service = ArxivDailyCrawlService('cs.AI')
+    metadata = asyncio.run(service.process_file_lists([SourceFile(name='figures/plot.png', data=small)]))
+    assert [(f.name, f.width, f.height) for f in metadata.figures] == [('plot', 300, 200)]
+    PdfRenderer.executor().shutdown()
+    print('ImageNormalizer ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+import asyncio
+import datetime
+import tempfile
+
+from pydantic import HttpUrl
+
+from src.ai.ArxivJudger import ArxivJudger
+from src.ai.BaseAI import BaseAI
+from src.ai.JudgeBatcher import JudgeBatcher
+from src.ai.LLMCache import LLMCache
+from src.models.Arxiv import ArxivArticle, BatchJudgeItem, BatchJudgeResult, JudgeResult
+
+
+def _article(i: int) -> ArxivArticle:
+    now = datetime.datetime(2025, 11, 25, tzinfo=datetime.timezone.utc)
+    return ArxivArticle(index=i, arxiv_id=f'2511.0000{i}', category='cs.AI',
+                        abs_url=HttpUrl(f'https://arxiv.org/abs/2511.0000{i}'), title=f'T{i}', authors=['a'],
+                        abstract='x', scraped_at=now)
+
+
+def _result(name: str) -> JudgeResult:
+    return JudgeResult(chinese_name=name, chinese_abstract='摘要', worth_read=True, comment='评价')
+
+
+class FakeJudger(ArxivJudger):
+    """
+    批量请求中漏掉 00002, 重复返回 00003, 这两篇应退回单篇判断
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def _invoke_limited(self, call, estimated_tokens, usage, stage=None):
+        ids = [f'2511.0000{i}' for i in range(5)]
+        self.batch_calls.append(ids)
+        items = [BatchJudgeItem(arxiv_id=i, **_result(f'batch-{i}').model_dump()) for i in ids if i != '2511.00002']
+        items.append(BatchJudgeItem(arxiv_id='2511.00003', **_result('dup').model_dump()))
+        return {'structured_response': BatchJudgeResult(results=items), 'messages': []}
+
+    async def judge(self, article: ArxivArticle) -> JudgeResult:
+        self.single_calls.append(article.arxiv_id)
+        return _result(f'single-{article.arxiv_id}')
+
+
+async def main():
+    BaseAI.cache = LLMCache(path=tempfile.mkdtemp() + '/cache.sqlite3')
+    judger = FakeJudger()
+    batcher = JudgeBatcher(judger, batchsize=5)
+    results = await asyncio.gather(*(batcher.judge(_article(i)) for i in range(5)))
+    print([r.chinese_name for r in results])
+    assert batcher.batches == 1 and len(judger.batch_calls) == 1
+    assert sorted(judger.single_calls) == ['2511.00002', '2511.00003']
+    assert [r.chinese_name for r in results] == [
+        'batch-2511.00000', 'batch-2511.00001', 'single-2511.00002', 'single-2511.00003', 'batch-2511.00004']
+
+    # 批量结果按篇写入缓存, 再次判断不会发请求
+    judger.single_calls.clear()
+    results = await judger.judge_batch([_article(0), _article(1)])
+    assert [r.chinese_name for r in results] == ['batch-2511.00000', 'batch-2511.00001']
+    assert len(judger.batch_calls) == 1 and judger.single_calls == []
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
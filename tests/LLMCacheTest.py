@@ -0,0 +1,67 @@
+import tempfile
+from pathlib import Path
+
+import src.ai.LLMCache as LLMCacheModule
+from src.ai.LLMCache import LLMCache
+
+
+class FakeTime:
+    now = 1_000_000.0
+
+    @classmethod
+    def time(cls) -> float:
+        return cls.now
+
+
+def main():
+    LLMCacheModule.time = FakeTime
+    root = Path(tempfile.mkdtemp())
+    path = str(root / 'llm_cache.sqlite3')
+    fp = LLMCache.fingerprint('gpt-5-mini', '系统提示词')
+
+    # TTL 过期
+    cache = LLMCache(path=path, ttl=100, max_bytes=1 << 20, bypass=False)
+    key = LLMCache.make_key(fp, 'payload')
+    cache.set('judge', key, fp, 'value')
+    FakeTime.now += 99
+    assert cache.get('judge', key) == 'value'
+    FakeTime.now += 2
+    assert cache.get('judge', key) is None
+    assert cache.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] == 0
+    assert cache.stats() == {'judge': {'hits': 1, 'misses': 1}}
+
+    # 按总字节数的 LRU 淘汰: 最近访问过的记录保留
+    cache = LLMCache(path=str(root / 'lru.sqlite3'), ttl=10_000, max_bytes=300, bypass=False)
+    keys = [LLMCache.make_key(fp, f'p{i}') for i in range(3)]
+    for i, k in enumerate(keys):
+        FakeTime.now += 1
+        cache.set('analyze', k, fp, str(i) * 100)
+    FakeTime.now += 1
+    assert cache.get('analyze', keys[0]) == '0' * 100
+    FakeTime.now += 1
+    cache.set('analyze', LLMCache.make_key(fp, 'p3'), fp, '3' * 100)
+    assert cache.get('analyze', keys[1]) is None
+    assert cache.get('analyze', keys[0]) is not None and cache.get('analyze', keys[2]) is not None
+    total = cache.conn.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    assert total <= 300, total
+
+    # bypass: 不读取, 但仍写入新结果
+    bypass = LLMCache(path=path, ttl=100, max_bytes=1 << 20, bypass=True)
+    bypass.set('judge', key, fp, 'fresh')
+    assert bypass.get('judge', key) is None
+    assert LLMCache(path=path, ttl=100, max_bytes=1 << 20, bypass=False).get('judge', key) == 'fresh'
+
+    # 模型或提示词变化: 键不同不会命中, purge_stale 清理旧指纹的记录
+    new_fp = LLMCache.fingerprint('gpt-5-mini', '新的系统提示词')
+    assert new_fp != fp and LLMCache.fingerprint('gpt-5', '系统提示词') != fp
+    cache = LLMCache(path=path, ttl=100, max_bytes=1 << 20, bypass=False)
+    assert cache.get('judge', LLMCache.make_key(new_fp, 'payload')) is None
+    cache.set('analyze', LLMCache.make_key(fp, 'other'), fp, 'kept')
+    cache.purge_stale('judge', new_fp)
+    assert cache.get('judge', key) is None
+    assert cache.get('analyze', LLMCache.make_key(fp, 'other')) == 'kept'
+    print('LLMCache ok')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+from src.utils.LatexFlattener import LatexFlattener
+from src.utils.TokenUtils import TokenUtils
+
+if __name__ == '__main__':
+    sources = {
+        'main.tex': r'''
+\documentclass{article}
+\begin{document}
+% 这一行是注释
+\input{sections/intro}
+
+
+
+\iffalse
+old experiments
+\fi
+\begin{comment}
+unused paragraph
+\end{comment}
+50\% of the results
+\bibliographystyle{plain}
+\bibliography{refs}
+\appendix
+\section{Proofs}
+\end{document}
+''',
+        'sections/intro.tex': r'\section{Intro} Hello \include{sections/inner}',
+        'sections/inner.tex': r'inner text % trailing comment',
+        'old_version.tex': r'\documentclass{article} stale draft',
+    }
+    flattener = LatexFlattener(sources)
+    main = flattener.find_main()
+    assert main == 'main.tex'
+    document = flattener.prune(flattener.flatten(main))
+    print(document)
+    assert 'inner text' in document and 'trailing comment' not in document
+    assert 'old experiments' not in document and 'unused paragraph' not in document
+    assert '50\\% of the results' in document
+    assert '\n\n\n' not in document
+    assert '\\bibliography{refs}' in document and '\\appendix' in document
+    assert flattener.unused() == ['old_version.tex']
+
+    pruned = flattener.prune(flattener.flatten(main), drop_bibliography=True, drop_appendix=True)
+    assert '\\bibliography' not in pruned and 'Proofs' not in pruned
+    assert pruned.rstrip().endswith('\\end{document}')
+
+    before = sum(TokenUtils.count_tokens(t) for t in sources.values())
+    after = TokenUtils.count_tokens(pruned)
+    print(before, '->', after)
+    assert after < before
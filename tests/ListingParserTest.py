@@ -0,0 +1,51 @@
+import re
+import time
+from pathlib import Path
+
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.crawl.ListingParser import ListingParser
+
+FIXTURE = Path(__file__).parent / 'fixtures' / 'arxiv_list_new.html'
+
+
+def _enlarge(html: str, copies: int) -> str:
+    """
+    复制 New submissions 中的条目, 模拟 cs.LG / cs.CV 这类大分类的页面
+    """
+    start = html.index("<dt>")
+    end = html.index("</dl>")
+    block = html[start:end]
+    items = [re.sub(r"\[(\d+)\]", lambda m: f"[{int(m.group(1)) + i * 3}]", block) for i in range(copies)]
+    return html[:start] + ''.join(items) + html[end:]
+
+
+def _parse(service: ArxivDailyCrawlService, backend: str, html: str):
+    service.listingParser = ListingParser.create(backend)
+    return service.parse_articles(html, service.full_path).articles
+
+
+if __name__ == '__main__':
+    service = ArxivDailyCrawlService('cs.AI')
+    html = FIXTURE.read_text(encoding='utf-8')
+
+    expected = _parse(service, 'soup', html)
+    assert [a.arxiv_id for a in expected] == ['2511.19314', '2511.19320', '2511.19333']
+    assert expected[0].authors[1] == 'Jürgen Müller'
+    assert expected[0].subjects_other == ['Multiagent Systems (cs.MA)', 'Machine Learning (cs.LG)']
+    assert expected[1].html_url is None and expected[1].comments is None
+    for backend in ListingParser.available():
+        articles = _parse(service, backend, html)
+        dump = lambda items: [a.model_dump(exclude={'scraped_at'}) for a in items]
+        assert dump(articles) == dump(expected), backend
+        print(f'{backend}: identical output')
+    # 没有安装 lxml 时 auto 退回原实现, 不会选到更慢的 strainer
+    assert ListingParser.create('auto').name == ('lxml' if 'lxml' in ListingParser.available() else 'soup')
+
+    big = _enlarge(html, 400)
+    for backend in ListingParser.available():
+        _parse(service, backend, big)
+        start = time.perf_counter()
+        rounds = 5
+        for _ in range(rounds):
+            n = len(_parse(service, backend, big))
+        print(f'{backend:>8}: {n} articles, {(time.perf_counter() - start) / rounds * 1000:.1f} ms/page')
@@ -0,0 +1,59 @@
+import asyncio
+import json
+import tempfile
+
+import httpx
+import openai
+from langchain_core.messages import AIMessage
+
+from src.ai.ArxivAnalyzer import ArxivAnalyzer
+from src.utils.Metrics import MetricsCollector, parse_prices
+
+
+def _message() -> AIMessage:
+    return AIMessage(content='ok', usage_metadata={
+        'input_tokens': 1_000_000, 'output_tokens': 100_000, 'total_tokens': 1_100_000,
+        'input_token_details': {'cache_read': 400_000}, 'output_token_details': {'reasoning': 50_000},
+    })
+
+
+async def main():
+    path = tempfile.mkdtemp()
+    collector = MetricsCollector(path=path, prices=parse_prices('test-model=1,10,0.1'))
+    analyzer = ArxivAnalyzer()
+    analyzer.metrics = collector
+    analyzer.model = analyzer.model.model_copy(update={'model_name': 'test-model'})
+
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise openai.APIConnectionError(request=httpx.Request('POST', 'https://example.invalid'))
+        return _message()
+
+    collector.category.set('cs.AI')
+    await analyzer._invoke_limited(call, 1000, lambda r: [r], stage='analyze')
+    with collector.timer('download'):
+        await asyncio.sleep(0.01)
+
+    summary = collector.write('2025-11-25')
+    print(json.dumps(summary, indent=2))
+    model = summary['llm']['test-model']
+    # (1M - 0.4M) * $1 + 0.1M * $10 + 0.4M * $0.1
+    assert abs(model['cost'] - 1.64) < 1e-9
+    assert model['cached_tokens'] == 400_000 and model['reasoning_tokens'] == 50_000
+    assert summary['categories']['cs.AI']['calls'] == 1
+    assert summary['latency']['analyze']['count'] == 2 and summary['latency']['analyze']['errors'] == 1
+    assert summary['retries'] == [{'stage': 'analyze', 'reason': 'APIConnectionError', 'count': 1}]
+    assert summary['latency']['download']['p50'] >= 0.01
+
+    prom = (collector.path / 'arxiv_archive.prom').read_text()
+    print(prom)
+    assert 'arxiv_llm_tokens_total{model="test-model",kind="cached"} 400000' in prom
+    assert 'arxiv_stage_latency_seconds_count{stage="analyze"} 2' in prom
+    print(MetricsCollector.footer(json.loads(collector.summary_path('2025-11-25').read_text())))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pymupdf
+
+from src.config.Config import Config
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.crawl.FigureSpool import FigureSpool
+from src.crawl.PdfRenderer import FigureBudget, PdfRenderer, _render_pages
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    doc = pymupdf.open()
+    for i in range(pages):
+        page = doc.new_page(width=300, height=200)
+        # 每页颜色和文字不同, 渲染结果可以区分
+        page.draw_rect(pymupdf.Rect(10, 10, 290, 190), color=(i / pages, 0, 1 - i / pages), fill=(i / pages, 0.5, 0))
+        page.insert_text((40, 100), f'page {i}', fontsize=24)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+async def test_render(root: Path):
+    pdf = _make_pdf(root / 'doc.pdf', 7)
+    spool = FigureSpool(root=root / 'spool')
+    PdfRenderer.workers = 3
+    renderer = PdfRenderer()
+    assert await renderer.page_count(str(pdf)) == 7
+
+    figures = await renderer.render('doc', str(pdf), list(range(7)), spool=spool)
+    # 分片并行渲染后仍按页码顺序返回
+    assert [f.name for f in figures] == [f'doc-{i}' for i in range(7)]
+    assert all(f.b64 is None and f.width == 300 and f.height == 200 for f in figures)
+
+    # 与在当前进程中顺序渲染的结果逐字节一致, 内存中的 pdf 也一样
+    sequential = _render_pages(str(pdf), list(range(7)), 1.0, 'PNG', str(root / 'sequential'))
+    assert [f.read_bytes() for f in figures] == [
+        Path(path).read_bytes()[offset:offset + length] for _, (path, offset, length, _), _, _, _ in sequential]
+    from_bytes = await renderer.render('doc', pdf.read_bytes(), [1, 4], spool=spool)
+    assert [f.digest for f in from_bytes] == [figures[1].digest, figures[4].digest]
+    assert len({f.digest for f in figures}) == 7
+
+
+async def test_budget(root: Path):
+    budget = FigureBudget(5)
+    assert budget.take(3) == 3 and budget.take(4) == 2 and budget.take(1) == 0
+    assert budget.exhausted
+
+    # 同一篇文章的 pdf 共享 MAX_FIGURE_NUM, 用完后后面的 pdf 不再渲染
+    first = _make_pdf(root / 'first.pdf', 4)
+    second = _make_pdf(root / 'second.pdf', 3)
+    third = _make_pdf(root / 'third.pdf', 2)
+    Config.MAX_FIGURE_NUM = 6
+    ArxivDailyCrawlService.figureSpool = FigureSpool(root=root / 'spool')
+    service = ArxivDailyCrawlService('cs.AI')
+    rendered = []
+    render = service.pdfRenderer.render
+
+    async def tracking_render(name, source, pages, **kwargs):
+        rendered.append((name, list(pages)))
+        return await render(name, source, pages, **kwargs)
+
+    service.pdfRenderer.render = tracking_render
+    metadata = await service.process_file_lists([str(first), str(second), str(third)])
+    assert [f.name for f in metadata.figures] == ['first-0', 'first-1', 'first-2', 'first-3', 'second-0', 'second-1']
+    assert rendered == [('first', [0, 1, 2, 3]), ('second', [0, 1])], rendered
+
+
+async def main():
+    root = Path(tempfile.mkdtemp())
+    await test_render(root)
+    await test_budget(root)
+    PdfRenderer.executor().shutdown()
+    print('PdfRenderer ok')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+import asyncio
+import datetime
+import random
+import tempfile
+from pathlib import Path
+
+from pydantic import HttpUrl
+
+from src.config.Config import Config
+
+ROOT = Path(tempfile.mkdtemp())
+Config.CACHE_PATH = str(ROOT)
+Config.DOWNLOAD_PATH = str(ROOT / 'downloads')
+Config.METRICS_PATH = str(ROOT / 'metrics')
+Config.ARCHIVE = Config.SEARCH_INDEX = Config.SEEN_INDEX = Config.PREFILTER = False
+
+from langchain_core.messages import AIMessage
+
+from src.ai.BaseAI import BaseAI
+from src.ai.LLMCache import LLMCache
+from src.models.Arxiv import ArxivArticle, ArxivMetaData, ArxivPageResult, JudgeResult, Tex
+from src.utils.ArticleRegistry import ArticleRegistry
+from src.workflows.ArxivDailyWorkflow import ArxivDailyWorkflow
+
+BaseAI.cache = LLMCache(path=str(ROOT / 'llm_cache.sqlite3'), bypass=True)
+
+
+def _page() -> ArxivPageResult:
+    now = datetime.datetime(2025, 11, 25, tzinfo=datetime.timezone.utc)
+    return ArxivPageResult(category='cs.AI', url=HttpUrl('https://arxiv.org/list/cs.AI/new'), scraped_at=now, articles=[
+        ArxivArticle(index=i + 1, arxiv_id=f'2511.{i:05d}', category='cs.AI',
+                     abs_url=HttpUrl(f'https://arxiv.org/abs/2511.{i:05d}'),
+                     pdf_url=HttpUrl(f'https://arxiv.org/pdf/2511.{i:05d}'), title=f'Paper {i}', authors=['a'],
+                     abstract=f'abstract {i}', scraped_at=now)
+        for i in range(30)
+    ])
+
+
+async def _run(mode: str):
+    """
+    用随机延迟的假判断 / 下载 / 分析跑一遍工作流, 返回导出的 JSON 和所有报告的字节内容
+    """
+    Config.ANALYZE_REPORT_PATH = str(ROOT / mode)
+    ArxivDailyWorkflow.registry = ArticleRegistry()
+    wf = ArxivDailyWorkflow('cs.AI', batchsize=1)
+
+    async def crawl():
+        return _page()
+
+    async def judge(article: ArxivArticle):
+        await asyncio.sleep(random.random() * 0.02)
+        return JudgeResult(chinese_name=f'中文 {article.title}', chinese_abstract='摘要',
+                           worth_read=int(article.arxiv_id[-1]) % 3 == 0, comment='评价')
+
+    async def fetch(arxiv_id, url, version):
+        await asyncio.sleep(random.random() * 0.02)
+        return [arxiv_id]
+
+    async def process(files):
+        return ArxivMetaData(figures=[], texts=[Tex(name='main', text=files[0])])
+
+    async def analyze(metadata, stream_to=None, header=''):
+        await asyncio.sleep(random.random() * 0.02)
+        return AIMessage(content=f'# 分析\n\n{metadata.texts[0].text}\n')
+
+    wf.crawlService.crawl = crawl
+    wf.crawlService.fetch_source_files = fetch
+    wf.crawlService.process_file_lists = process
+    wf.judgeService.judge = judge
+    wf.aiService.analyze = analyze
+    await wf.run(mode=mode)
+    reports = {p.name: p.read_bytes() for p in sorted(wf.folder.glob('*.md'))}
+    return (wf.folder / 'cs.AI.json').read_bytes(), reports
+
+
+async def main():
+    batch_json, batch_reports = await _run('batch')
+    pipeline_json, pipeline_reports = await _run('pipeline')
+    assert batch_json == pipeline_json
+    assert batch_reports == pipeline_reports
+    assert len(batch_reports) == 12, sorted(batch_reports)
+    print(f'batch / pipeline 输出一致：JSON {len(batch_json)} 字节，{len(batch_reports)} 篇报告')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
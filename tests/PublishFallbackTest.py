@@ -0,0 +1,42 @@
+import tempfile
+from pathlib import Path
+
+from src.config.Config import Config
+from src.models.Record import PageRecord
+from src.utils.ArxivArchive import ArxivArchive
+from src.utils.JsonUtils import JsonUtils
+from src.utils.TimeUtils import TimeUtils
+from src.workflows.ArxivDailyPublishWorkflow import ArxivDailyPublishWorkflow
+from tests.ArxivArchiveTest import _page
+
+
+def main():
+    root = Path(tempfile.mkdtemp())
+    Config.ANALYZE_REPORT_PATH = str(root)
+    Config.ARCHIVE_PATH = str(root / 'archive.sqlite3')
+    date = TimeUtils.current_date_str()
+    pages = {c: PageRecord.from_model(_page(c, {0})) for c in ('cs.AI', 'cs.OS')}
+    for category, page in pages.items():
+        outfile = root / date / category / f'{category}.json'
+        outfile.parent.mkdir(parents=True)
+        outfile.write_bytes(JsonUtils.dumps(page.to_dict(), indent=True))
+
+    # 只有 cs.OS 写入了归档 (例如 cs.AI 运行时关闭了 ARCHIVE), cs.AI 从 JSON 补齐
+    archived = PageRecord.from_model(_page('cs.OS', {0, 1}))
+    ArxivArchive().store_page(date, archived)
+    Config.ARCHIVE = True
+    loaded = ArxivDailyPublishWorkflow._load_today()
+    assert [p.category for p in loaded] == ['cs.AI', 'cs.OS']
+    assert JsonUtils.dumps(loaded[0].to_dict()) == JsonUtils.dumps(pages['cs.AI'].to_dict())
+    assert JsonUtils.dumps(loaded[1].to_dict()) == JsonUtils.dumps(archived.to_dict())
+
+    # 关闭归档时只读取 JSON
+    Config.ARCHIVE = False
+    loaded = ArxivDailyPublishWorkflow._load_today()
+    assert sorted(p.category for p in loaded) == ['cs.AI', 'cs.OS']
+    assert all(JsonUtils.dumps(p.to_dict()) == JsonUtils.dumps(pages[p.category].to_dict()) for p in loaded)
+    print('ok')
+
+
+if __name__ == '__main__':
+    main()
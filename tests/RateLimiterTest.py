@@ -0,0 +1,176 @@
+import asyncio
+import email.utils
+import types
+
+import httpx
+import openai
+from langchain_core.messages import SystemMessage
+
+import src.ai.BaseAI as BaseAIModule
+import src.ai.RateLimiter as RateLimiterModule
+from src.ai.BaseAI import BaseAI
+from src.ai.RateLimiter import RateLimiter
+
+_real_sleep = asyncio.sleep
+
+
+class FakeClock:
+    """
+    替换 RateLimiter / BaseAI 中的 time 和 asyncio.sleep, sleep 只推进虚拟时间
+    """
+    now = 1_000.0
+    slept = []
+
+    @classmethod
+    def monotonic(cls) -> float:
+        return cls.now
+
+    time = perf_counter = monotonic
+
+    @classmethod
+    async def sleep(cls, seconds: float):
+        cls.slept.append(seconds)
+        cls.now += max(0.0, seconds)
+        await _real_sleep(0)
+
+
+def _install_clock():
+    fake_asyncio = types.SimpleNamespace(Lock=asyncio.Lock, Condition=asyncio.Condition, sleep=FakeClock.sleep)
+    for module in (RateLimiterModule, BaseAIModule):
+        module.time = FakeClock
+        module.asyncio = fake_asyncio
+
+
+class FakeAI(BaseAI):
+    def __init__(self, limiter: RateLimiter):
+        self._use_model('rate-limiter-test')
+        self.limiter = limiter
+        self.systemMessage = SystemMessage(content='test')
+
+
+def _error(cls, status: int, headers=None):
+    request = httpx.Request('POST', 'http://127.0.0.1/v1/responses')
+    return cls('error', response=httpx.Response(status, headers=headers or {}, request=request), body=None)
+
+
+async def test_rpm_tpm():
+    limiter = RateLimiter(rpm=60, tpm=1_000_000, concurrency=100)
+    start = FakeClock.now
+    for _ in range(60):
+        await limiter.acquire(10)
+        await limiter.release(10, 10, ok=True)
+    assert FakeClock.now == start
+    await limiter.acquire(10)
+    await limiter.release(10, 10, ok=True)
+    # 60 rpm: 桶空后每秒补充一个请求
+    assert abs(FakeClock.now - start - 1.0) < 1e-6, FakeClock.now - start
+
+    limiter = RateLimiter(rpm=1000, tpm=6000, concurrency=100)
+    start = FakeClock.now
+    await limiter.acquire(6000)
+    await limiter.release(6000, 6000, ok=True)
+    await limiter.acquire(3000)
+    # 6000 tpm = 100 tokens/s, 需要等待 30 秒
+    assert abs(FakeClock.now - start - 30.0) < 1e-6, FakeClock.now - start
+    # 实际用量超出预估时透支, 之后的请求被延后
+    await limiter.release(3000, 6000, ok=True)
+    start = FakeClock.now
+    await limiter.acquire(100)
+    assert FakeClock.now - start >= 31.0 - 1e-6, FakeClock.now - start
+    await limiter.release(100, 100, ok=True)
+
+
+async def test_aimd():
+    limiter = RateLimiter(rpm=10_000, tpm=10_000_000, concurrency=8)
+    limiter.on_rate_limited(0)
+    assert limiter.limit == 4.0
+    limiter.on_rate_limited(0)
+    assert limiter.limit == 2.0
+
+    # 并发上限为 2 时第三个请求等待
+    await limiter.acquire(1)
+    await limiter.acquire(1)
+    third = asyncio.ensure_future(limiter.acquire(1))
+    await _real_sleep(0.01)
+    assert not third.done() and limiter.in_flight == 2
+    await limiter.release(1, 1, ok=True)
+    await asyncio.wait_for(third, 1)
+    await limiter.release(1, 1, ok=True)
+    await limiter.release(1, 1, ok=True)
+
+    # 成功时加性增长, 不超过配置的并发
+    previous = limiter.limit
+    for _ in range(200):
+        await limiter.acquire(1)
+        await limiter.release(1, 1, ok=True)
+        assert limiter.limit >= previous
+        previous = limiter.limit
+    assert limiter.limit == 8
+    # 失败不增长
+    await limiter.acquire(1)
+    limiter.on_rate_limited(0)
+    await limiter.release(1, None, ok=False)
+    assert limiter.limit == 4.0
+
+
+def test_parse_retry_after():
+    assert RateLimiter.parse_retry_after(None) is None
+    assert RateLimiter.parse_retry_after({}) is None
+    assert RateLimiter.parse_retry_after({'retry-after-ms': '1500'}) == 1.5
+    assert RateLimiter.parse_retry_after({'retry-after': '7'}) == 7.0
+    assert RateLimiter.parse_retry_after({'retry-after': 'soon'}) is None
+    # HTTP 日期相对当前 (虚拟) 时间计算
+    date = email.utils.formatdate(FakeClock.now + 120, usegmt=True)
+    assert abs(RateLimiter.parse_retry_after({'retry-after': date}) - 120) < 1
+    date = email.utils.formatdate(FakeClock.now - 120, usegmt=True)
+    assert RateLimiter.parse_retry_after({'retry-after': date}) == 0.0
+
+
+async def test_invoke_retry():
+    limiter = RateLimiter(rpm=10_000, tpm=10_000_000, concurrency=8)
+    ai = FakeAI(limiter)
+    errors = [_error(openai.RateLimitError, 429, {'retry-after': '7'}), _error(openai.InternalServerError, 503)]
+    calls = []
+
+    async def call():
+        calls.append(FakeClock.now)
+        if errors:
+            raise errors.pop(0)
+        return 'ok'
+
+    retries = dict(ai.metrics.retries)
+    FakeClock.slept.clear()
+    assert await ai._invoke_limited(call, 10, lambda res: [], stage='rate_limiter_test') == 'ok'
+    assert len(calls) == 3
+    # 429 后按 Retry-After 暂停并减半并发; 503 后指数退避 (第二次尝试等待 2 秒)
+    assert calls[1] - calls[0] >= 7.0, calls
+    assert calls[2] - calls[1] >= 2.0, calls
+    assert 7.0 in FakeClock.slept
+    assert limiter.rate_limited == 1 and limiter.limit < 8
+    assert limiter.in_flight == 0
+    assert ai.metrics.retries[('rate_limiter_test', 'rate_limit')] == retries.get(('rate_limiter_test', 'rate_limit'), 0) + 1
+    assert ai.metrics.retries[('rate_limiter_test', 'InternalServerError')] >= 1
+
+    # 重试次数用尽后抛出
+    async def always_429():
+        raise _error(openai.RateLimitError, 429, {'retry-after-ms': '10'})
+
+    try:
+        await ai._invoke_limited(always_429, 10, lambda res: [], stage='rate_limiter_test')
+        raise AssertionError('expected RateLimitError')
+    except openai.RateLimitError:
+        pass
+    assert limiter.in_flight == 0
+
+
+async def main():
+    _install_clock()
+    await test_rpm_tpm()
+    await test_aimd()
+    test_parse_retry_after()
+    await test_invoke_retry()
+    print('RateLimiter ok')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
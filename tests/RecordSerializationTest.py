@@ -0,0 +1,71 @@
+import datetime
+import json
+import time
+
+from pydantic import HttpUrl
+
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+from src.models.Encoder import CustomEncoder
+from src.models.Record import PageRecord
+from src.utils.JsonUtils import JsonUtils
+
+ARTICLES = 3000
+
+
+def _page() -> ArxivPageResult:
+    now = datetime.datetime(2025, 11, 25, 8, 30, 15, 123456, tzinfo=datetime.timezone.utc)
+    articles = []
+    for i in range(ARTICLES):
+        aid = f'2511.{i:05d}'
+        articles.append(ArxivArticle(
+            index=i + 1, arxiv_id=aid, category='cs.AI',
+            abs_url=HttpUrl(f'https://arxiv.org/abs/{aid}'), pdf_url=f'https://arxiv.org/pdf/{aid}',
+            html_url=f'https://arxiv.org/html/{aid}v1' if i % 2 else None,
+            title=f'A "quoted" title about agents #{i}\twith tab', authors=['Alice', 'Bob', '张三'],
+            comments='12 pages, 3 figures' if i % 3 else None,
+            subjects_primary='Artificial Intelligence (cs.AI)', subjects_other=['Multiagent Systems (cs.MA)'],
+            abstract='We study multi-agent systems.\n' * 20, scraped_at=now,
+            judgerResult=JudgeResult(chinese_name='多智能体', chinese_abstract='摘要\\路径', worth_read=i % 2 == 0,
+                                     comment='值得一读   分隔') if i % 5 else None,
+        ))
+    return ArxivPageResult(category='cs.AI', url=HttpUrl('https://arxiv.org/list/cs.AI/new'), scraped_at=now,
+                           articles=articles)
+
+
+def _legacy_dump(page: ArxivPageResult) -> bytes:
+    return json.dumps(page.model_dump(exclude={'articles': {'__all__': {'metadata'}}}),
+                      ensure_ascii=False, cls=CustomEncoder, indent=2).encode('utf-8')
+
+
+def _timeit(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    page = _page()
+    legacy = _legacy_dump(page)
+    fast = JsonUtils.dumps(PageRecord.from_model(page).to_dict(), indent=True)
+    # 导出的 JSON 与原来逐字节相同
+    assert fast == legacy
+
+    record = PageRecord.from_dict(JsonUtils.loads(fast))
+    assert record.to_model() == ArxivPageResult.model_validate_json(legacy)
+
+    dump_old = _timeit(lambda: _legacy_dump(page))
+    dump_new = _timeit(lambda: JsonUtils.dumps(PageRecord.from_model(page).to_dict(), indent=True))
+    load_old = _timeit(lambda: ArxivPageResult.model_validate_json(legacy))
+    load_new = _timeit(lambda: PageRecord.from_dict(JsonUtils.loads(legacy)))
+    print(f'save_json  : model_dump + json.dump {dump_old * 1000:7.1f} ms -> record + orjson {dump_new * 1000:7.1f} ms'
+          f' ({dump_old / dump_new:.1f}x)')
+    print(f'aggregation: model_validate_json     {load_old * 1000:7.1f} ms -> orjson + record {load_new * 1000:7.1f} ms'
+          f' ({load_old / load_new:.1f}x)')
+    assert dump_new < dump_old and load_new < load_old
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import datetime
+import os
+import tempfile
+
+from pydantic import HttpUrl
+
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+from src.utils.RelevancePrefilter import PREFILTER_COMMENT, RelevancePrefilter
+
+ABSTRACTS = [
+    ('Coordinating LLM agents', 'We study multi-agent systems where large language model agents cooperate.', True),
+    ('Agentic SRE', 'An LLM agent that diagnoses incidents in cloud-native Kubernetes clusters.', True),
+    ('Kernel scheduling', 'A new operating system scheduler for serverless workloads in the cloud.', True),
+    ('Image segmentation', 'A convolutional network for medical image segmentation with attention.', False),
+    ('Graph coloring bounds', 'We prove tight bounds for the chromatic number of random graphs.', False),
+    ('Sequential recommendation', 'A transformer for sequential recommendation in e-commerce.', False),
+]
+
+
+def _page() -> ArxivPageResult:
+    now = datetime.datetime(2025, 11, 25, tzinfo=datetime.timezone.utc)
+    articles = []
+    for i, (title, abstract, worth) in enumerate(ABSTRACTS):
+        articles.append(ArxivArticle(
+            index=i, arxiv_id=f'2511.0000{i}', category='cs.AI', abs_url=HttpUrl(f'https://arxiv.org/abs/2511.0000{i}'),
+            title=title, authors=['a'], abstract=abstract, scraped_at=now,
+            judgerResult=JudgeResult(chinese_name=title, chinese_abstract='', worth_read=worth, comment='模型判断'),
+        ))
+    return ArxivPageResult(category='cs.AI', articles=articles)
+
+
+def main():
+    prefilter = RelevancePrefilter(keywords='multi-agent systems, LLM agents, cloud-native, operating system',
+                                   negative='recommendation; image segmentation', threshold=0.0)
+    assert prefilter.enabled
+    assert not RelevancePrefilter(keywords='<everything>', negative='', threshold=0.0).enabled
+    assert not RelevancePrefilter(keywords='云原生,人工智能领域', negative='', threshold=0.0).enabled
+
+    page = _page()
+    scores = prefilter.score(page.articles)
+    for (title, _, worth), score in zip(ABSTRACTS, scores):
+        print(f'{score:+.3f} {worth!s:5} {title}')
+    assert all(s > 0 for s, (_, _, worth) in zip(scores, ABSTRACTS) if worth)
+    assert all(s <= 0 for s, (_, _, worth) in zip(scores, ABSTRACTS) if not worth)
+
+    skipped = prefilter.skipped_result(page.articles[4], scores[4])
+    assert not skipped.worth_read and skipped.comment.startswith(PREFILTER_COMMENT)
+
+    # 严格小于阈值才跳过, 与关键词没有共同词 (得分正好为 0) 的摘要在阈值 0 时保留
+    assert prefilter.skips(-0.01) and not prefilter.skips(0.0)
+
+    report = prefilter.calibrate([page], target_recall=1.0)
+    print({k: report[k] for k in ('threshold', 'skip_rate', 'recall', 'samples', 'positives')})
+    assert report['recall'] == 1.0 and report['skip_rate'] == 0.5
+    calibrated = RelevancePrefilter(keywords='multi-agent systems', negative='', threshold=report['threshold'])
+    assert [calibrated.skips(s) for s in scores] == [not worth for _, _, worth in ABSTRACTS]
+
+    # 没有 PREFILTER_THRESHOLD 也没有校准报告时不跳过任何文章
+    RelevancePrefilter.CALIBRATION_PATH = os.path.join(tempfile.mkdtemp(), 'missing.json')
+    uncalibrated = RelevancePrefilter(keywords='multi-agent systems', negative='', threshold=None)
+    assert not uncalibrated.calibrated and not any(uncalibrated.skips(s) for s in scores + [0.0, -1.0])
+
+    # 预筛选自己产生的判断结果不参与校准
+    page.articles[4].judgerResult = skipped
+    assert prefilter.calibrate([page])['samples'] == len(ABSTRACTS) - 1
+
+
+if __name__ == '__main__':
+    main()
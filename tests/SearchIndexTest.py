@@ -0,0 +1,93 @@
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.Record import ArticleRecord, JudgeRecord, PageRecord
+from src.utils.JsonUtils import JsonUtils
+from src.utils.SearchIndex import SearchIndex
+
+
+def _write_page(root: Path, date: str, category: str, n: int, offset: int = 0) -> Path:
+    articles = []
+    for i in range(n):
+        aid = f'{date[4:8]}.{offset + i:05d}'
+        topic = 'kubernetes scheduler' if i % 7 == 0 else 'large language model agents'
+        articles.append(ArticleRecord(
+            i + 1, aid, category, f'https://arxiv.org/abs/{aid}', None, None, None,
+            f'Paper {aid} on {topic}', ['a'], None, None, [], f'We study {topic} in depth. ' * 5,
+            '2025-11-25T00:00:00+00:00',
+            JudgeRecord(f'关于{"容器调度" if i % 7 == 0 else "多智能体"}的论文 {aid}', '摘要' * 20, i % 7 == 0, 'AI 评价'),
+        ))
+    folder = root / date / category
+    folder.mkdir(parents=True, exist_ok=True)
+    page = folder / f'{category}.json'
+    page.write_bytes(JsonUtils.dumps(PageRecord(category, None, None, articles).to_dict(), indent=True))
+    return folder
+
+
+def main():
+    root = Path(tempfile.mkdtemp())
+    index = SearchIndex(path=str(root / 'search.sqlite3'), root=str(root))
+
+    folder = _write_page(root, '20251125', 'cs.OS', 14)
+    report = folder / 'Paper 1125.00000 on kubernetes scheduler.md'
+    report.write_text('# Paper 1125.00000 on kubernetes scheduler\n\n本文提出一种基于 eBPF 的调度器热补丁机制。\n',
+                      encoding='utf-8')
+    _write_page(root, '20251201', 'cs.AI', 14, offset=100)
+
+    stats = index.reindex()
+    print('首次索引：', stats)
+    assert stats == {'indexed': 3, 'removed': 0, 'unchanged': 0}
+
+    hits = index.search('kubernetes')
+    assert hits and all('kubernetes' in h.title or 'kubernetes' in h.snippet for h in hits)
+    # 标题权重更高, 报告正文中没有该词, 但报告标题有
+    assert {h.kind for h in hits} == {'article', 'report'}
+
+    hits = index.search('热补丁')
+    assert len(hits) == 1 and hits[0].kind == 'report' and hits[0].arxiv_id == '1125.00000', hits
+    assert '[热补丁]' in hits[0].snippet
+
+    assert len(index.search('容器调度', category='cs.OS')) == 2
+    assert len(index.search('容器调度', since='20251201')) == 2
+    assert index.search('容器调度 kubernetes', kind='article', category='cs.AI')[0].arxiv_id == '1201.00100'
+
+    # 短于 3 个字符的关键词走子串匹配
+    short = index.search('调度', kind='article')
+    assert len(short) == 4 and short[0].date == '20251201', short
+
+    # 未变化的文件不会重新索引
+    assert index.reindex() == {'indexed': 0, 'removed': 0, 'unchanged': 3}
+
+    # 修改报告 / 删除 JSON 只影响对应文件
+    report.write_text('# Paper 1125.00000 on kubernetes scheduler\n\n改为讨论内存分层。\n', encoding='utf-8')
+    os.remove(root / '20251201' / 'cs.AI' / 'cs.AI.json')
+    stats = index.reindex()
+    print('增量索引：', stats)
+    assert stats == {'indexed': 1, 'removed': 1, 'unchanged': 1}
+    assert index.search('热补丁') == []
+    assert len(index.search('内存分层')) == 1
+    assert len(index.search('容器调度')) == 2
+
+    # 只检查某个目录
+    assert index.reindex(folder) == {'indexed': 0, 'removed': 0, 'unchanged': 2}
+
+    # 一年的数据量: 250 天 x 4 个分类 x 60 篇
+    for d in range(250):
+        for c in ('cs.AI', 'cs.OS', 'cs.DC', 'cs.MA'):
+            _write_page(root, f'2024{d:04d}', c, 60, offset=d * 1000)
+    start = time.perf_counter()
+    stats = index.reindex()
+    print(f'索引 {stats["indexed"]} 个文件耗时 {time.perf_counter() - start:.2f} s')
+    for query in ('kubernetes scheduler', '多智能体', '调度'):
+        start = time.perf_counter()
+        hits = index.search(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f'检索 {query!r}：{len(hits)} 条，{elapsed:.1f} ms')
+        assert len(hits) == 20
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
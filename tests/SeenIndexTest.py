@@ -0,0 +1,98 @@
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from src.models.Record import ArticleRecord, JudgeRecord, PageRecord
+from src.utils.RelevancePrefilter import PREFILTER_COMMENT
+from src.utils.SeenIndex import BloomFilter, SeenIndex
+
+FP = 'gpt-fingerprint'
+
+
+def _page(category: str, ids, comment: str = '评价') -> PageRecord:
+    articles = [
+        ArticleRecord(i + 1, aid, category, f'https://arxiv.org/abs/{aid}', None, f'https://arxiv.org/html/{aid}v1',
+                      None, f'paper {aid}', ['a'], None, None, [], 'x', '2025-11-25T00:00:00+00:00',
+                      JudgeRecord(f'标题 {aid}', '摘要', i % 2 == 0, comment))
+        for i, aid in enumerate(ids)
+    ]
+    return PageRecord(category, None, None, articles)
+
+
+def main():
+    # 布隆过滤器: 没有漏判, 误判率接近设定值
+    bloom = BloomFilter(100_000, 0.01)
+    for i in range(100_000):
+        bloom.add(f'2511.{i:05d}')
+    assert all(f'2511.{i:05d}' in bloom for i in range(100_000))
+    fp = sum(f'2512.{i:05d}' in bloom for i in range(100_000)) / 100_000
+    print(f'布隆过滤器: {bloom.size} 位, {bloom.hashes} 个哈希, 误判率 {fp:.4f}')
+    assert fp < 0.02
+
+    root = Path(tempfile.mkdtemp())
+    index = SeenIndex(path=str(root / 'seen.sqlite3'))
+    ids = [f'2511.{i:05d}' for i in range(10)]
+    assert index.lookup(((aid, 1) for aid in ids), FP) == {}
+
+    assert index.remember('20251125', _page('cs.OS', ids), {aid: 1 for aid in ids}, FP) == 10
+    # 本地预筛选的结果不保存
+    assert index.remember('20251125', _page('cs.OS', ['2511.99999'], f'{PREFILTER_COMMENT}: 0.01'), {}, FP) == 0
+
+    # 新开一个实例, 从数据库重建布隆过滤器
+    index = SeenIndex(path=str(root / 'seen.sqlite3'))
+    versions = {aid: 1 for aid in ids[:6]} | {ids[6]: None, ids[7]: 2, '2511.99999': 1, '2512.00001': 1}
+    reused = index.lookup(versions.items(), FP)
+    assert set(reused) == set(ids[:7]), reused
+    assert reused[ids[0]].worth_read and not reused[ids[1]].worth_read
+    assert reused[ids[2]].chinese_name == f'标题 {ids[2]}'
+    stats = index.stats()
+    print('查询统计：', stats)
+    assert stats['hits'] == 7 and stats['changed'] == 1 and stats['misses'] == 2
+
+    # 模型或提示词变化后指纹不同, 保存的结果不复用
+    assert index.lookup([(ids[0], 1), (ids[1], 1)], 'other-fingerprint') == {}
+    assert index.stats()['stale'] == 2
+
+    # 新版本重新判断后覆盖, 版本未知时不覆盖保存的版本号
+    index.remember('20251126', _page('cs.AI', [ids[7]], '新版本评价'), {ids[7]: 2}, FP)
+    index.remember('20251126', _page('cs.AI', [ids[0]]), {ids[0]: None}, FP)
+    reused = index.lookup([(ids[7], 2), (ids[0], 1)], FP)
+    assert reused[ids[7]].comment == '新版本评价' and ids[0] in reused
+    row = index.conn.execute("SELECT first_date, last_date, category FROM seen WHERE arxiv_id = ?", (ids[7],)).fetchone()
+    assert row == ('20251125', '20251126', 'cs.AI'), row
+
+    # 一年的数据量, 每天 400 篇里约 10% 为之前出现过的论文
+    for d in range(250):
+        index.remember(f'2025{d:04d}', _page('cs.AI', [f'{2400 + d}.{i:05d}' for i in range(400)]), {}, FP)
+    index.close()
+    index = SeenIndex(path=str(root / 'seen.sqlite3'))
+    start = time.perf_counter()
+    _ = index.bloom
+    print(f'重建布隆过滤器耗时 {(time.perf_counter() - start) * 1000:.1f} ms')
+    today = [(f'2511.{i:05d}', 1) for i in range(1000, 1360)] + [(f'2420.{i:05d}', None) for i in range(40)]
+    start = time.perf_counter()
+    reused = index.lookup(today, FP)
+    print(f'查询 {len(today)} 篇耗时 {(time.perf_counter() - start) * 1000:.1f} ms，复用 {len(reused)} 篇，'
+          f'统计 {index.stats()}')
+    assert len(reused) == 40
+    index.close()
+
+    # 没有 fingerprint 列的旧表: 打开时补上该列, 旧结果不复用, 重新判断后覆盖
+    old = root / 'old.sqlite3'
+    conn = sqlite3.connect(old)
+    conn.execute("CREATE TABLE seen (arxiv_id TEXT PRIMARY KEY, version INTEGER, chinese_name TEXT NOT NULL, "
+                 "chinese_abstract TEXT NOT NULL, worth_read INTEGER NOT NULL, comment TEXT NOT NULL, "
+                 "first_date TEXT NOT NULL, last_date TEXT NOT NULL, category TEXT NOT NULL, updated_at TEXT NOT NULL)")
+    conn.execute("INSERT INTO seen VALUES ('2511.00001', 1, 'c', 'd', 1, 'e', '20251125', '20251125', 'cs.AI', 'x')")
+    conn.commit()
+    conn.close()
+    index = SeenIndex(path=str(old))
+    assert index.lookup([('2511.00001', 1)], FP) == {}
+    index.remember('20251126', _page('cs.AI', ['2511.00001']), {'2511.00001': 1}, FP)
+    assert '2511.00001' in index.lookup([('2511.00001', 1)], FP)
+    index.close()
+
+
+if __name__ == '__main__':
+    main()
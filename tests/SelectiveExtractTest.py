@@ -0,0 +1,72 @@
+import asyncio
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+
+import pymupdf
+
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+
+
+def _pdf_bytes() -> bytes:
+    doc = pymupdf.open()
+    doc.new_page(width=200, height=100).insert_text((20, 50), 'figure')
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _make_payloads(folder: str):
+    members = {
+        'main.tex': b'\\documentclass{article}\\begin{document}\\includegraphics{figs/arch}\\end{document}',
+        'figs/arch.pdf': _pdf_bytes(),
+        'figs/logo.png': b'\x89PNG\r\n\x1a\n' + b'0' * 100,
+        'figs/plot.eps': b'%!PS' + b'0' * 1000,
+        'data/train.csv': b'1,2,3\n' * 10000,
+    }
+    tar_path = os.path.join(folder, 'arXiv-2511.00001v1.tar.gz')
+    with tarfile.open(tar_path, mode='w:gz') as tf:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    gz_path = os.path.join(folder, 'arXiv-2511.00002v1.gz')
+    with gzip.open(gz_path, 'wb') as g:
+        g.write(members['main.tex'])
+    pdf_path = os.path.join(folder, 'arXiv-2511.00003v1.pdf')
+    with open(pdf_path, 'wb') as f:
+        f.write(_pdf_bytes())
+    return tar_path, gz_path, pdf_path
+
+
+async def main():
+    service = ArxivDailyCrawlService('cs.AI')
+    folder = tempfile.mkdtemp()
+    service.BASE_DOWNLOAD_PATH = folder
+    tar_path, gz_path, pdf_path = _make_payloads(folder)
+
+    files = await service.extract_tar_gz(tar_path)
+    names = sorted(os.path.relpath(f, os.path.join(folder, 'arXiv-2511.00001v1')) for f in files)
+    print(names)
+    assert names == ['figs/arch.pdf', 'figs/logo.png', 'main.tex']
+    assert not os.path.exists(os.path.join(folder, 'arXiv-2511.00001v1', 'data'))
+
+    files = await service.extract_tar_gz(gz_path)
+    print(files)
+    assert [os.path.basename(f) for f in files] == ['arXiv-2511.00002v1.tex']
+
+    assert await service.extract_tar_gz(pdf_path) == [pdf_path]
+
+    sources = await service.extract_sources_in_memory(tar_path)
+    print([s.name for s in sources])
+    metadata = await service.process_file_lists(sources)
+    print([f.name for f in metadata.figures], [t.name for t in metadata.texts])
+    assert [t.name for t in metadata.texts] == ['main']
+    # logo.png 未被 \includegraphics 引用, 排在引用的图片之后, 预算足够时仍会被读取和编码
+    assert [f.name for f in metadata.figures] == ['arch-0', 'logo']
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
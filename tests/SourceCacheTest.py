@@ -0,0 +1,108 @@
+import asyncio
+import io
+import os
+import tarfile
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.crawl.ArxivDailyCrawlService import ArxivDailyCrawlService
+from src.crawl.SourceCache import SourceCache
+
+
+def _tarball(text: str) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tar:
+        data = text.encode('utf-8')
+        info = tarfile.TarInfo('main.tex')
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+class SourceHandler(BaseHTTPRequestHandler):
+    # 服务器上的当前版本, 测试中途替换为 v2
+    version = 1
+    requests = []
+
+    def _headers(self, body: bytes):
+        self.send_response(200)
+        self.send_header('Content-Disposition', f'attachment; filename="arXiv-2511.00001v{self.version}.tar.gz"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+    def do_HEAD(self):
+        SourceHandler.requests.append('HEAD')
+        self._headers(_tarball(f'v{self.version}'))
+
+    def do_GET(self):
+        SourceHandler.requests.append('GET')
+        body = _tarball(f'v{self.version}')
+        self._headers(body)
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _read(files):
+    return Path(next(f for f in files if f.endswith('main.tex'))).read_text(encoding='utf-8')
+
+
+def test_cache():
+    root = Path(tempfile.mkdtemp())
+    cache = SourceCache(root=str(root), max_bytes=3)
+    for aid, version in (('2511.00001', 1), ('2511.00001', 2)):
+        target = cache.prepare(aid, version)
+        (target / 'main.tex').write_text(f'v{version}', encoding='utf-8')
+        cache.commit(aid, version, [str(target / 'main.tex')])
+    assert _read(cache.lookup('2511.00001', 2)) == 'v2'
+    # 版本号未知时不返回缓存中的任何版本
+    assert cache.lookup('2511.00001', None) is None
+    # 超出字节预算时淘汰最久未访问的条目
+    assert cache.lookup('2511.00001', 1) is None
+    # 目录被外部删除时视为未命中
+    os.remove(cache.entry_dir('2511.00001', 2) / 'main.tex')
+    assert cache.lookup('2511.00001', 2) is None
+    assert (cache.hits, cache.misses) == (1, 3), (cache.hits, cache.misses)
+
+
+async def test_version_less_fetch():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SourceHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    root = Path(tempfile.mkdtemp())
+    ArxivDailyCrawlService.sourceCache = SourceCache(root=str(root / 'sources'))
+    ArxivDailyCrawlService.BASE_DOWNLOAD_PATH = str(root / 'downloads')
+    service = ArxivDailyCrawlService('cs.AI')
+    url = f'http://127.0.0.1:{server.server_port}/src/2511.00001'
+
+    assert _read(await service.fetch_source_files('2511.00001', url)) == 'v1'
+    assert SourceHandler.requests == ['HEAD', 'GET']
+
+    # 版本未变: HEAD 确认后命中缓存
+    SourceHandler.requests.clear()
+    assert _read(await service.fetch_source_files('2511.00001', url)) == 'v1'
+    assert SourceHandler.requests == ['HEAD']
+
+    # 论文被替换: 不能拿到旧版本的源码
+    SourceHandler.version = 2
+    SourceHandler.requests.clear()
+    assert _read(await service.fetch_source_files('2511.00001', url)) == 'v2'
+    assert SourceHandler.requests == ['HEAD', 'GET']
+
+    # 已知版本号时不发 HEAD
+    SourceHandler.requests.clear()
+    assert _read(await service.fetch_source_files('2511.00001', url, 1)) == 'v1'
+    assert SourceHandler.requests == []
+    server.shutdown()
+
+
+async def main():
+    test_cache()
+    await test_version_less_fetch()
+    print('SourceCache ok')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import datetime
+import tempfile
+from pathlib import Path
+
+from pydantic import HttpUrl
+
+from src.models.Arxiv import ArxivArticle, ArxivPageResult, JudgeResult
+from src.utils.WorkflowJournal import WorkflowJournal
+
+if __name__ == '__main__':
+    now = datetime.datetime(2025, 11, 25, tzinfo=datetime.timezone.utc)
+    page = ArxivPageResult(category='cs.AI', url=HttpUrl('https://arxiv.org/list/cs.AI/new'), scraped_at=now, articles=[
+        ArxivArticle(index=i, arxiv_id=f'2511.0000{i}', category='cs.AI',
+                     abs_url=HttpUrl(f'https://arxiv.org/abs/2511.0000{i}'), title=f'T{i}', authors=['a'],
+                     abstract='x', scraped_at=now)
+        for i in range(3)
+    ])
+    path = Path(tempfile.mkdtemp()) / 'cs.AI.journal.jsonl'
+    journal = WorkflowJournal(path)
+    journal.reset()
+    journal.record_crawl(page)
+    judge = JudgeResult(chinese_name='标题', chinese_abstract='摘要', worth_read=True, comment='评价')
+    journal.record_judge('2511.00000', judge)
+    journal.record_analyze('2511.00000', '# 报告')
+    # 模拟崩溃时写了一半的最后一行
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"stage": "judge", "arxiv_id": "2511.00001", "res')
+
+    replayed = WorkflowJournal(path).load()
+    assert replayed.judged == {'2511.00000': judge}
+    assert replayed.analyzed == {'2511.00000': '# 报告'}
+    compacted = replayed.compact()
+    assert [a.judgerResult for a in compacted.articles] == [judge, None, None]
+    assert compacted.model_dump(exclude={'articles'}) == page.model_dump(exclude={'articles'})
+
+    # 续跑时追加的记录不会和写了一半的行粘在一起
+    replayed.record_judge('2511.00001', judge)
+    assert WorkflowJournal(path).load().judged == {'2511.00000': judge, '2511.00001': judge}
+    print(path.read_text(encoding='utf-8'))